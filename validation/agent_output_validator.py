@@ -6,11 +6,15 @@ Enforces strict rules on agent outputs programmatically
 
 import re
 import json
-import yaml
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import rule_stats
+from rule_engine import get_engine
+from rule_guard import GuardedMatcher, RuleTimeoutError, RuleWorkerError, UnsafePatternError, analyze_pattern
+from update_context import load_context
+
 class Priority(Enum):
     """Allowed priority levels"""
     CRITICAL = "critical"
@@ -39,75 +43,149 @@ class ValidationRule:
     severity: str  # "error", "warning"
     message: str
     
+# Forbidden patterns that should NEVER appear
+FORBIDDEN_RULES = [
+    # Time estimates
+    ValidationRule(
+        name="time_estimate_days",
+        pattern=r'\b\d+\s*(day|days)\b',
+        severity="error",
+        message="Time estimates in days are forbidden. Use priority levels."
+    ),
+    ValidationRule(
+        name="time_estimate_weeks",
+        pattern=r'\b\d+\s*(week|weeks)\b',
+        severity="error",
+        message="Time estimates in weeks are forbidden. Use priority levels."
+    ),
+    ValidationRule(
+        name="time_estimate_months",
+        pattern=r'\b\d+\s*(month|months)\b',
+        severity="error",
+        message="Time estimates in months are forbidden. Use priority levels."
+    ),
+    ValidationRule(
+        name="time_estimate_hours",
+        pattern=r'\b\d+\s*(hour|hours)\b',
+        severity="error",
+        message="Time estimates in hours are forbidden. Use complexity ratings."
+    ),
+    ValidationRule(
+        name="time_estimate_quarters",
+        pattern=r'\bQ[1-4]\s+20\d{2}\b',
+        severity="error",
+        message="Quarter-based timelines are forbidden. Use priority sequencing."
+    ),
+    ValidationRule(
+        name="time_estimate_ranges",
+        pattern=r'\b\d+\s*-\s*\d+\s*(days|weeks|months|hours)\b',
+        severity="error",
+        message="Time range estimates are forbidden. Use priority levels."
+    ),
+    ValidationRule(
+        name="deadline_references",
+        pattern=r'\b(deadline|due date|due by|complete by|finish by)\b',
+        severity="error",
+        message="Deadline references are forbidden. Use priority indicators."
+    ),
+]
+
+# Required patterns that MUST appear for certain outputs
+REQUIRED_RULES = {
+    "project_plan": [
+        ValidationRule(
+            name="priority_levels",
+            pattern=r'(critical|high|medium|low|priority\s+\d+)',
+            severity="error",
+            message="Project plans must use priority levels"
+        )
+    ],
+    "task_breakdown": [
+        ValidationRule(
+            name="complexity_or_size",
+            pattern=r'(simple|moderate|complex|small|medium|large|xl)',
+            severity="error",
+            message="Task breakdowns must use complexity or size ratings"
+        )
+    ]
+}
+
+# Forbidden pattern -> compliant replacement, used by transform_output
+TRANSFORMATIONS = {
+    r'\b1\s*day\b': 'Priority: Critical',
+    r'\b2-3\s*days\b': 'Complexity: Simple',
+    r'\b1\s*week\b': 'Priority: High',
+    r'\b2\s*weeks\b': 'Priority: Medium',
+    r'\b1\s*month\b': 'Priority: Low',
+    r'\b(\d+)\s*hours?\b': 'Complexity: Moderate',
+    r'Q1 2025': 'Priority 1',
+    r'Q2 2025': 'Priority 2',
+    r'Q3 2025': 'Priority 3',
+    r'Q4 2025': 'Priority 4',
+    r'deadline': 'priority target',
+    r'due date': 'priority milestone',
+    r'complete by': 'prioritize for',
+}
+
 class AgentOutputValidator:
-    def __init__(self):
-        # Forbidden patterns that should NEVER appear
-        self.forbidden_patterns = [
-            # Time estimates
-            ValidationRule(
-                name="time_estimate_days",
-                pattern=r'\b\d+\s*(day|days)\b',
-                severity="error",
-                message="Time estimates in days are forbidden. Use priority levels."
-            ),
-            ValidationRule(
-                name="time_estimate_weeks",
-                pattern=r'\b\d+\s*(week|weeks)\b',
-                severity="error",
-                message="Time estimates in weeks are forbidden. Use priority levels."
-            ),
-            ValidationRule(
-                name="time_estimate_months",
-                pattern=r'\b\d+\s*(month|months)\b',
-                severity="error",
-                message="Time estimates in months are forbidden. Use priority levels."
-            ),
-            ValidationRule(
-                name="time_estimate_hours",
-                pattern=r'\b\d+\s*(hour|hours)\b',
-                severity="error",
-                message="Time estimates in hours are forbidden. Use complexity ratings."
-            ),
-            ValidationRule(
-                name="time_estimate_quarters",
-                pattern=r'\bQ[1-4]\s+20\d{2}\b',
-                severity="error",
-                message="Quarter-based timelines are forbidden. Use priority sequencing."
-            ),
-            ValidationRule(
-                name="time_estimate_ranges",
-                pattern=r'\b\d+\s*-\s*\d+\s*(days|weeks|months|hours)\b',
-                severity="error",
-                message="Time range estimates are forbidden. Use priority levels."
-            ),
-            ValidationRule(
-                name="deadline_references",
-                pattern=r'\b(deadline|due date|due by|complete by|finish by)\b',
-                severity="error",
-                message="Deadline references are forbidden. Use priority indicators."
-            ),
-        ]
-        
-        # Required patterns that MUST appear for certain outputs
-        self.required_patterns = {
-            "project_plan": [
-                ValidationRule(
-                    name="priority_levels",
-                    pattern=r'(critical|high|medium|low|priority\s+\d+)',
-                    severity="error",
-                    message="Project plans must use priority levels"
-                )
-            ],
-            "task_breakdown": [
-                ValidationRule(
-                    name="complexity_or_size",
-                    pattern=r'(simple|moderate|complex|small|medium|large|xl)',
-                    severity="error",
-                    message="Task breakdowns must use complexity or size ratings"
-                )
-            ]
-        }
+    def __init__(self, time_budget: Optional[float] = None):
+        # With a time budget, matching runs in a worker process that is
+        # killed when one validation takes longer than this many seconds
+        self.time_budget = time_budget
+        self._matcher: Optional[GuardedMatcher] = None
+        # Copies, so add_rule() only affects this validator
+        self.forbidden_patterns = list(FORBIDDEN_RULES)
+        self.required_patterns = {output_type: list(rules) for output_type, rules in REQUIRED_RULES.items()}
         
+    def add_rule(self, rule: ValidationRule, output_type: Optional[str] = None):
+        """
+        Add a custom rule: forbidden by default, required for output_type when given
+
+        Raises UnsafePatternError if the pattern could backtrack catastrophically.
+        """
+        problems = analyze_pattern(rule.pattern, re.IGNORECASE)
+        if problems:
+            raise UnsafePatternError(f"Rule {rule.name} ({rule.pattern!r}): {'; '.join(problems)}")
+        if output_type is None:
+            self.forbidden_patterns.append(rule)
+        else:
+            self.required_patterns.setdefault(output_type, []).append(rule)
+        self.close()
+
+    def close(self):
+        """Stop the budgeted matcher process, if one is running"""
+        if self._matcher is not None:
+            self._matcher.close()
+            self._matcher = None
+
+    def _match_budgeted(self, output: str, output_type: str,
+                        stats: Optional[rule_stats.RuleStats]) -> Tuple[List[list], List[bool]]:
+        """
+        Matches of each forbidden rule, and whether each required rule of
+        output_type was found, in rule order
+
+        Patterns are keyed by rule position, so rules sharing a name never
+        overwrite each other.
+        """
+        if self._matcher is None:
+            patterns = {("forbidden", index): rule.pattern
+                        for index, rule in enumerate(self.forbidden_patterns)}
+            for required_type, rules in self.required_patterns.items():
+                patterns.update(((required_type, index), rule.pattern) for index, rule in enumerate(rules))
+            self._matcher = GuardedMatcher(patterns, re.IGNORECASE, self.time_budget)
+        results = self._matcher.findall(output)
+        forbidden = [results[("forbidden", index)] for index in range(len(self.forbidden_patterns))]
+        required_rules = self.required_patterns.get(output_type, [])
+        required = [bool(results[(output_type, index)]) for index in range(len(required_rules))]
+        if stats is not None:
+            timings = self._matcher.timings
+            for index, rule in enumerate(self.forbidden_patterns):
+                stats.record("agent_output", rule.name, bool(forbidden[index]),
+                             timings[("forbidden", index)])
+            for index, rule in enumerate(required_rules):
+                stats.record("agent_output", rule.name, required[index], timings[(output_type, index)])
+        return forbidden, required
+
     def validate_output(self, output: str, output_type: str = "general") -> Tuple[bool, List[Dict]]:
         """
         Validate agent output against rules
@@ -116,11 +194,39 @@ class AgentOutputValidator:
             (is_valid, violations)
         """
         violations = []
+        stats = rule_stats.active()
+        budgeted = None
+        if self.time_budget is not None:
+            try:
+                budgeted = self._match_budgeted(output, output_type, stats)
+            except RuleTimeoutError as e:
+                violations.append({
+                    "rule": "rule_timeout",
+                    "severity": "error",
+                    "message": str(e),
+                    "matches": []
+                })
+                return False, violations
+            except RuleWorkerError as e:
+                violations.append({
+                    "rule": "rule_worker_error",
+                    "severity": "error",
+                    "message": str(e),
+                    "matches": []
+                })
+                return False, violations
+        else:
+            # Shared with the other validators checking the same text
+            scan = get_engine().scan(output)
         
         # Check forbidden patterns
-        for rule in self.forbidden_patterns:
-            pattern = re.compile(rule.pattern, re.IGNORECASE)
-            matches = pattern.findall(output)
+        for index, rule in enumerate(self.forbidden_patterns):
+            if budgeted is not None:
+                matches = budgeted[0][index]
+            elif stats is None:
+                matches = scan.findall(rule.pattern)
+            else:
+                matches = stats.timed("agent_output", rule.name, scan.findall, rule.pattern)
             if matches:
                 violations.append({
                     "rule": rule.name,
@@ -131,9 +237,14 @@ class AgentOutputValidator:
         
         # Check required patterns if applicable
         if output_type in self.required_patterns:
-            for rule in self.required_patterns[output_type]:
-                pattern = re.compile(rule.pattern, re.IGNORECASE)
-                if not pattern.search(output):
+            for index, rule in enumerate(self.required_patterns[output_type]):
+                if budgeted is not None:
+                    found = budgeted[1][index]
+                elif stats is None:
+                    found = scan.search(rule.pattern)
+                else:
+                    found = stats.timed("agent_output", rule.name, scan.search, rule.pattern)
+                if not found:
                     violations.append({
                         "rule": rule.name,
                         "severity": rule.severity,
@@ -154,8 +265,7 @@ class AgentOutputValidator:
         
         try:
             # Load project context
-            with open("_project/PROJECT_CONTEXT.yaml", "r") as f:
-                context = yaml.safe_load(f)
+            context = load_context("_project/PROJECT_CONTEXT.yaml")
             
             if "project" in context and "goals" in context["project"]:
                 goals = context["project"]["goals"]
@@ -182,24 +292,8 @@ class AgentOutputValidator:
         Transform output to comply with rules
         Replaces forbidden patterns with compliant alternatives
         """
-        transformations = {
-            r'\b1\s*day\b': 'Priority: Critical',
-            r'\b2-3\s*days\b': 'Complexity: Simple',
-            r'\b1\s*week\b': 'Priority: High',
-            r'\b2\s*weeks\b': 'Priority: Medium',
-            r'\b1\s*month\b': 'Priority: Low',
-            r'\b(\d+)\s*hours?\b': 'Complexity: Moderate',
-            r'Q1 2025': 'Priority 1',
-            r'Q2 2025': 'Priority 2',
-            r'Q3 2025': 'Priority 3',
-            r'Q4 2025': 'Priority 4',
-            r'deadline': 'priority target',
-            r'due date': 'priority milestone',
-            r'complete by': 'prioritize for',
-        }
-        
         transformed = output
-        for pattern, replacement in transformations.items():
+        for pattern, replacement in TRANSFORMATIONS.items():
             transformed = re.sub(pattern, replacement, transformed, flags=re.IGNORECASE)
             
         return transformed
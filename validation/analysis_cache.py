@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+"""
+OpenADK Analysis Cache
+Reuses repository metrics between analyze runs, keyed by git HEAD and working tree state
+Only files changed since the cached state are recounted
+"""
+
+import os
+import json
+import hashlib
+import subprocess
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from repo_metrics import (DEFAULT_WORKERS, LANGUAGES, FileCounts, RepoMetrics,
+                          count_files, is_excluded, iter_files, summarize)
+from discover_repos import collect_repo_info, detect_tech_stack
+from fileutil import atomic_write
+
+CACHE_VERSION = 1
+GIT_TIMEOUT = 30
+
+def _git(repo_path: str, *args: str) -> Optional[str]:
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS="0")
+    try:
+        result = subprocess.run(["git", "-C", repo_path, *args], capture_output=True,
+                                text=True, timeout=GIT_TIMEOUT, env=env)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+def _split_z(output: str) -> List[str]:
+    return [p for p in output.split("\0") if p]
+
+# Fields before the path in `git status --porcelain=v2` entries, by entry type
+_STATUS_FIELDS = {"1": 8, "2": 9, "u": 10, "?": 1, "!": 1}
+
+def _status(repo_path: str) -> Optional[Tuple[Optional[str], str, List[str]]]:
+    """
+    (HEAD sha, branch, dirty paths) from one git status call
+
+    HEAD is None before the first commit and the branch is "N/A" when
+    detached. Dirty paths are modified, staged and untracked paths
+    relative to the repository root.
+    """
+    output = _git(repo_path, "status", "--porcelain=v2", "--branch", "-z",
+                  "--untracked-files=all", "--no-renames")
+    if output is None:
+        return None
+    head, branch, dirty = None, "N/A", []
+    entries = iter(_split_z(output))
+    for entry in entries:
+        if entry.startswith("# branch.oid "):
+            oid = entry[len("# branch.oid "):]
+            head = None if oid == "(initial)" else oid
+        elif entry.startswith("# branch.head "):
+            name = entry[len("# branch.head "):]
+            branch = "N/A" if name == "(detached)" else name
+        elif entry[:1] in _STATUS_FIELDS:
+            # -z leaves paths unquoted, so the path is everything after the fields
+            dirty.append(entry.split(" ", _STATUS_FIELDS[entry[:1]])[-1])
+            if entry[:1] == "2":
+                # Renamed entries are followed by the original path
+                next(entries, None)
+    return head, branch, sorted(dirty)
+
+def repo_state(repo_path: str) -> Optional[Tuple[str, str, List[str], str]]:
+    """
+    (HEAD sha, working tree hash, dirty paths, branch), or None outside a git work tree
+
+    The hash covers the dirty path list and each dirty file's size and mtime,
+    so editing an already modified file changes the key too.
+    """
+    toplevel = _git(repo_path, "rev-parse", "--show-toplevel")
+    if toplevel is None or os.path.realpath(toplevel.strip()) != os.path.realpath(repo_path):
+        # Paths from git are relative to the top level; subdirectories are not cached
+        return None
+    status = _status(repo_path)
+    if status is None or status[0] is None:
+        return None
+    head, branch, dirty = status
+
+    digest = hashlib.sha256()
+    for relpath in dirty:
+        try:
+            stat = os.stat(os.path.join(repo_path, relpath))
+            signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+        except OSError:
+            signature = "-"
+        digest.update(f"{relpath}\0{signature}\0".encode())
+    return head, digest.hexdigest(), dirty, branch
+
+class AnalysisCache:
+    """
+    Per-repository metrics cache stored as JSON (default _project/.cache/analysis.json)
+
+    A repository whose HEAD, branch and working tree state match the
+    cached entry reuses it outright, git details included. Otherwise only paths reported by
+    `git diff --name-only <cached HEAD>`, plus paths dirty now or at cache
+    time, are recounted. Changes to git-ignored files are not seen until
+    the next full refresh.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # Fingerprint and paths of the last report written from this cache
+        self.last_report: Optional[Dict[str, Any]] = None
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION:
+            self.entries = data.get("repositories", {})
+            self.last_report = data.get("last_report")
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        atomic_write(self.cache_path, json.dumps({"version": CACHE_VERSION,
+                                                  "repositories": self.entries,
+                                                  "last_report": self.last_report}))
+        self._dirty = False
+
+    def _changed_paths(self, repo_path: str, entry: Dict[str, Any], dirty: List[str]) -> Optional[Set[str]]:
+        output = _git(repo_path, "diff", "--name-only", "-z", "--no-renames", entry["head"])
+        if output is None:
+            # Cached commit no longer exists (rebase, gc)
+            return None
+        changed = set(_split_z(output))
+        changed.update(dirty)
+        changed.update(entry.get("dirty", []))
+        return {os.path.normpath(p) for p in changed}
+
+    def _update_counts(self, repo_path: str, counts: FileCounts,
+                       changed: Set[str], max_workers: int) -> FileCounts:
+        counts = dict(counts)
+        recount = []
+        for relpath in changed:
+            counts.pop(relpath, None)
+            if is_excluded(relpath):
+                continue
+            path = os.path.join(repo_path, relpath)
+            if os.path.isfile(path) and not os.path.islink(path):
+                recount.append((path, LANGUAGES.get(os.path.splitext(relpath)[1])))
+        counts.update(count_files(repo_path, recount, max_workers))
+        return counts
+
+    def set_last_report(self, fingerprint: str, markdown_path: str, yaml_path: str):
+        self.last_report = {"fingerprint": fingerprint, "markdown": markdown_path, "yaml": yaml_path}
+        self._dirty = True
+
+    def metrics(self, repo_path: str,
+                max_workers: int = DEFAULT_WORKERS,
+                refresh: bool = False) -> Tuple[RepoMetrics, List[str], str]:
+        """
+        Metrics and technology stack for a repository
+
+        Returns (metrics, tech_stack, source) where source is "cached",
+        "incremental" or "full".
+        """
+        result = self.analyze(repo_path, max_workers, refresh)
+        return result["metrics"], result["technology_stack"], result["source"]
+
+    def analyze(self, repo_path: str,
+                max_workers: int = DEFAULT_WORKERS,
+                refresh: bool = False) -> Dict[str, Any]:
+        """
+        Git details, technology stack and metrics for a repository
+
+        Returns a dict with branch, last_commit, uncommitted_changes,
+        technology_stack, metrics and source ("cached", "incremental" or
+        "full"). A cached repository costs two git calls and nothing else.
+        """
+        key = os.path.realpath(repo_path)
+        state = repo_state(repo_path)
+        if state is None:
+            counts = count_files(repo_path, list(iter_files(repo_path)), max_workers)
+            if os.path.exists(os.path.join(repo_path, ".git")):
+                info = collect_repo_info(repo_path)
+            else:
+                info = {"branch": "N/A", "last_commit": "N/A", "uncommitted_changes": False,
+                        "technology_stack": detect_tech_stack(repo_path)}
+            return {
+                "branch": info["branch"],
+                "last_commit": info["last_commit"],
+                "uncommitted_changes": info["uncommitted_changes"],
+                "technology_stack": info["technology_stack"],
+                "metrics": summarize(counts),
+                "source": "full"
+            }
+
+        head, tree_hash, dirty, branch = state
+        entry = None if refresh else self.entries.get(key)
+        if (entry is not None and entry["head"] == head and entry["tree"] == tree_hash
+                and entry.get("branch") == branch and "last_commit" in entry):
+            counts = {p: tuple(c) for p, c in entry["files"].items()}
+            return self._result(entry, summarize(counts), "cached")
+
+        changed = self._changed_paths(repo_path, entry, dirty) if entry is not None else None
+        if changed is None:
+            counts = count_files(repo_path, list(iter_files(repo_path)), max_workers)
+            source = "full"
+        else:
+            counts = self._update_counts(repo_path, entry["files"], changed, max_workers)
+            source = "incremental"
+
+        last_commit = None
+        if entry is not None and entry["head"] == head:
+            last_commit = entry.get("last_commit")
+        if last_commit is None:
+            last_commit = (_git(repo_path, "log", "-1", "--format=%h - %s") or "").strip() or "N/A"
+        entry = self.entries[key] = {
+            "head": head,
+            "tree": tree_hash,
+            "dirty": dirty,
+            "branch": branch,
+            "last_commit": last_commit,
+            "tech_stack": detect_tech_stack(repo_path),
+            "files": {p: list(c) for p, c in counts.items()}
+        }
+        self._dirty = True
+        return self._result(entry, summarize(counts), source)
+
+    @staticmethod
+    def _result(entry: Dict[str, Any], metrics: RepoMetrics, source: str) -> Dict[str, Any]:
+        return {
+            "branch": entry["branch"],
+            "last_commit": entry["last_commit"],
+            "uncommitted_changes": bool(entry["dirty"]),
+            "technology_stack": entry["tech_stack"],
+            "metrics": metrics,
+            "source": source
+        }
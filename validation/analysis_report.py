@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+"""
+OpenADK Analysis Report Writer
+Streams repository analysis results to the markdown and YAML reports in one pass
+Both files are flushed after every repository, so partial reports stay readable
+"""
+
+import os
+import datetime
+from typing import Dict, Any, Optional, TextIO
+
+import yaml
+
+TOOL_NAME = "OpenADK Repository Analysis System"
+TOOL_VERSION = "1.0"
+
+# (icon, name, summary, agents, areas to evaluate) for the dimension sections
+DIMENSIONS = [
+    ("🔧", "Maintainability", "Code quality, organization, and technical debt",
+     "code-reviewer and system-architect agents",
+     ["Code complexity and organization", "Naming conventions and consistency",
+      "Code duplication", "Technical debt indicators"]),
+    ("📈", "Scalability", "Architecture patterns and growth capacity",
+     "system-architect and devops-engineer agents",
+     ["Architecture patterns", "Database design", "Caching strategies", "Load handling capacity"]),
+    ("🛡️", "Reliability", "Error handling and system stability",
+     "test-engineer and devops-engineer agents",
+     ["Error handling patterns", "Fault tolerance mechanisms", "Recovery procedures", "System monitoring"]),
+    ("🔒", "Security", "Vulnerability assessment and secure practices",
+     "security-expert agent",
+     ["Vulnerability assessment", "Authentication/authorization", "Data protection",
+      "Security best practices"]),
+    ("⚡", "Performance", "Optimization opportunities and bottlenecks",
+     "code-reviewer and system-architect agents",
+     ["Algorithm efficiency", "Database query optimization", "Resource usage", "Caching implementation"]),
+    ("🧪", "Testability", "Test coverage and quality assurance",
+     "test-engineer agent",
+     ["Test coverage", "Test quality", "Testing patterns", "CI/CD integration"]),
+    ("📚", "Documentation", "Knowledge sharing and onboarding",
+     "code-reviewer agent",
+     ["README completeness", "Code comments", "API documentation", "Architecture docs"]),
+    ("🚀", "Operational Readiness", "Deployment and monitoring capabilities",
+     "devops-engineer agent",
+     ["Deployment automation", "Monitoring setup", "Logging practices", "Incident response"]),
+]
+
+PENDING = "Pending agent analysis"
+
+# Markdown hard line break (two trailing spaces)
+BR = "  "
+
+def _dump(data: Any) -> str:
+    return yaml.dump(data, default_flow_style=False, sort_keys=False, allow_unicode=True)
+
+class AnalysisReport:
+    """
+    Markdown and YAML analysis reports written side by side
+
+    open() writes both headers, add_repository() appends one repository to
+    both files, and close() writes the trailing sections. Nothing is kept
+    in memory between calls, and after each call both files are valid on
+    their own (the YAML just lacks analysis_summary until close).
+    """
+
+    def __init__(self, report_dir: str, generated: Optional[datetime.datetime] = None):
+        self.generated = generated or datetime.datetime.now().astimezone()
+        stamp = self.generated.strftime('%Y%m%d_%H%M%S')
+        self._stem = os.path.join(report_dir, f"repository_analysis_{stamp}")
+        # Final names are picked by open(): runs in the same second get _2, _3, ...
+        self.markdown_path = f"{self._stem}.md"
+        self.yaml_path = f"{self._stem}.yaml"
+        self.repository_count = 0
+        self._markdown: Optional[TextIO] = None
+        self._yaml: Optional[TextIO] = None
+
+    def __enter__(self) -> 'AnalysisReport':
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Leave what was written so far on error; close() adds the trailer
+        self._close_files()
+
+    def _close_files(self):
+        if self._markdown is not None:
+            self._markdown.close()
+            self._yaml.close()
+            self._markdown = self._yaml = None
+
+    def _write(self, markdown: str, yaml_text: str):
+        self._markdown.write(markdown)
+        self._yaml.write(yaml_text)
+        self._markdown.flush()
+        self._yaml.flush()
+
+    def _create_files(self):
+        """Create both report files under the first name no earlier run has taken"""
+        os.makedirs(os.path.dirname(self._stem) or ".", exist_ok=True)
+        attempt = 1
+        while True:
+            stem = self._stem if attempt == 1 else f"{self._stem}_{attempt}"
+            attempt += 1
+            try:
+                markdown = open(f"{stem}.md", 'x', encoding='utf-8')
+            except FileExistsError:
+                continue
+            try:
+                self._yaml = open(f"{stem}.yaml", 'x', encoding='utf-8')
+            except FileExistsError:
+                markdown.close()
+                os.unlink(f"{stem}.md")
+                continue
+            self._markdown = markdown
+            self.markdown_path, self.yaml_path = f"{stem}.md", f"{stem}.yaml"
+            return
+
+    def open(self):
+        self._create_files()
+
+        summary = "\n".join(f"- **{name}**: {text}" for _, name, text, _, _ in DIMENSIONS)
+        markdown = f"""# Repository Analysis Report
+
+**Generated**: {self.generated.strftime('%Y-%m-%d %H:%M:%S')}{BR}
+**Analysis Tool**: {TOOL_NAME} v{TOOL_VERSION}
+
+---
+
+## Executive Summary
+
+This comprehensive analysis evaluates repository health across {len(DIMENSIONS)} critical dimensions:
+{summary}
+
+---
+
+## Repository Overview
+
+"""
+        metadata = {
+            "metadata": {
+                "timestamp": self.generated.isoformat(timespec='seconds'),
+                "version": TOOL_VERSION,
+                "analysis_tool": TOOL_NAME
+            }
+        }
+        self._write(markdown, "# OpenADK Repository Analysis Report\n" + _dump(metadata) +
+                    "\nrepositories:\n")
+
+    def add_repository(self, result: Dict[str, Any]):
+        """Append one analyze_repository() result to both reports"""
+        metrics = result["metrics"]
+        languages = ", ".join(f"{language}: {lines}"
+                              for language, lines in metrics.lines_by_language.items())
+        markdown = f"""### Repository: {result['name']}
+
+```
+Repository: {result['name']}
+Path: {result['path']}
+Branch: {result['branch']}
+Last Commit: {result['last_commit']}
+Uncommitted Changes: {'Yes' if result['uncommitted_changes'] else 'No'}
+Technology Stack: {' '.join(result['technology_stack']) or 'Unknown'}
+Files: {metrics.file_count}
+Lines of Code (approx): {metrics.total_lines}
+Lines by Language: {languages or 'N/A'}
+```
+
+"""
+        entry = {
+            "name": result["name"],
+            "path": result["path"],
+            "branch": result["branch"],
+            "last_commit": result["last_commit"],
+            "uncommitted_changes": result["uncommitted_changes"],
+            "technology_stack": result["technology_stack"],
+            "metrics": metrics.to_dict()
+        }
+        self._write(markdown, _dump([entry]))
+        self.repository_count += 1
+
+    def close(self, duration: float):
+        """Write the dimension, recommendation and metadata sections"""
+        sections = []
+        for icon, name, _, agents, areas in DIMENSIONS:
+            area_lines = "\n".join(f"- {area}" for area in areas)
+            sections.append(f"""### {icon} {name}
+**Score**: {PENDING}{BR}
+**Status**: Requires {agents}
+
+Key areas to evaluate:
+{area_lines}
+""")
+        recommendation = "*Agent analysis required to generate specific recommendations*"
+        markdown = f"""---
+
+## Dimensional Analysis
+
+{chr(10).join(sections)}
+---
+
+## Recommendations
+
+### Immediate Actions
+{recommendation}
+
+### Short-term Improvements
+{recommendation}
+
+### Long-term Strategic Items
+{recommendation}
+
+---
+
+## Next Steps
+
+To complete the comprehensive analysis:
+
+1. **Run specialized agent analysis**:
+   ```bash
+   # This will invoke OpenADK agents for deep analysis
+   claude analyze --agents all
+   ```
+
+2. **Review critical findings** in the detailed report
+
+3. **Prioritize improvements** based on your team's capacity
+
+4. **Track progress** with regular re-analysis
+
+---
+
+## Analysis Metadata
+
+- **Repositories Analyzed**: {self.repository_count}
+- **Analysis Duration**: {duration:.1f} seconds
+- **Timestamp**: {self.generated.isoformat(timespec='seconds')}
+- **Report Location**: {self.markdown_path}
+- **YAML Data**: {self.yaml_path}
+
+---
+
+*This report provides a foundation for comprehensive repository analysis. The full power of OpenADK's specialized agents can provide deeper insights into each dimension.*
+"""
+        summary = {
+            "analysis_summary": {
+                "duration_seconds": round(duration, 2),
+                "dimensions_analyzed": [
+                    {"name": name, "status": PENDING} for _, name, _, _, _ in DIMENSIONS
+                ]
+            }
+        }
+        # An empty block sequence would parse as null
+        repositories = "" if self.repository_count else "  []\n"
+        self._write(markdown, repositories + "\n" + _dump(summary))
+        self._close_files()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+OpenADK Workspace Analysis
+Analyzes many repositories concurrently and streams one consolidated report
+Total time follows the slowest repository instead of the sum of all of them
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import contextlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional
+
+from analysis_cache import AnalysisCache
+from analysis_report import AnalysisReport
+from report_archive import ReportArchive
+from discover_repos import collect_repo_info, detect_tech_stack, find_repositories
+from repo_metrics import DEFAULT_WORKERS, collect_metrics
+
+DEFAULT_KEEP_REPORTS = 20
+
+def analyze_repository(repo_path: str,
+                       cache: Optional[AnalysisCache] = None,
+                       io_workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+    """
+    Git info, technology stack and metrics for one repository
+
+    With a cache, a repository whose HEAD, branch and working tree are
+    unchanged reuses everything from it; "source" says which path was taken.
+    """
+    path = os.path.realpath(repo_path)
+    if cache is not None:
+        analysis = cache.analyze(path, io_workers)
+    else:
+        if os.path.exists(os.path.join(path, ".git")):
+            analysis = collect_repo_info(path)
+        else:
+            analysis = {"branch": "N/A", "last_commit": "N/A", "uncommitted_changes": False,
+                        "technology_stack": detect_tech_stack(path)}
+        analysis["metrics"] = collect_metrics(path, io_workers)
+        analysis["source"] = "full"
+
+    return {
+        "name": os.path.basename(path),
+        "path": path,
+        "branch": analysis["branch"],
+        "last_commit": analysis["last_commit"],
+        "uncommitted_changes": analysis["uncommitted_changes"],
+        "technology_stack": analysis["technology_stack"],
+        "metrics": analysis["metrics"],
+        "source": analysis["source"]
+    }
+
+def _fingerprint_part(result: Dict[str, Any]) -> bytes:
+    """The report content of one result, for telling whether a report is still current"""
+    content = {k: v for k, v in result.items() if k != "source"}
+    content["metrics"] = result["metrics"].to_dict()
+    return json.dumps(content, sort_keys=True).encode('utf-8') + b"\0"
+
+def iter_analyses(repo_paths: List[str],
+                  max_workers: int = DEFAULT_WORKERS,
+                  cache: Optional[AnalysisCache] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze repositories concurrently, yielding results in the order of repo_paths
+
+    Each result is yielded as soon as it and every earlier one are done, so
+    only out-of-order finishers are held in memory.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [executor.submit(analyze_repository, path, cache) for path in repo_paths]
+        for future in futures:
+            yield future.result()
+
+def analyze_repositories(repo_paths: List[str],
+                         max_workers: int = DEFAULT_WORKERS,
+                         cache: Optional[AnalysisCache] = None) -> List[Dict[str, Any]]:
+    """Analyze repositories concurrently; results keep the order of repo_paths"""
+    return list(iter_analyses(repo_paths, max_workers, cache))
+
+def main():
+    import argparse
+
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    parser = argparse.ArgumentParser(description='Analyze several repositories into one consolidated report')
+    parser.add_argument('repos', nargs='*', help='Repository paths (default: discover in --workspace)')
+    parser.add_argument('--workspace', default=str(project_root.parent),
+                        help='Directory to search for repositories when none are given')
+    parser.add_argument('--depth', type=int, default=1, help='Directory levels to search in the workspace')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Repositories analyzed at once')
+    parser.add_argument('--report-dir', default=str(project_root / "_project" / "reports"),
+                        help='Where to write the reports')
+    parser.add_argument('--cache', default=str(project_root / "_project" / ".cache" / "analysis.json"),
+                        help='Analysis cache location')
+    parser.add_argument('--no-cache', action='store_true', help='Recount every repository from scratch')
+    parser.add_argument('--archive-dir', default=str(project_root / "_project" / "archive"),
+                        help='Report archive holding the run index')
+    parser.add_argument('--keep-reports', type=int, default=DEFAULT_KEEP_REPORTS,
+                        help='Newest reports to keep uncompressed; older ones are compacted into the archive')
+
+    args = parser.parse_args()
+
+    repos = args.repos or find_repositories(args.workspace, args.depth)
+    missing = [repo for repo in repos if not os.path.isdir(repo)]
+    for repo in missing:
+        print(f"ERROR: Directory not found: {repo}")
+    repos = [repo for repo in repos if repo not in missing]
+    if not repos:
+        print("ERROR: No repositories to analyze")
+        return 1
+
+    cache = None if args.no_cache else AnalysisCache(args.cache)
+    start = time.monotonic()
+    digest = hashlib.sha256()
+    held: List[Dict[str, Any]] = []
+    with contextlib.ExitStack() as stack:
+        report: Optional[AnalysisReport] = None
+        for result in iter_analyses(repos, args.workers, cache):
+            digest.update(_fingerprint_part(result))
+            print(f"Analyzed {result['name']}")
+            # While every repository so far came from the cache the previous
+            # report may still be current, so hold results instead of writing
+            if report is None and result["source"] == "cached":
+                held.append(result)
+                continue
+            if report is None:
+                report = stack.enter_context(AnalysisReport(args.report_dir))
+                for earlier in held:
+                    report.add_repository(earlier)
+            report.add_repository(result)
+        duration = time.monotonic() - start
+        fingerprint = digest.hexdigest()
+
+        previous = cache.last_report if cache is not None else None
+        if (report is None and previous and previous["fingerprint"] == fingerprint
+                and os.path.exists(previous["markdown"]) and os.path.exists(previous["yaml"])):
+            print(f"No repository changed since the last report; analyzed {len(held)} "
+                  f"repositories in {duration:.1f} seconds")
+            print(f"Markdown report: {previous['markdown']}")
+            print(f"YAML data: {previous['yaml']}")
+            return 1 if missing else 0
+
+        if report is None:
+            report = stack.enter_context(AnalysisReport(args.report_dir))
+            for earlier in held:
+                report.add_repository(earlier)
+        report.close(duration)
+    if cache is not None:
+        cache.set_last_report(fingerprint, report.markdown_path, report.yaml_path)
+        cache.save()
+
+    with ReportArchive(args.archive_dir) as archive:
+        archive.index_report(report.yaml_path, report.markdown_path)
+        archive.compact(args.keep_reports)
+
+    print(f"Analyzed {report.repository_count} repositories in {duration:.1f} seconds")
+    print(f"Markdown report: {report.markdown_path}")
+    print(f"YAML data: {report.yaml_path}")
+    return 1 if missing else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+OpenADK Async Validation API
+asyncio facade over the validators and the context updater for concurrent agents
+Blocking work runs on one shared executor; identical in-flight calls share one result
+"""
+
+import os
+import sys
+import copy
+import asyncio
+import contextlib
+import functools
+import threading
+import weakref
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional, Tuple
+
+from agent_output_validator import validate_agent_output
+from check_time_estimates import TimeEstimateChecker
+from enforce_planning import PlanningEnforcer
+from update_context import ContextUpdater
+
+DEFAULT_WORKERS = 8
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+# Per event loop: key -> future of the computation in flight
+_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Future]]" = \
+    weakref.WeakKeyDictionary()
+# Per event loop: context path -> lock serializing load/modify/save
+_save_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = \
+    weakref.WeakKeyDictionary()
+
+def set_executor(executor: Optional[Executor]):
+    """Use executor for all blocking work (None restores the default thread pool)"""
+    global _executor
+    with _executor_lock:
+        _executor = executor
+
+def get_executor() -> Executor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="openadk")
+        return _executor
+
+def shutdown(wait: bool = True):
+    """Shut the shared executor down; the next call starts a new one"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+async def run_blocking(fn: Callable, *args, **kwargs) -> Any:
+    """Run fn(*args, **kwargs) on the shared executor"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+
+async def coalesced(key: Hashable, fn: Callable, *args, **kwargs) -> Any:
+    """
+    run_blocking(), sharing one computation between concurrent calls with the same key
+
+    A caller that is cancelled stops waiting without cancelling the
+    computation for the others. Each caller gets its own copy of the
+    result, so one caller editing it does not affect the others. Nothing
+    is cached once it completes.
+    """
+    loop = asyncio.get_running_loop()
+    inflight = _inflight.setdefault(loop, {})
+    future = inflight.get(key)
+    if future is None:
+        future = loop.run_in_executor(get_executor(), functools.partial(fn, *args, **kwargs))
+        inflight[key] = future
+
+        def forget(done: asyncio.Future):
+            if inflight.get(key) is done:
+                del inflight[key]
+            # Retrieve the exception so an unawaited failure is not logged
+            if not done.cancelled():
+                done.exception()
+        future.add_done_callback(forget)
+    return copy.deepcopy(await asyncio.shield(future))
+
+async def validate(output: str, output_type: str = "general") -> Dict:
+    """Async validate_agent_output()"""
+    return await coalesced(("validate", output_type, output), validate_agent_output, output, output_type)
+
+def _enforce(output: Any, agent_name: Optional[str]) -> Dict[str, Any]:
+    return PlanningEnforcer(agent_name).enforce_output(output)
+
+async def enforce(output: Any, agent_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Async PlanningEnforcer(agent_name).enforce_output()
+
+    Text outputs are coalesced. Structured outputs are mutable, so each
+    call runs on its own.
+    """
+    if isinstance(output, str):
+        return await coalesced(("enforce", agent_name, output), _enforce, output, agent_name)
+    return await run_blocking(_enforce, output, agent_name)
+
+async def check_file(path: str) -> List[Tuple[int, str, str]]:
+    """Async TimeEstimateChecker().check_file(); coalesced per path and file version"""
+    path = os.path.abspath(path)
+    try:
+        stat = await run_blocking(os.stat, path)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        stat_key = (0, -1)
+    return await coalesced(("check_file", path, stat_key), TimeEstimateChecker().check_file, path)
+
+def _context_lock(context_path: str) -> asyncio.Lock:
+    """
+    The lock for one context file in the running event loop
+
+    Locks are per event loop and per process: they keep the coroutines of
+    one loop from interleaving, not other loops, threads or processes.
+    """
+    locks = _save_locks.setdefault(asyncio.get_running_loop(), {})
+    return locks.setdefault(os.path.abspath(context_path), asyncio.Lock())
+
+async def load_context(context_path: str) -> ContextUpdater:
+    """A ContextUpdater with PROJECT_CONTEXT.yaml loaded off the event loop"""
+    updater = ContextUpdater(context_path)
+    await run_blocking(updater.load_existing)
+    return updater
+
+@contextlib.asynccontextmanager
+async def update_context(context_path: str, dry_run: bool = False,
+                         journal: bool = False) -> AsyncIterator[ContextUpdater]:
+    """
+    Load, modify and save PROJECT_CONTEXT.yaml as one step
+
+        async with update_context(path) as updater:
+            updater.add_current_focus("openadk", "Async API")
+
+    The per-file lock is held from load to save, so concurrent updates in
+    this event loop never lose each other's changes. The updater is saved
+    when the block exits without an exception; RuntimeError is raised if
+    the save fails. See _context_lock() for the scope of the lock.
+    """
+    async with _context_lock(context_path):
+        updater = ContextUpdater(context_path)
+        await run_blocking(updater.load_existing)
+        yield updater
+        if not await run_blocking(updater.save, dry_run, journal):
+            raise RuntimeError(f"Could not save {context_path}")
+
+def _rebase_and_save(updater: ContextUpdater, dry_run: bool, journal: bool) -> bool:
+    return updater.rebase() and updater.save(dry_run, journal)
+
+async def save_context(updater: ContextUpdater, dry_run: bool = False, journal: bool = False) -> bool:
+    """
+    Async updater.save(), rebased onto the file as it is now
+
+    The updater may have been loaded before other agents saved, so under
+    the per-file lock the file is reloaded and the pending changes are
+    reapplied on top of it before saving. Changes to the same values as a
+    concurrent save fail to rebase and return False. Prefer
+    update_context(), which holds the lock from load to save.
+    """
+    async with _context_lock(updater.context_path):
+        return await run_blocking(_rebase_and_save, updater, dry_run, journal)
+
+# Example usage
+async def _demo():
+    text = "Phase 1: 2 weeks\nDeadline: Q1 2025"
+    results = await asyncio.gather(*(validate(text, "project_plan") for _ in range(5)))
+    for result in results:
+        print(f"Valid: {result['valid']}, violations: {len(result['violations'])}")
+    try:
+        enforced = await enforce(text)
+        print(f"Enforced: {enforced['transformed']!r}")
+    except ValueError as e:
+        print(f"Enforcement rejected the output: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(_demo())
+    shutdown()
+    sys.exit(0)
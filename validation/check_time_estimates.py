@@ -4,81 +4,258 @@ OpenADK Time Estimate Checker
 Validates that documents don't contain time-based estimates
 """
 
+import os
 import re
 import sys
+import atexit
 from pathlib import Path
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import rule_stats
+from result_formats import Result, make_writer
+from fileutil import atomic_write
+from rule_engine import get_engine
+
+# Patterns that indicate time-based estimates, with the rule id reported for each
+TIME_RULES = [
+    ("numeric-duration", r'\b\d+\s*(day|days|week|weeks|month|months|year|years|hour|hours|minute|minutes)\b'),
+    ("spelled-duration", r'\b(one|two|three|four|five|six|seven|eight|nine|ten)\s*(day|days|week|weeks|month|months|hour|hours)\b'),
+    ("quarter-year", r'\bQ[1-4]\s+20\d{2}\b'),  # Q1 2025, etc.
+    ("month-year", r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+20\d{2}\b'),
+    ("numbered-period", r'\b(Week|Month|Day)\s+\d+\b'),  # Week 1, Month 2, etc.
+    ("duration-range", r'\b\d+\s*-\s*\d+\s*(days|weeks|months)\b'),  # 2-3 days, 1-2 weeks
+    ("timeline-value", r'\btimeline\s*:\s*\d+'),  # timeline: 3
+    ("ordinal-period", r'\b(first|second|third)\s+(week|month|quarter)\b'),
+    ("month-phase", r'\b(early|mid|late)\s+(January|February|March|April|May|June|July|August|September|October|November|December)\b'),
+    ("period-boundary", r'\bby\s+(end of|beginning of)\s+(week|month|quarter|year)\b'),
+]
+TIME_PATTERNS = [pattern for _, pattern in TIME_RULES]
+
+DEFAULT_WORKERS = 8
+
+# Exceptions - contexts where time references are acceptable
+EXCEPTION_CONTEXTS = [
+    r'copyright\s+\d{4}',  # Copyright years
+    r'version\s+\d+\.\d+',  # Version numbers
+    r'RFC\s+\d+',  # RFC references
+    r'ISO\s+\d+',  # ISO standards
+    r'port\s+\d+',  # Port numbers
+    r'\d+\s*ms',  # Milliseconds (technical)
+    r'\d+\s*seconds?\s+(timeout|delay|interval)',  # Technical timeouts
+]
+
+@dataclass
+class TimeViolation:
+    """One time estimate; columns are 1-based, end_column exclusive"""
+    line: int
+    column: int
+    end_column: int
+    match: str
+    context: str
+    rule: str
+
+@dataclass
+class FixResult:
+    """Outcome of fixing one file"""
+    path: str
+    fixed: int
+    remaining: List[TimeViolation]
+    written: bool = False
+
+def load_fixers() -> List[Tuple["re.Pattern", str]]:
+    """
+    Transformation mappings as (pattern, replacement) pairs, tried in order
+    
+    planning_rules.yaml transformations come first, with any spacing
+    allowed around words and dashes ("2-3 days" also matches "2 - 3 days"),
+    then the AgentOutputValidator mappings. Replacements are literal.
+    """
+    from agent_output_validator import TRANSFORMATIONS
+    from enforce_planning import RULES
+    
+    fixers = []
+    for old, new in (RULES.get("transformations") or {}).items():
+        pattern = r'\s*-\s*'.join(r'\s*'.join(re.escape(word) for word in part.split())
+                                  for part in old.split("-"))
+        fixers.append((re.compile(pattern, re.IGNORECASE), new))
+    fixers.extend((re.compile(pattern, re.IGNORECASE), new) for pattern, new in TRANSFORMATIONS.items())
+    return fixers
 
 class TimeEstimateChecker:
     def __init__(self):
-        # Patterns that indicate time-based estimates
-        self.time_patterns = [
-            r'\b\d+\s*(day|days|week|weeks|month|months|year|years|hour|hours|minute|minutes)\b',
-            r'\b(one|two|three|four|five|six|seven|eight|nine|ten)\s*(day|days|week|weeks|month|months|hour|hours)\b',
-            r'\bQ[1-4]\s+20\d{2}\b',  # Q1 2025, etc.
-            r'\b(January|February|March|April|May|June|July|August|September|October|November|December)\s+20\d{2}\b',
-            r'\b(Week|Month|Day)\s+\d+\b',  # Week 1, Month 2, etc.
-            r'\b\d+\s*-\s*\d+\s*(days|weeks|months)\b',  # 2-3 days, 1-2 weeks
-            r'\btimeline\s*:\s*\d+',  # timeline: 3
-            r'\b(first|second|third)\s+(week|month|quarter)\b',
-            r'\b(early|mid|late)\s+(January|February|March|April|May|June|July|August|September|October|November|December)\b',
-            r'\bby\s+(end of|beginning of)\s+(week|month|quarter|year)\b',
-        ]
-        
-        # Compile patterns for efficiency
-        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.time_patterns]
-        
-        # Exceptions - contexts where time references are acceptable
-        self.exception_contexts = [
-            r'copyright\s+\d{4}',  # Copyright years
-            r'version\s+\d+\.\d+',  # Version numbers
-            r'RFC\s+\d+',  # RFC references
-            r'ISO\s+\d+',  # ISO standards
-            r'port\s+\d+',  # Port numbers
-            r'\d+\s*ms',  # Milliseconds (technical)
-            r'\d+\s*seconds?\s+(timeout|delay|interval)',  # Technical timeouts
-        ]
-        
-        self.exception_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.exception_contexts]
+        # Compiled and matched by the shared rule engine
+        self.time_patterns = list(TIME_PATTERNS)
+        self.exception_contexts = list(EXCEPTION_CONTEXTS)
+        self.rule_ids = {pattern: rule_id for rule_id, pattern in TIME_RULES}
+        self._fixers: Optional[List[Tuple["re.Pattern", str]]] = None
         
     def check_file(self, filepath: str) -> List[Tuple[int, str, str]]:
         """Check a file for time-based estimates
         
         Returns: List of (line_number, matched_text, context) tuples
         """
-        violations = []
-        
+        return [(v.line, v.match, v.context) for v in self.check_file_detailed(filepath)]
+    
+    def check_file_detailed(self, filepath: str) -> List[TimeViolation]:
+        """Check a file for time-based estimates, with the rule and column of each"""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            for line_num, line in enumerate(lines, 1):
+                text = f.read()
+            return self.check_text(text, filepath)
+        except Exception as e:
+            print(f"Error reading {filepath}: {e}", file=sys.stderr)
+            return []
+    
+    def check_text(self, text: str, filepath: str = "") -> List[TimeViolation]:
+        """Check text for time-based estimates; filepath decides whether code comments are skipped"""
+        violations = []
+        stats = rule_stats.active()
+        
+        lines = text.split("\n")
+        # The whole text is scanned once per pattern, then split into lines
+        scan = get_engine().scan(text)
+        skip_comments = filepath.endswith(('.py', '.js', '.ts'))
+        
+        found: Dict[int, List[Tuple[str, int, int, str]]] = {}
+        for pattern in self.time_patterns:
+            if stats is None:
+                by_line = scan.by_line(pattern)
+            else:
+                by_line = stats.timed("time_estimates", pattern, scan.by_line, pattern)
+            for line_num, matches in by_line.items():
                 # Skip comments in code files
-                if filepath.endswith(('.py', '.js', '.ts')) and line.strip().startswith(('#', '//', '/*')):
+                if skip_comments and lines[line_num - 1].strip().startswith(('#', '//', '/*')):
+                    continue
+                found.setdefault(line_num, []).extend(
+                    (pattern, start, end, matched) for _, start, end, matched in matches)
+        
+        if found:
+            # Lines with an exception context are not violations
+            excepted = set()
+            for exception in self.exception_contexts:
+                if stats is None:
+                    excepted.update(scan.by_line(exception))
+                else:
+                    excepted.update(stats.timed("time_estimates.exceptions", exception,
+                                                scan.by_line, exception))
+            for line_num in sorted(found):
+                if line_num in excepted:
                     continue
-                    
-                # Check for violations
-                for pattern in self.compiled_patterns:
-                    matches = pattern.finditer(line)
-                    for match in matches:
-                        # Check if this match is an exception
-                        is_exception = False
-                        for exception in self.exception_patterns:
-                            if exception.search(line):
-                                is_exception = True
-                                break
-                        
-                        if not is_exception:
-                            violations.append((
-                                line_num,
-                                match.group(),
-                                line.strip()
-                            ))
-                            
+                for pattern, start, end, matched in found[line_num]:
+                    violations.append(TimeViolation(
+                        line=line_num,
+                        column=start + 1,
+                        end_column=end + 1,
+                        match=matched,
+                        context=lines[line_num - 1].strip(),
+                        rule=self.rule_ids.get(pattern, pattern)
+                    ))
+        
+        return violations
+    
+    def replacement_for(self, matched: str) -> Optional[str]:
+        """The replacement of the first transformation mapping matching the whole span"""
+        if self._fixers is None:
+            self._fixers = load_fixers()
+        for pattern, replacement in self._fixers:
+            if pattern.fullmatch(matched.strip()):
+                return replacement
+        return None
+    
+    def fix_text(self, text: str, filepath: str = "") -> Tuple[str, int]:
+        """Replace every violating span that has a transformation mapping
+        
+        Where spans on a line overlap ("2-3 days" and "3 days"), the
+        earliest and then longest one with a mapping wins.
+        
+        Returns: (fixed text, number of spans replaced)
+        """
+        edits: Dict[int, List[Tuple[int, int, str]]] = {}
+        for v in self.check_text(text, filepath):
+            replacement = self.replacement_for(v.match)
+            if replacement is not None:
+                edits.setdefault(v.line, []).append((v.column - 1, v.end_column - 1, replacement))
+        if not edits:
+            return text, 0
+            
+        lines = text.split("\n")
+        fixed = 0
+        for line_num, spans in edits.items():
+            spans.sort(key=lambda span: (span[0], span[0] - span[1]))
+            chosen = []
+            end = -1
+            for start, stop, replacement in spans:
+                if start >= end:
+                    chosen.append((start, stop, replacement))
+                    end = stop
+            line = lines[line_num - 1]
+            for start, stop, replacement in reversed(chosen):
+                line = line[:start] + replacement + line[stop:]
+            lines[line_num - 1] = line
+            fixed += len(chosen)
+        return "\n".join(lines), fixed
+    
+    def fix_file(self, filepath: str, dry_run: bool = False) -> FixResult:
+        """Fix one file in a single read and an atomic write"""
+        try:
+            with open(filepath, 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
         except Exception as e:
-            print(f"Error reading {filepath}: {e}")
+            print(f"Error reading {filepath}: {e}", file=sys.stderr)
+            return FixResult(filepath, 0, [])
+        fixed_text, fixed = self.fix_text(text, filepath)
+        remaining = self.check_text(fixed_text, filepath) if fixed else self.check_text(text, filepath)
+        written = False
+        if fixed and not dry_run:
+            atomic_write(filepath, fixed_text)
+            written = True
+        return FixResult(filepath, fixed, remaining, written)
+    
+    def fix_tree(self, path: str, patterns: List[str] = None, max_workers: int = DEFAULT_WORKERS,
+                 dry_run: bool = False) -> Iterator[FixResult]:
+        """Fix every matching file under path in parallel, yielding files that had violations"""
+        files = [path] if Path(path).is_file() else self.iter_files(path, patterns)
+        if self._fixers is None:
+            self._fixers = load_fixers()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for result in executor.map(lambda filepath: self.fix_file(filepath, dry_run), files):
+                if result.fixed or result.remaining:
+                    yield result
+    
+    def iter_files(self, directory: str, patterns: List[str] = None) -> Iterator[str]:
+        """Yield the files in directory matching patterns, each once"""
+        if patterns is None:
+            patterns = ['*.md', '*.yaml', '*.yml']
             
-        return violations
+        seen = set()
+        path = Path(directory)
+        for pattern in patterns:
+            for filepath in path.rglob(pattern):
+                # Skip certain directories
+                if any(skip in str(filepath) for skip in ['node_modules', '.git', 'venv', '__pycache__']):
+                    continue
+                if filepath in seen:
+                    continue
+                seen.add(filepath)
+                yield str(filepath)
+    
+    def iter_results(self, directory: str, patterns: List[str] = None,
+                     detailed: bool = False, files: Optional[Iterable[str]] = None) -> Iterator[Tuple[str, list]]:
+        """Yield (filepath, violations) for each file with violations as soon as it is checked
+        
+        Only one file's violations are held at a time, so consumers can
+        print or serialize results while the scan is still running. With
+        detailed=True violations are TimeViolation records, otherwise the
+        tuples returned by check_file(). files, when given, replaces the
+        iter_files() walk of directory.
+        """
+        check = self.check_file_detailed if detailed else self.check_file
+        for filepath in self.iter_files(directory, patterns) if files is None else files:
+            violations = check(filepath)
+            if violations:
+                yield filepath, violations
     
     def check_directory(self, directory: str, patterns: List[str] = None) -> dict:
         """Check all matching files in a directory
@@ -89,78 +266,259 @@ class TimeEstimateChecker:
             
         Returns: Dictionary of filepath -> violations
         """
+        return dict(self.iter_results(directory, patterns))
+    
+    def print_file_results(self, filepath: str, violations: List[Tuple[int, str, str]]):
+        """Print the violations of one file"""
+        print(f"FILE: {filepath}")
+        for line_num, matched, context in violations:
+            print(f"   Line {line_num}: '{matched}'")
+            print(f"   Context: {context[:100]}...")
+        print()
+    
+    def watch(self, path: str, patterns: List[str] = None):
+        """Recheck files as they change, printing violations incrementally
+        
+        Runs until interrupted. Only the files in each debounced batch of
+        changes are rechecked.
+        """
+        from watch import watch_paths
+        
         if patterns is None:
             patterns = ['*.md', '*.yaml', '*.yml']
             
-        results = {}
-        path = Path(directory)
+        if Path(path).is_file():
+            results = {}
+            violations = self.check_file(path)
+            if violations:
+                results[path] = violations
+        else:
+            results = self.check_directory(path, patterns)
+        self.print_results(results)
+        # watch_paths reports absolute, unresolved paths: key results the same way
+        results = {os.path.abspath(p): v for p, v in results.items()}
         
-        for pattern in patterns:
-            for filepath in path.rglob(pattern):
-                # Skip certain directories
-                if any(skip in str(filepath) for skip in ['node_modules', '.git', 'venv', '__pycache__']):
-                    continue
-                    
-                violations = self.check_file(str(filepath))
-                if violations:
-                    results[str(filepath)] = violations
-                    
-        return results
+        try:
+            for changed in watch_paths([path], patterns):
+                for filepath in sorted(changed):
+                    violations = self.check_file(filepath) if Path(filepath).is_file() else []
+                    had_violations = filepath in results
+                    if violations:
+                        results[filepath] = violations
+                        self.print_file_results(filepath, violations)
+                    elif had_violations:
+                        del results[filepath]
+                        print(f"CLEAN: {filepath}\n")
+                total = sum(len(v) for v in results.values())
+                print(f"STATUS: {total} violations in {len(results)} files")
+        except KeyboardInterrupt:
+            pass
     
     def print_results(self, results: dict):
         """Print violations in a readable format"""
-        if not results:
-            print("SUCCESS: No time-based estimates found!")
-            return
-            
-        print("WARNING: Time-based estimates detected:\n")
+        self.print_stream(results.items())
+    
+    def print_stream(self, results: Iterable[Tuple[str, List[Tuple[int, str, str]]]],
+                     limit: Optional['ViolationLimit'] = None) -> int:
+        """Print (filepath, violations) pairs as they arrive; returns the violation count
         
+        limit is the --max-violations limit the results went through, noted
+        in the summary when it cut the scan short.
+        """
         total_violations = 0
-        for filepath, violations in results.items():
-            print(f"FILE: {filepath}")
-            for line_num, matched, context in violations:
-                print(f"   Line {line_num}: '{matched}'")
-                print(f"   Context: {context[:100]}...")
-            print()
+        for filepath, violations in results:
+            if total_violations == 0:
+                print("WARNING: Time-based estimates detected:\n")
+            self.print_file_results(filepath, violations)
             total_violations += len(violations)
             
+        if not total_violations:
+            print("SUCCESS: No time-based estimates found!")
+            return 0
+            
         print(f"\nERROR: Total violations: {total_violations}")
+        if limit is not None and limit.stopped:
+            print(f"Stopped after {limit.max_violations} violations (--max-violations)")
         print("\nRECOMMENDATION: Replace time estimates with:")
         print("   - Priority levels (Critical, High, Medium, Low)")
         print("   - Complexity ratings (Simple, Moderate, Complex)")
         print("   - Relative sizing (Small, Medium, Large, XL)")
         print("   - Sequencing (Priority 1, Priority 2, Priority 3)")
+        return total_violations
+    
+    def write_results(self, results: Iterable[Tuple[str, List[TimeViolation]]],
+                      format: str, out: TextIO = sys.stdout) -> int:
+        """Stream detailed results as JSON lines or SARIF; returns the violation count"""
+        writer = make_writer(format, "OpenADK Time Estimate Checker", out,
+                             {rule_id: f"Time-based estimate ({rule_id.replace('-', ' ')})"
+                              for rule_id, _ in TIME_RULES})
+        for filepath, violations in results:
+            for v in violations:
+                writer.write(Result(
+                    rule_id=v.rule,
+                    level="error",
+                    message=f"Time-based estimate '{v.match}'. Use priority levels or complexity ratings.",
+                    file=filepath,
+                    line=v.line,
+                    column=v.column,
+                    end_line=v.line,
+                    end_column=v.end_column,
+                    match=v.match
+                ))
+        writer.close()
+        return writer.count
+
+class ViolationLimit:
+    """
+    Stops a scan once max_violations violations have been reported
+    
+    `stopped` is set only when the limit cut the scan short: violations of
+    the last file were dropped, or files were left unchecked. Reaching
+    exactly max_violations at the end of the scan does not count.
+    """
+    
+    def __init__(self, max_violations: int):
+        self.max_violations = max_violations
+        self.stopped = False
+    
+    def apply(self, results: Iterable[Tuple[str, list]],
+              files: Optional[Iterator[str]] = None) -> Iterator[Tuple[str, list]]:
+        """
+        Pass results through until the limit is reached
+        
+        files is the iterator the results are checked from, if any; one
+        more path is taken from it to learn whether any file was left out.
+        """
+        total = 0
+        for filepath, violations in results:
+            left = self.max_violations - total
+            if len(violations) >= left:
+                self.stopped = len(violations) > left or (
+                    files is not None and next(files, None) is not None)
+                yield filepath, violations[:left]
+                return
+            total += len(violations)
+            yield filepath, violations
+
+def report_stats(show: bool, stats_file: str = None):
+    """
+    Print and/or export the rule statistics collected during this run
+
+    The table goes to stderr, so it never mixes into --format jsonl or
+    sarif output on stdout.
+    """
+    stats = rule_stats.active()
+    if stats is None:
+        return
+    if show:
+        print("\nRULE STATISTICS:", file=sys.stderr)
+        print(stats.format_table(), file=sys.stderr)
+    if stats_file:
+        stats.write_prometheus(stats_file)
+
+def fix(checker: TimeEstimateChecker, path: str, patterns: List[str],
+        max_workers: int = DEFAULT_WORKERS, dry_run: bool = False) -> int:
+    """Run --fix over path and print what changed; returns the exit code"""
+    files = fixed = remaining = 0
+    for result in checker.fix_tree(path, patterns, max_workers, dry_run):
+        if result.fixed:
+            files += 1
+            fixed += result.fixed
+            action = "WOULD FIX" if dry_run else "FIXED"
+            print(f"{action}: {result.path} ({result.fixed} replacements)")
+        if result.remaining:
+            remaining += len(result.remaining)
+            print(f"MANUAL: {result.path}")
+            for v in result.remaining:
+                print(f"   Line {v.line}: '{v.match}' has no transformation mapping")
+            
+    verb = "Would replace" if dry_run else "Replaced"
+    print(f"\n{verb} {fixed} time estimates in {files} files")
+    if remaining:
+        print(f"ERROR: {remaining} violations need manual changes")
+        return 1
+    return 0
 
 def main():
     import argparse
     
+    def positive_int(value: str) -> int:
+        number = int(value)
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+        return number
+    
     parser = argparse.ArgumentParser(description='Check for time-based estimates in documentation')
     parser.add_argument('path', nargs='?', default='.', help='Path to check (file or directory)')
     parser.add_argument('--patterns', nargs='+', default=['*.md', '*.yaml', '*.yml'],
                        help='File patterns to check')
-    parser.add_argument('--fix', action='store_true', help='Suggest fixes for violations')
+    parser.add_argument('--fix', action='store_true',
+                       help='Rewrite violations in place using the transformation mappings')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='With --fix, report what would change without writing files')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                       help='Files fixed in parallel with --fix')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and recheck files as they change')
+    parser.add_argument('--format', choices=['text', 'jsonl', 'sarif'], default='text',
+                       help='Output format (jsonl: one JSON object per violation; sarif: SARIF 2.1.0 log)')
+    parser.add_argument('--max-violations', type=positive_int, metavar='N',
+                       help='Stop scanning after N violations (at least 1)')
+    parser.add_argument('--stats', action='store_true',
+                       help='Print per-rule evaluation counts, matches and time spent')
+    parser.add_argument('--stats-file', help='Write per-rule statistics in Prometheus text format')
     
     args = parser.parse_args()
+    if args.watch and args.format != 'text':
+        parser.error("--watch only supports --format text")
+    if args.fix and args.format != 'text':
+        parser.error("--fix only supports --format text")
+    if args.fix and args.max_violations is not None:
+        parser.error("--fix cannot be combined with --max-violations")
+    
+    if args.stats or args.stats_file:
+        rule_stats.enable()
+        atexit.register(report_stats, args.stats, args.stats_file)
     
     checker = TimeEstimateChecker()
     
+    if args.watch:
+        if not Path(args.path).exists():
+            print(f"ERROR: Path not found: {args.path}")
+            sys.exit(1)
+        checker.watch(args.path, args.patterns)
+        sys.exit(0)
+    
+    if args.fix:
+        if not Path(args.path).exists():
+            print(f"ERROR: Path not found: {args.path}")
+            sys.exit(1)
+        sys.exit(fix(checker, args.path, args.patterns, args.workers, args.dry_run))
+    
     path = Path(args.path)
+    detailed = args.format != 'text'
     if path.is_file():
-        violations = checker.check_file(str(path))
-        if violations:
-            results = {str(path): violations}
-            checker.print_results(results)
-            sys.exit(1)
-        else:
+        violations = checker.check_file_detailed(str(path)) if detailed else checker.check_file(str(path))
+        if not violations and not detailed:
             print(f"SUCCESS: {path} contains no time-based estimates")
             sys.exit(0)
+        results = iter([(str(path), violations)] if violations else [])
     elif path.is_dir():
-        results = checker.check_directory(str(path), args.patterns)
-        checker.print_results(results)
-        sys.exit(1 if results else 0)
+        files = checker.iter_files(str(path), args.patterns)
+        results = checker.iter_results(str(path), args.patterns, detailed, files)
     else:
         print(f"ERROR: Path not found: {path}")
         sys.exit(1)
+    
+    limit = None
+    if args.max_violations is not None:
+        limit = ViolationLimit(args.max_violations)
+        results = limit.apply(results, files if path.is_dir() else None)
+    if detailed:
+        total = checker.write_results(results, args.format)
+    else:
+        total = checker.print_stream(results, limit)
+    sys.exit(1 if total else 0)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
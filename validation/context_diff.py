@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+OpenADK Context Diff Engine
+Recursive structural diff for PROJECT_CONTEXT data
+Produces JSON-Patch-style operations (add, remove, replace) with JSON Pointer paths
+"""
+
+from difflib import SequenceMatcher
+from typing import Dict, List, Any, Hashable
+
+# Keys used to match list items that are mappings (e.g. named entries)
+LIST_ITEM_KEYS = ("name", "id", "path")
+
+def escape_pointer(token: Any) -> str:
+    """Escape one JSON Pointer reference token"""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable fingerprint of a YAML value, used to align list items"""
+    if isinstance(value, dict):
+        return ("{}", frozenset((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return ("[]", tuple(_freeze(v) for v in value))
+    return (type(value).__name__, value)
+
+def _item_key(items: List[Any]) -> Any:
+    """Pick a field that uniquely identifies every mapping in the list, if any"""
+    if not items or not all(isinstance(item, dict) for item in items):
+        return None
+    for key in LIST_ITEM_KEYS:
+        values = [item.get(key) for item in items]
+        if None not in values and len(set(map(_freeze, values))) == len(values):
+            return key
+    return None
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    Compute the operations that turn `old` into `new`
+
+    Mappings are compared key by key. Lists are aligned with a longest
+    common subsequence over item fingerprints, or over a key field when
+    every item is a mapping with a unique name/id/path. Subtrees that are
+    the same object are skipped without recursion; nothing is compared with
+    a full deep equality check, so the cost stays linear in the data size.
+    Operations carry the previous value under "old" for change logs and
+    must be applied in order.
+    """
+    ops: List[Dict[str, Any]] = []
+    _diff(old, new, path, ops)
+    return ops
+
+def _diff(old: Any, new: Any, path: str, ops: List[Dict[str, Any]]):
+    if old is new:
+        return
+    if isinstance(old, dict) and isinstance(new, dict):
+        _diff_dict(old, new, path, ops)
+    elif isinstance(old, list) and isinstance(new, list):
+        _diff_list(old, new, path, ops)
+    elif type(old) is not type(new) or old != new:
+        ops.append({"op": "replace", "path": path, "value": new, "old": old})
+
+def _diff_dict(old: Dict, new: Dict, path: str, ops: List[Dict[str, Any]]):
+    for key, old_value in old.items():
+        child = f"{path}/{escape_pointer(key)}"
+        if key not in new:
+            ops.append({"op": "remove", "path": child, "old": old_value})
+        else:
+            _diff(old_value, new[key], child, ops)
+    for key, new_value in new.items():
+        if key not in old:
+            ops.append({"op": "add", "path": f"{path}/{escape_pointer(key)}", "value": new_value})
+
+def _diff_list(old: List, new: List, path: str, ops: List[Dict[str, Any]]):
+    if len(old) == len(new) and all(a is b for a, b in zip(old, new)):
+        return
+
+    key = _item_key(old)
+    if key is not None and key == _item_key(new):
+        old_marks = [_freeze(item[key]) for item in old]
+        new_marks = [_freeze(item[key]) for item in new]
+    else:
+        key = None
+        old_marks = [_freeze(item) for item in old]
+        new_marks = [_freeze(item) for item in new]
+
+    # Index j tracks the position in the list as it is being patched:
+    # everything before j already matches `new`
+    matcher = SequenceMatcher(None, old_marks, new_marks, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            if key is not None:
+                for offset in range(i2 - i1):
+                    _diff(old[i1 + offset], new[j1 + offset], f"{path}/{j1 + offset}", ops)
+            continue
+        if tag == "replace" and i2 - i1 == j2 - j1:
+            for offset in range(i2 - i1):
+                _diff(old[i1 + offset], new[j1 + offset], f"{path}/{j1 + offset}", ops)
+            continue
+        for index in range(i1, i2):
+            ops.append({"op": "remove", "path": f"{path}/{j1}", "old": old[index]})
+        for index in range(j1, j2):
+            ops.append({"op": "add", "path": f"{path}/{index}", "value": new[index]})
+
+def unescape_pointer(token: str) -> str:
+    """Reverse escape_pointer"""
+    return token.replace("~1", "/").replace("~0", "~")
+
+def apply_patch(doc: Any, ops: List[Dict[str, Any]]) -> Any:
+    """
+    Apply operations produced by diff() to `doc` in place
+
+    Returns the patched document (a new object only when the root itself
+    is replaced).
+    """
+    for op in ops:
+        tokens = [unescape_pointer(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            doc = op.get("value")
+            continue
+
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = int(last)
+            if op["op"] == "add":
+                parent.insert(index, op["value"])
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = op["value"]
+        elif op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return doc
+
+def format_op(op: Dict[str, Any]) -> str:
+    """One-line human readable description of an operation"""
+    path = op["path"] or "/"
+    if op["op"] == "add":
+        return f"Added {path}"
+    if op["op"] == "remove":
+        return f"Removed {path}"
+    old, new = op.get("old"), op.get("value")
+    if isinstance(old, (dict, list)) or isinstance(new, (dict, list)):
+        return f"Updated {path}"
+    return f"Updated {path}: {old} -> {new}"
+
+# Example usage
+if __name__ == "__main__":
+    before = {
+        "repositories": {
+            "openadk": {"status": "active", "technology_stack": ["Python", "Bash"]},
+            "backend": {"status": "active", "technology_stack": ["Go"]}
+        }
+    }
+    after = {
+        "repositories": {
+            "openadk": {"status": "active", "technology_stack": ["Python", "Bash", "YAML"]},
+            "backend": {"status": "maintenance", "technology_stack": ["Go"]}
+        }
+    }
+    for op in diff(before, after):
+        print(format_op(op))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+OpenADK Repository Discovery
+Finds git repositories in the workspace and collects their metadata concurrently
+Feeds ContextUpdater.update_repository in one batch
+"""
+
+import os
+import sys
+import subprocess
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Set
+
+from update_context import ContextUpdater
+
+DEFAULT_WORKERS = 8
+GIT_TIMEOUT = 30
+
+# Same indicators as analyze-repo.sh detect_tech_stack, checked against one
+# directory listing per repository
+TECH_STACK_INDICATORS = [
+    ("Node.js/JavaScript", ["package.json"]),
+    ("Python", ["requirements.txt", "setup.py", "pyproject.toml"]),
+    ("Go", ["go.mod"]),
+    ("Rust", ["Cargo.toml"]),
+    ("Java", ["pom.xml", "build.gradle"]),
+    ("PHP", ["composer.json"]),
+    ("Ruby", ["Gemfile"]),
+    ("C#/.NET", ["*.csproj", "*.sln"]),
+    ("Docker", ["Dockerfile"]),
+    ("Docker-Compose", ["docker-compose.yml", "docker-compose.yaml"]),
+    ("GitHub-Actions", [".github/workflows"]),
+    ("GitLab-CI", [".gitlab-ci.yml"]),
+    ("Jenkins", ["Jenkinsfile"]),
+]
+
+def _has_indicator(repo_path: str, names: Set[str], indicator: str) -> bool:
+    if indicator.startswith("*"):
+        return any(name.endswith(indicator[1:]) for name in names)
+    if "/" in indicator:
+        return indicator.split("/", 1)[0] in names and os.path.isdir(os.path.join(repo_path, indicator))
+    return indicator in names
+
+def detect_tech_stack(repo_path: str) -> List[str]:
+    """Detect technologies from well-known files in the repository root"""
+    try:
+        names = {entry.name for entry in os.scandir(repo_path)}
+    except OSError:
+        return []
+    return [
+        label for label, indicators in TECH_STACK_INDICATORS
+        if any(_has_indicator(repo_path, names, indicator) for indicator in indicators)
+    ]
+
+def find_repositories(workspace: str, max_depth: int = 1) -> List[str]:
+    """Find git repositories up to max_depth levels below the workspace"""
+    repos = []
+    pending = [(workspace, 0)]
+    while pending:
+        directory, depth = pending.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.') or not entry.is_dir(follow_symlinks=False):
+                continue
+            if os.path.exists(os.path.join(entry.path, '.git')):
+                repos.append(entry.path)
+            elif depth + 1 < max_depth:
+                pending.append((entry.path, depth + 1))
+    return sorted(repos)
+
+def _git(repo_path: str, *args: str) -> Optional[str]:
+    env = dict(os.environ, GIT_OPTIONAL_LOCKS="0")
+    try:
+        result = subprocess.run(["git", "-C", repo_path, *args], capture_output=True,
+                                text=True, timeout=GIT_TIMEOUT, env=env)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+def collect_repo_info(repo_path: str) -> Dict[str, Any]:
+    """Branch, last commit, dirty state and tech stack for one repository"""
+    branch = "N/A"
+    dirty = False
+
+    # One status call gives both the branch and the dirty state
+    status = _git(repo_path, "status", "--porcelain=v2", "--branch")
+    if status is not None:
+        for line in status.splitlines():
+            if line.startswith("# branch.head "):
+                head = line[len("# branch.head "):]
+                branch = "N/A" if head == "(detached)" else head
+            elif line and not line.startswith("#"):
+                dirty = True
+                break
+
+    last_commit = _git(repo_path, "log", "-1", "--format=%h - %s")
+
+    return {
+        "path": repo_path,
+        "has_git": True,
+        "branch": branch,
+        "last_commit": last_commit.strip() if last_commit else "N/A",
+        "uncommitted_changes": dirty,
+        "technology_stack": detect_tech_stack(repo_path)
+    }
+
+def discover_workspace(workspace: str,
+                       max_workers: int = DEFAULT_WORKERS,
+                       max_depth: int = 1) -> Dict[str, Dict[str, Any]]:
+    """Collect metadata for every repository in the workspace in parallel"""
+    repos = find_repositories(workspace, max_depth)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        infos = executor.map(collect_repo_info, repos)
+        return {os.path.relpath(repo, workspace): info for repo, info in zip(repos, infos)}
+
+def refresh_context(updater: ContextUpdater,
+                    workspace: str,
+                    max_workers: int = DEFAULT_WORKERS,
+                    max_depth: int = 1) -> int:
+    """Discover the workspace and record every repository in the updater"""
+    project_root = Path(updater.context_path).resolve().parent.parent
+    current = (updater.updated_data or updater.existing_data or {}).get('repositories') or {}
+
+    discovered = discover_workspace(workspace, max_workers, max_depth)
+    for name, info in discovered.items():
+        info["path"] = os.path.relpath(info["path"], project_root)
+        if name not in current:
+            info["status"] = "active"
+        updater.update_repository(name, info)
+    return len(discovered)
+
+def main():
+    import argparse
+
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    parser = argparse.ArgumentParser(description='Discover workspace repositories and update PROJECT_CONTEXT.yaml')
+    parser.add_argument('workspace', nargs='?', default=str(project_root.parent),
+                        help='Directory containing the repositories (default: parent of OpenADK)')
+    parser.add_argument('--context', default=str(project_root / "_project" / "PROJECT_CONTEXT.yaml"),
+                        help='Path to PROJECT_CONTEXT.yaml')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Parallel git workers')
+    parser.add_argument('--depth', type=int, default=1, help='Directory levels to search')
+    parser.add_argument('--dry-run', action='store_true', help='Show changes without saving')
+
+    args = parser.parse_args()
+
+    updater = ContextUpdater(args.context)
+    updater.load_existing()
+    count = refresh_context(updater, args.workspace, args.workers, args.depth)
+    print(f"Discovered {count} repositories in {args.workspace}")
+
+    return 0 if updater.save(dry_run=args.dry_run) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,16 +7,24 @@ Strict enforcement wrapper for agent outputs
 import yaml
 import json
 import re
+import weakref
 from typing import Dict, List, Any, Optional, Union, Tuple
 from pathlib import Path
 from enum import Enum
 from dataclasses import dataclass, asdict
 
+import rule_stats
+from rule_engine import Scan, get_engine
+
 # Load planning rules
 RULES_PATH = Path(__file__).parent / "planning_rules.yaml"
 with open(RULES_PATH, 'r') as f:
     RULES = yaml.safe_load(f)
 
+def time_unit_pattern(term: str) -> str:
+    """Pattern for a number followed by a forbidden time unit, e.g. '3 weeks'"""
+    return r'\b\d+\s*' + re.escape(term) + r's?\b'
+
 class PlanningPriority(Enum):
     """Strictly enforced priority levels"""
     CRITICAL = "critical"
@@ -54,8 +62,40 @@ class PlanningComplexity(Enum):
                 return complexity
         return None
 
+class Watched:
+    """
+    Base for records whose owners keep derived data, such as PlanBuilder
+
+    Assigning any field calls owner._record_changed(record) on every owner
+    registered with watch(). Owners are held weakly and are not copied or
+    pickled with the record.
+    """
+    
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        for ref in self.__dict__.get("_owners", ()):
+            owner = ref()
+            if owner is not None:
+                owner._record_changed(self)
+    
+    def watch(self, owner: Any):
+        owners = self.__dict__.setdefault("_owners", [])
+        if not any(ref() is owner for ref in owners):
+            owners[:] = [ref for ref in owners if ref() is not None]
+            owners.append(weakref.ref(owner))
+    
+    def unwatch(self, owner: Any):
+        owners = self.__dict__.get("_owners")
+        if owners:
+            owners[:] = [ref for ref in owners if ref() is not None and ref() is not owner]
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = dict(self.__dict__)
+        state.pop("_owners", None)
+        return state
+
 @dataclass
-class Task:
+class Task(Watched):
     """Enforced task structure"""
     name: str
     priority: PlanningPriority
@@ -99,7 +139,7 @@ class Task:
         return len(errors) == 0, errors
 
 @dataclass
-class Milestone:
+class Milestone(Watched):
     """Enforced milestone structure"""
     name: str
     priority: PlanningPriority
@@ -184,25 +224,34 @@ class PlanningEnforcer:
     def validate_text_output(self, text: str) -> Tuple[bool, List[str]]:
         """Validate any text output for forbidden terms"""
         violations = []
+        stats = rule_stats.active()
+        # Shared with the other validators checking the same text
+        scan = get_engine().scan(text)
         
         # Check for forbidden time units
         for term in self.rules["forbidden_terms"]["time_units"]:
-            pattern = r'\b\d+\s*' + re.escape(term) + r's?\b'
-            if re.search(pattern, text, re.IGNORECASE):
+            if self._contains(stats, scan, "planning.time_units", term, time_unit_pattern(term)):
                 violations.append(f"Forbidden time unit: {term}")
         
         # Check for deadline terms
         for term in self.rules["forbidden_terms"]["deadline_terms"]:
-            if term.lower() in text.lower():
+            if self._contains(stats, scan, "planning.deadline_terms", term, re.escape(term)):
                 violations.append(f"Forbidden deadline term: {term}")
                 
         # Check for temporal references
         for term in self.rules["forbidden_terms"]["temporal_references"]:
-            if term.lower() in text.lower():
+            if self._contains(stats, scan, "planning.temporal_references", term, re.escape(term)):
                 violations.append(f"Forbidden temporal reference: {term}")
                 
         return len(violations) == 0, violations
     
+    @staticmethod
+    def _contains(stats: Optional[rule_stats.RuleStats], scan: Scan,
+                  source: str, term: str, pattern: str) -> bool:
+        if stats is None:
+            return scan.search(pattern)
+        return stats.timed(source, term, scan.search, pattern)
+    
     def transform_text(self, text: str) -> str:
         """Transform text to be compliant"""
         transformed = text
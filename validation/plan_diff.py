@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+"""
+OpenADK Plan Diff and Merge
+Structural diff between two versions of a plan and incremental patching
+Tasks are matched by id (or name when no id is set), milestones by name
+"""
+
+from typing import List, Dict, Any, Tuple
+from dataclasses import dataclass, field
+
+from planning_api import PlanBuilder, PlanType, OutputFormat, task_key
+
+TASK_FIELDS = ("name", "priority", "complexity", "dependencies")
+MILESTONE_FIELDS = ("priority", "success_criteria", "prerequisites")
+
+@dataclass
+class PlanDiff:
+    """Added, removed and changed tasks and milestones between two plans"""
+    added_tasks: List[Dict[str, Any]] = field(default_factory=list)
+    removed_tasks: List[str] = field(default_factory=list)
+    changed_tasks: Dict[str, Dict[str, Tuple[Any, Any]]] = field(default_factory=dict)
+    added_milestones: List[Dict[str, Any]] = field(default_factory=list)
+    removed_milestones: List[str] = field(default_factory=list)
+    changed_milestones: Dict[str, Dict[str, Tuple[Any, Any]]] = field(default_factory=dict)
+
+    def is_empty(self) -> bool:
+        return not (self.added_tasks or self.removed_tasks or self.changed_tasks or
+                    self.added_milestones or self.removed_milestones or
+                    self.changed_milestones)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON/YAML serializable patch document"""
+        def changes(section):
+            return {
+                key: {name: {"old": old, "new": new} for name, (old, new) in fields.items()}
+                for key, fields in section.items()
+            }
+
+        return {
+            "tasks": {
+                "added": self.added_tasks,
+                "removed": self.removed_tasks,
+                "changed": changes(self.changed_tasks)
+            },
+            "milestones": {
+                "added": self.added_milestones,
+                "removed": self.removed_milestones,
+                "changed": changes(self.changed_milestones)
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PlanDiff':
+        """Rebuild a diff from a patch document produced by to_dict()"""
+        def changes(section):
+            return {
+                key: {name: (value["old"], value["new"]) for name, value in fields.items()}
+                for key, fields in section.get("changed", {}).items()
+            }
+
+        tasks = data.get("tasks", {})
+        milestones = data.get("milestones", {})
+        return cls(
+            added_tasks=tasks.get("added", []),
+            removed_tasks=tasks.get("removed", []),
+            changed_tasks=changes(tasks),
+            added_milestones=milestones.get("added", []),
+            removed_milestones=milestones.get("removed", []),
+            changed_milestones=changes(milestones)
+        )
+
+def _field_changes(old: Dict[str, Any], new: Dict[str, Any],
+                   fields: Tuple[str, ...]) -> Dict[str, Tuple[Any, Any]]:
+    return {name: (old[name], new[name]) for name in fields if old[name] != new[name]}
+
+def diff_plans(old: PlanBuilder, new: PlanBuilder) -> PlanDiff:
+    """
+    Compute the structural diff that turns `old` into `new`
+
+    Both plans keep hash indexes by key, so matching costs one lookup
+    per task or milestone. Keys are expected to be unique within a plan.
+    """
+    diff = PlanDiff()
+
+    new_task_keys = set()
+    for task in new.tasks:
+        key = task_key(task)
+        new_task_keys.add(key)
+        previous = old.get_task(key)
+        if previous is None:
+            diff.added_tasks.append(task.to_dict())
+            continue
+        changes = _field_changes(previous.to_dict(), task.to_dict(), TASK_FIELDS)
+        if changes:
+            diff.changed_tasks[key] = changes
+    diff.removed_tasks = [task_key(t) for t in old.tasks if task_key(t) not in new_task_keys]
+
+    new_milestone_names = set()
+    for milestone in new.milestones:
+        new_milestone_names.add(milestone.name)
+        previous = old.get_milestone(milestone.name)
+        current = _milestone_dict(milestone)
+        if previous is None:
+            diff.added_milestones.append(current)
+            continue
+        changes = _field_changes(_milestone_dict(previous), current, MILESTONE_FIELDS)
+        if changes:
+            diff.changed_milestones[milestone.name] = changes
+    diff.removed_milestones = [m.name for m in old.milestones
+                               if m.name not in new_milestone_names]
+
+    return diff
+
+def _milestone_dict(milestone) -> Dict[str, Any]:
+    return {
+        "name": milestone.name,
+        "priority": milestone.priority.value,
+        "success_criteria": milestone.success_criteria,
+        "prerequisites": milestone.prerequisites
+    }
+
+def apply_plan_diff(builder: PlanBuilder, diff: PlanDiff) -> PlanBuilder:
+    """
+    Apply a diff to a plan in place
+
+    Removals, changes and additions cost one index lookup each, so syncing
+    a large plan costs time proportional to the diff.
+    """
+    builder.remove_tasks(diff.removed_tasks)
+    builder.remove_milestones(diff.removed_milestones)
+
+    for key, changes in diff.changed_tasks.items():
+        builder.update_task(key, **{name: new for name, (_, new) in changes.items()})
+    for name, changes in diff.changed_milestones.items():
+        builder.update_milestone(name, **{field: new for field, (_, new) in changes.items()})
+
+    for task in diff.added_tasks:
+        builder.add_task(
+            name=task["name"],
+            priority=task["priority"],
+            complexity=task["complexity"],
+            dependencies=task.get("dependencies", []),
+            task_id=task.get("id")
+        )
+    for milestone in diff.added_milestones:
+        builder.add_milestone(
+            name=milestone["name"],
+            priority=milestone["priority"],
+            success_criteria=milestone["success_criteria"],
+            prerequisites=milestone.get("prerequisites", [])
+        )
+
+    return builder
+
+# Example usage
+if __name__ == "__main__":
+    current = PlanBuilder(PlanType.TASK_LIST)
+    current.add_task("Setup CI/CD pipeline", "critical", "complex", ["DevOps approval"])
+    current.add_task("Implement user auth", "high", "moderate", ["Database schema"])
+    current.add_task("Add documentation", "low", "simple", [])
+
+    regenerated = PlanBuilder(PlanType.TASK_LIST)
+    regenerated.add_task("Setup CI/CD pipeline", "critical", "complex", ["DevOps approval"])
+    regenerated.add_task("Implement user auth", "critical", "complex", ["Database schema"])
+    regenerated.add_task("Write API reference", "medium", "moderate", ["Implement user auth"])
+
+    diff = diff_plans(current, regenerated)
+    print("Plan diff:")
+    print(diff.to_dict())
+
+    apply_plan_diff(current, diff)
+    print("\nPatched plan:")
+    print(current.build(OutputFormat.MARKDOWN))
@@ -0,0 +1,413 @@
+#!/usr/bin/env python
+"""
+OpenADK Bulk Plan Import
+Streams tasks from JSONL or CSV files into compliant plans
+Validates in batches and collects every error instead of stopping at the first
+"""
+
+import csv
+import sys
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+from dataclasses import dataclass, field
+
+import rule_stats
+from enforce_planning import PlanningPriority, PlanningComplexity, Task
+from planning_api import PlanBuilder, PlanType, OutputFormat
+from rule_engine import get_engine
+
+DEFAULT_BATCH_SIZE = 10000
+DEFAULT_MAX_ERRORS = 1000
+
+# CSV files list dependencies in a single column separated by this character
+CSV_DEPENDENCY_SEPARATOR = ";"
+# Columns read that way; the last two are for roadmap phases
+CSV_LIST_COLUMNS = ("dependencies", "success_criteria", "prerequisites")
+
+_PRIORITIES = {p.value: p for p in PlanningPriority}
+_COMPLEXITIES = {c.value: c for c in PlanningComplexity}
+
+@dataclass
+class RowError:
+    """A validation error tied to a source line"""
+    line: int
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"line {self.line}: {self.field}: {self.message}"
+
+@dataclass
+class ImportBatch:
+    """Validated tasks and errors for one batch of rows"""
+    tasks: List[Task] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+    rows: int = 0
+
+@dataclass
+class ImportReport:
+    """Summary of a bulk import - errors are capped at max_errors"""
+    rows: int = 0
+    imported: int = 0
+    error_count: int = 0
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return self.error_count == 0
+
+def _detect_format(path: str) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if suffix == ".csv":
+        return "csv"
+    raise ValueError(f"Cannot detect import format for '{path}' - use jsonl or csv")
+
+class _Lines:
+    """
+    Lines of a binary file decoded one at a time as UTF-8
+
+    A line that is not valid UTF-8 is decoded with replacement characters
+    and its error is kept in `bad`, so one bad line does not stop the file.
+    `number` is the 1-based number of the last line read.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self.number = 0
+        self.bad = {}
+
+    def __iter__(self) -> '_Lines':
+        return self
+
+    def __next__(self) -> str:
+        raw = next(self._f)
+        self.number += 1
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError as e:
+            self.bad[self.number] = f"Invalid UTF-8: {e.reason} at byte {e.start}"
+            return raw.decode('utf-8', 'replace')
+
+    def take_bad(self, first: int, last: int) -> Optional[RowError]:
+        """The decoding error of the first bad line from first to last, if any"""
+        for line_num in range(first, last + 1):
+            reason = self.bad.pop(line_num, None)
+            if reason is not None:
+                return RowError(line_num, "row", reason)
+        return None
+
+def _read_jsonl(lines: _Lines) -> Iterator[Tuple[int, Any]]:
+    for line in lines:
+        line_num = lines.number
+        bad = lines.take_bad(line_num, line_num)
+        if bad is not None:
+            yield line_num, bad
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_num, RowError(line_num, "row", f"Invalid JSON: {e.msg}")
+
+def _read_csv(lines: _Lines) -> Iterator[Tuple[int, Any]]:
+    reader = csv.DictReader(lines)
+    last = 0
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            if lines.number == last:
+                # Nothing was consumed, so the reader cannot move past it
+                yield lines.number, RowError(lines.number, "row", f"Invalid CSV: {e}")
+                return
+            first, last = last + 1, lines.number
+            yield last, lines.take_bad(first, last) or RowError(last, "row", f"Invalid CSV: {e}")
+            continue
+        first, last = last + 1, lines.number
+        bad = lines.take_bad(first, last)
+        if bad is not None:
+            yield last, bad
+            continue
+        for column in CSV_LIST_COLUMNS:
+            if column in row:
+                values = row[column] or ""
+                row[column] = [v.strip() for v in values.split(CSV_DEPENDENCY_SEPARATOR) if v.strip()]
+        yield last, row
+
+def _read_rows(path: str, format: Optional[str] = None) -> Iterator[Tuple[int, Any]]:
+    """
+    Raw (line number, row) pairs from a JSONL or CSV file
+
+    Lines that cannot be decoded or parsed come back as RowErrors, so the
+    rest of the file is still read.
+    """
+    format = format or _detect_format(path)
+    if format not in ("jsonl", "csv"):
+        raise ValueError(f"Unknown import format: {format}")
+
+    with open(path, 'rb') as f:
+        lines = _Lines(f)
+        yield from _read_jsonl(lines) if format == "jsonl" else _read_csv(lines)
+
+def _validate_batch(rows: List[Tuple[int, Any]]) -> ImportBatch:
+    """Validate a batch of raw rows - the same rules as Task.validate"""
+    batch = ImportBatch(rows=len(rows))
+    candidates = []
+
+    for line_num, row in rows:
+        if isinstance(row, RowError):
+            batch.errors.append(row)
+            continue
+        if not isinstance(row, dict):
+            batch.errors.append(RowError(line_num, "row", "Row must be an object"))
+            continue
+
+        row_errors = []
+        name = row.get("name")
+        if not name or not isinstance(name, str):
+            row_errors.append(RowError(line_num, "name", "Task name is required"))
+
+        priority = _PRIORITIES.get(str(row.get("priority", "")).strip().lower())
+        if priority is None:
+            row_errors.append(RowError(
+                line_num, "priority",
+                f"Invalid priority: must be one of {list(_PRIORITIES)}"))
+
+        complexity = _COMPLEXITIES.get(str(row.get("complexity", "")).strip().lower())
+        if complexity is None:
+            row_errors.append(RowError(
+                line_num, "complexity",
+                f"Invalid complexity: must be one of {list(_COMPLEXITIES)}"))
+
+        dependencies = row.get("dependencies") or []
+        if isinstance(dependencies, str):
+            dependencies = [dependencies]
+        if not isinstance(dependencies, list):
+            row_errors.append(RowError(line_num, "dependencies", "Dependencies must be a list"))
+
+        if row_errors:
+            batch.errors.extend(row_errors)
+            continue
+
+        task_id = row.get("id")
+        candidates.append((line_num, Task(
+            name=name,
+            priority=priority,
+            complexity=complexity,
+            dependencies=dependencies,
+            id=str(task_id) if task_id else None
+        )))
+
+    # Screen every name in the batch with one engine scan per rule, then
+    # map match offsets back to rows
+    names = [task.name for _, task in candidates]
+    block = "\n".join(names)
+    starts = []
+    offset = 0
+    for name in names:
+        starts.append(offset)
+        offset += len(name) + 1
+
+    stats = rule_stats.active()
+    scan = get_engine().scan(block)
+    flagged: Dict[int, List[str]] = {}
+    for term, pattern in get_engine().patterns_for("planning.task_names").items():
+        if stats is None:
+            matches = scan.finditer(pattern)
+        else:
+            matches = stats.timed("planning.task_names", term, scan.finditer, pattern)
+        for index in dict.fromkeys(bisect_right(starts, m.start()) - 1 for m in matches):
+            flagged.setdefault(index, []).append(term)
+
+    for index, (line_num, task) in enumerate(candidates):
+        if index not in flagged:
+            batch.tasks.append(task)
+            continue
+        for term in flagged[index]:
+            batch.errors.append(RowError(
+                line_num, "name", f"Forbidden time term '{term}' in task name"))
+
+    return batch
+
+def iter_task_batches(path: str,
+                      format: Optional[str] = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[ImportBatch]:
+    """
+    Stream validated batches from a JSONL or CSV file
+
+    Only one batch of rows is held in memory at a time.
+    """
+    rows = []
+    for row in _read_rows(path, format):
+        rows.append(row)
+        if len(rows) >= batch_size:
+            yield _validate_batch(rows)
+            rows = []
+    if rows:
+        yield _validate_batch(rows)
+
+def import_tasks(path: str,
+                 builder: Optional[PlanBuilder] = None,
+                 format: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 max_errors: int = DEFAULT_MAX_ERRORS) -> ImportReport:
+    """
+    Import tasks from a file into a builder, or only validate when builder is None
+
+    Rows with errors are skipped; every error is counted and the first
+    max_errors are kept in the report.
+    """
+    report = ImportReport()
+    for batch in iter_task_batches(path, format, batch_size):
+        report.rows += batch.rows
+        report.error_count += len(batch.errors)
+        room = max_errors - len(report.errors)
+        if room > 0:
+            report.errors.extend(batch.errors[:room])
+        if builder is not None:
+            builder.extend_tasks(batch.tasks)
+        report.imported += len(batch.tasks)
+    return report
+
+def create_task_list_from_file(path: str, format: Optional[str] = None) -> str:
+    """
+    File-based counterpart of planning_api.create_task_list
+
+    Raises ValueError listing every collected error if any row is invalid.
+    """
+    builder = PlanBuilder(PlanType.TASK_LIST)
+    report = import_tasks(path, builder, format)
+    if not report.valid:
+        details = "; ".join(str(e) for e in report.errors)
+        raise ValueError(f"Invalid tasks ({report.error_count} errors): {details}")
+    return builder.build(OutputFormat.YAML)
+
+def _validate_phase(line_num: int, row: Any, number: int) -> Tuple[Optional[Dict[str, Any]], List[RowError]]:
+    """
+    Validate one roadmap phase row - the same rules as planning_api.create_roadmap
+
+    Returns the phase with its tasks validated, or None, and every error.
+    Task errors name the task, e.g. "tasks[2].priority".
+    """
+    if isinstance(row, RowError):
+        return None, [row]
+    if not isinstance(row, dict):
+        return None, [RowError(line_num, "row", "Row must be an object")]
+
+    errors = []
+    name = row.get("name")
+    if not name or not isinstance(name, str):
+        errors.append(RowError(line_num, "name", "Milestone name is required"))
+    priority = _PRIORITIES.get(str(row.get("priority", "")).strip().lower())
+    if priority is None:
+        errors.append(RowError(line_num, "priority",
+                               f"Invalid priority: must be one of {list(_PRIORITIES)}"))
+    success_criteria = row.get("success_criteria") or []
+    if not isinstance(success_criteria, list):
+        errors.append(RowError(line_num, "success_criteria", "Success criteria must be a list"))
+    elif not success_criteria:
+        errors.append(RowError(line_num, "success_criteria", "Success criteria are required"))
+    prerequisites = row.get("prerequisites") or []
+    if not isinstance(prerequisites, list):
+        errors.append(RowError(line_num, "prerequisites", "Prerequisites must be a list"))
+    task_rows = row.get("tasks") or []
+    if not isinstance(task_rows, list):
+        errors.append(RowError(line_num, "tasks", "Tasks must be a list"))
+        task_rows = []
+
+    tasks = []
+    for index, task in enumerate(task_rows):
+        if isinstance(task, dict):
+            task = dict(task, name=f"Phase {number}: {task.get('name', '')}" if task.get("name") else None,
+                        complexity=task.get("complexity", "moderate"))
+        batch = _validate_batch([(line_num, task)])
+        for error in batch.errors:
+            field_name = f"tasks[{index}]" if error.field == "row" else f"tasks[{index}].{error.field}"
+            errors.append(RowError(line_num, field_name, error.message))
+        tasks.extend(batch.tasks)
+
+    if errors:
+        return None, errors
+    return {
+        "name": name,
+        "priority": priority.value,
+        "success_criteria": success_criteria,
+        "prerequisites": prerequisites,
+        "tasks": tasks
+    }, []
+
+def create_roadmap_from_file(path: str, format: Optional[str] = None,
+                             max_errors: int = DEFAULT_MAX_ERRORS) -> str:
+    """
+    File-based counterpart of planning_api.create_roadmap - one phase per row
+
+    JSONL phases may carry a tasks list; CSV phases have name, priority,
+    success_criteria and prerequisites columns. Raises ValueError listing
+    the collected errors if any phase is invalid.
+    """
+    phases = []
+    errors: List[RowError] = []
+    error_count = 0
+    for number, (line_num, row) in enumerate(_read_rows(path, format), 1):
+        phase, phase_errors = _validate_phase(line_num, row, number)
+        error_count += len(phase_errors)
+        errors.extend(phase_errors[:max(0, max_errors - len(errors))])
+        if phase is not None:
+            phases.append(phase)
+    if error_count:
+        details = "; ".join(str(e) for e in errors)
+        raise ValueError(f"Invalid phases ({error_count} errors): {details}")
+
+    builder = PlanBuilder(PlanType.ROADMAP)
+    for phase in phases:
+        builder.add_milestone(
+            name=phase["name"],
+            priority=phase["priority"],
+            success_criteria=phase["success_criteria"],
+            prerequisites=phase["prerequisites"]
+        )
+        builder.extend_tasks(phase["tasks"])
+    return builder.build(OutputFormat.YAML)
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Bulk import tasks from JSONL or CSV')
+    parser.add_argument('path', help='JSONL or CSV file with name, priority, complexity, dependencies')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='Input format (default: from extension)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Rows validated per batch')
+    parser.add_argument('--max-errors', type=int, default=DEFAULT_MAX_ERRORS,
+                        help='Maximum number of errors to report')
+    parser.add_argument('--validate-only', action='store_true',
+                        help='Validate without building a plan')
+    parser.add_argument('--output', choices=[f.value for f in OutputFormat], default='yaml',
+                        help='Plan output format')
+
+    args = parser.parse_args()
+
+    builder = None if args.validate_only else PlanBuilder(PlanType.TASK_LIST)
+    report = import_tasks(args.path, builder, args.format, args.batch_size, args.max_errors)
+
+    for error in report.errors:
+        print(f"ERROR: {error}", file=sys.stderr)
+    if report.error_count > len(report.errors):
+        print(f"ERROR: ... {report.error_count - len(report.errors)} more errors", file=sys.stderr)
+    print(f"Rows: {report.rows}, imported: {report.imported}, errors: {report.error_count}",
+          file=sys.stderr)
+
+    if builder is not None and report.valid:
+        builder.build_to(sys.stdout, OutputFormat(args.output))
+        print()
+
+    sys.exit(0 if report.valid else 1)
+
+if __name__ == "__main__":
+    main()
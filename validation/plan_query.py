@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+OpenADK Plan Query API
+Indexed lookups over built plans instead of linear scans of the task list
+Works with PlanBuilder instances and StructuredPlanGenerator output
+"""
+
+from typing import List, Dict, Optional, Any, Set
+
+from planning_api import PlanBuilder
+
+class PlanIndex:
+    """
+    Hash indexes over the tasks of a plan
+
+    Keeps indexes by name and id, secondary indexes by priority and
+    complexity, and a reverse-dependency index, so a query such as
+    "critical complex tasks blocked by X" costs the size of the smallest
+    matching index rather than the size of the plan.
+    """
+
+    def __init__(self):
+        self._records: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_id: Dict[str, int] = {}
+        self._by_priority: Dict[str, Set[int]] = {}
+        self._by_complexity: Dict[str, Set[int]] = {}
+        self._dependents: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def add(self,
+            name: str,
+            priority: str,
+            complexity: str,
+            dependencies: Optional[List[str]] = None,
+            task_id: Optional[str] = None) -> Dict[str, Any]:
+        """Index one task and return its record - ids must be unique"""
+        if task_id and task_id in self._by_id:
+            raise ValueError(f"Duplicate task id: {task_id}")
+        position = len(self._records)
+        record = {
+            "name": name,
+            "priority": priority.lower(),
+            "complexity": complexity.lower(),
+            "dependencies": dependencies or [],
+            "id": task_id or None
+        }
+        self._records.append(record)
+
+        self._by_name.setdefault(name, []).append(position)
+        if record["id"]:
+            self._by_id[record["id"]] = position
+        self._by_priority.setdefault(record["priority"], set()).add(position)
+        self._by_complexity.setdefault(record["complexity"], set()).add(position)
+        for dependency in record["dependencies"]:
+            self._dependents.setdefault(dependency, set()).add(position)
+        return record
+
+    @classmethod
+    def from_builder(cls, builder: PlanBuilder) -> 'PlanIndex':
+        """Index the tasks of a PlanBuilder"""
+        index = cls()
+        for task in builder.tasks:
+            index.add(task.name, task.priority.value, task.complexity.value,
+                      task.dependencies, task.id)
+        return index
+
+    @classmethod
+    def from_plan(cls, plan: Dict[str, Any]) -> 'PlanIndex':
+        """
+        Index a plan dictionary
+
+        Accepts StructuredPlanGenerator.create_task_list output ("priorities")
+        and parsed PlanBuilder.build output ("prioritized_tasks").
+        """
+        groups = plan.get("prioritized_tasks") or plan.get("priorities") or {}
+        index = cls()
+        for priority, tasks in groups.items():
+            for task in tasks:
+                index.add(task["name"], priority, task.get("complexity", "moderate"),
+                          task.get("dependencies", []), task.get("id"))
+        return index
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """First task with the given name"""
+        positions = self._by_name.get(name)
+        return self._records[positions[0]] if positions else None
+
+    def get_by_id(self, task_id: str) -> Optional[Dict[str, Any]]:
+        position = self._by_id.get(task_id)
+        return self._records[position] if position is not None else None
+
+    def dependents(self, name: str, transitive: bool = False) -> List[Dict[str, Any]]:
+        """
+        Tasks that depend on `name`, optionally following the chain
+
+        Dependencies may refer to a task by id or by name, so each step
+        follows both.
+        """
+        found = set(self._dependents.get(name, ()))
+        if transitive:
+            pending = list(found)
+            while pending:
+                record = self._records[pending.pop()]
+                keys = (record["name"], record["id"]) if record["id"] else (record["name"],)
+                for key in keys:
+                    for position in self._dependents.get(key, ()):
+                        if position not in found:
+                            found.add(position)
+                            pending.append(position)
+        return [self._records[p] for p in sorted(found)]
+
+    def find(self,
+             priority: Optional[str] = None,
+             complexity: Optional[str] = None,
+             blocked_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Tasks matching every given filter, in plan order
+
+        Index sets are intersected smallest first, so the cost follows the
+        most selective filter.
+        """
+        candidates = []
+        if priority is not None:
+            candidates.append(self._by_priority.get(priority.lower(), set()))
+        if complexity is not None:
+            candidates.append(self._by_complexity.get(complexity.lower(), set()))
+        if blocked_by is not None:
+            candidates.append(self._dependents.get(blocked_by, set()))
+
+        if not candidates:
+            return list(self._records)
+
+        candidates.sort(key=len)
+        matches = set(candidates[0])
+        for positions in candidates[1:]:
+            if not matches:
+                break
+            matches &= positions
+        return [self._records[p] for p in sorted(matches)]
+
+# Example usage
+if __name__ == "__main__":
+    from planning_api import PlanType
+
+    plan = PlanBuilder(PlanType.TASK_LIST)
+    plan.add_task("Design database schema", "critical", "complex", [])
+    plan.add_task("Implement user auth", "critical", "complex", ["Design database schema"])
+    plan.add_task("Build admin panel", "high", "moderate", ["Implement user auth"])
+    plan.add_task("Write migration scripts", "critical", "simple", ["Design database schema"])
+
+    index = PlanIndex.from_builder(plan)
+    print("Critical complex tasks blocked by 'Design database schema':")
+    for task in index.find(priority="critical", complexity="complex",
+                           blocked_by="Design database schema"):
+        print(f"  - {task['name']}")
+
+    print("\nEverything downstream of 'Design database schema':")
+    for task in index.dependents("Design database schema", transitive=True):
+        print(f"  - {task['name']}")
@@ -5,15 +5,21 @@ Structured API for agents to create compliant plans
 No free-form text allowed - only structured data
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Iterable, Iterator, TextIO
+from collections.abc import MutableSequence
 from dataclasses import dataclass, field
 from enum import Enum
+import itertools
 import json
 import yaml
 
 # Import enforcement
 from enforce_planning import PlanningPriority, PlanningComplexity, Task, Milestone
 
+def task_key(task: Task) -> str:
+    """Key used to match a task across plan versions - id if set, else name"""
+    return task.id or task.name
+
 class OutputFormat(Enum):
     """Allowed output formats"""
     JSON = "json"
@@ -28,11 +34,181 @@ class PlanType(Enum):
     ARCHITECTURE = "architecture"
     REQUIREMENTS = "requirements"
 
+def _task_signature(task: Task) -> tuple:
+    """The task's fields as indexed: key, name, priority, complexity, dependencies"""
+    return (task_key(task), task.name, task.priority, task.complexity, tuple(task.dependencies))
+
+def _milestone_signature(milestone: Milestone) -> tuple:
+    return (milestone.name, milestone.priority,
+            tuple(milestone.success_criteria), tuple(milestone.prerequisites))
+
+class _Records(MutableSequence):
+    """
+    The task or milestone list of a PlanBuilder
+
+    Behaves like a list and reports every change to the builder. Records
+    are stored in insertion order keyed by id(record), so appending and
+    removing a record are O(1); positional access walks from the nearer
+    end. A record can appear only once.
+    """
+
+    def __init__(self, builder: 'PlanBuilder', records: Iterable[Any] = ()):
+        self._builder = builder
+        self._items: Dict[int, Any] = {}
+        for record in records:
+            self._put(record)
+
+    def _put(self, record: Any, items: Optional[Dict[int, Any]] = None):
+        items = self._items if items is None else items
+        if id(record) in items:
+            raise ValueError(f"{record!r} is already in the plan")
+        items[id(record)] = record
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._items.values()))
+
+    def __reversed__(self) -> Iterator[Any]:
+        return iter(list(reversed(self._items.values())))
+
+    def __contains__(self, record: Any) -> bool:
+        return self._items.get(id(record)) is record or any(r == record for r in self._items.values())
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._items.values())[index]
+        size = len(self._items)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("list index out of range")
+        if index < size // 2:
+            return next(itertools.islice(self._items.values(), index, None))
+        return next(itertools.islice(reversed(self._items.values()), size - 1 - index, None))
+
+    def index(self, record: Any, start: int = 0, stop: Optional[int] = None) -> int:
+        items = list(self._items.values())
+        return items.index(record, start, len(items) if stop is None else stop)
+
+    def count(self, record: Any) -> int:
+        return list(self._items.values()).count(record)
+
+    def __setitem__(self, index, value):
+        def assign(items):
+            items[index] = value
+        self._rewrite(assign)
+
+    def __delitem__(self, index):
+        def delete(items):
+            del items[index]
+        self._rewrite(delete)
+
+    def insert(self, index: int, record: Any):
+        if index >= len(self._items):
+            self.append(record)
+        else:
+            self._rewrite(lambda items: items.insert(index, record))
+
+    def append(self, record: Any):
+        self._put(record)
+        if self._builder is not None:
+            self._builder._record_added(record)
+
+    def extend(self, records: Iterable[Any]):
+        for record in records:
+            self.append(record)
+
+    def __iadd__(self, records: Iterable[Any]) -> '_Records':
+        self.extend(records)
+        return self
+
+    def remove(self, record: Any):
+        if self._items.get(id(record)) is not record:
+            record = next((r for r in self._items.values() if r == record), None)
+            if record is None:
+                raise ValueError("list.remove(x): x not in list")
+        del self._items[id(record)]
+        if self._builder is not None:
+            self._builder._record_removed(record)
+
+    def pop(self, index: int = -1) -> Any:
+        record = self[index]
+        self.remove(record)
+        return record
+
+    def clear(self):
+        self._rewrite(lambda items: items.clear())
+
+    def sort(self, *, key=None, reverse: bool = False):
+        self._rewrite(lambda items: items.sort(key=key, reverse=reverse))
+
+    def reverse(self):
+        self._rewrite(lambda items: items.reverse())
+
+    def _move_to_end(self, record: Any):
+        """Move a record to the end without reporting it as removed and re-added"""
+        del self._items[id(record)]
+        self._items[id(record)] = record
+
+    def _rewrite(self, edit):
+        """Apply a list edit to a copy, then report what left and joined"""
+        items = list(self._items.values())
+        edit(items)
+        new: Dict[int, Any] = {}
+        for record in items:
+            self._put(record, new)
+        old, self._items = self._items, new
+        if self._builder is not None:
+            self._builder._records_replaced([r for key, r in old.items() if key not in new],
+                                            [r for key, r in new.items() if key not in old])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, _Records)):
+            return list(self._items.values()) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(list(self._items.values()))
+
+class _Metadata(dict):
+    """Plan metadata that clears its builder's output cache when changed"""
+
+    def __init__(self, builder: 'PlanBuilder', *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._builder = builder
+
+def _clearing_cache(name: str):
+    method = getattr(dict, name)
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        if self._builder is not None:
+            self._builder._output_cache.clear()
+        return result
+    mutate.__name__ = name
+    return mutate
+
+for _name in ("__setitem__", "__delitem__", "__ior__", "clear", "pop", "popitem",
+              "setdefault", "update"):
+    setattr(_Metadata, _name, _clearing_cache(_name))
+
 @dataclass
-class PlanBuilder:
+class PlanBuilder:    
     """
     Structured plan builder that prevents non-compliant outputs
     Agents MUST use this instead of generating free text
+    
+    Priority groups, milestone entries and key indexes are maintained as
+    the plan changes, and each output format is cached until the next
+    change, so repeated build() calls on an unchanged plan are O(1).
+    
+    tasks and milestones behave like lists and may be edited directly.
+    Tasks and milestones report field assignments to the builder, and only
+    those records are re-indexed. Lists inside a record, such as
+    dependencies, should be replaced rather than edited in place.
     """
     
     plan_type: PlanType
@@ -40,28 +216,205 @@ class PlanBuilder:
     milestones: List[Milestone] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
     
+    # Serialized task entries per priority, keyed by id(task) so a task can
+    # later be moved or dropped without scanning its group
+    _priority_groups: Dict[str, Dict[int, Dict[str, Any]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _milestone_entries: Dict[int, Dict[str, Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _task_index: Dict[str, Task] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _milestone_index: Dict[str, Milestone] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    # What each record looked like when it was indexed, keyed by id(record)
+    _task_signatures: Dict[int, tuple] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _milestone_signatures: Dict[int, tuple] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    # Records with assigned fields, re-indexed on the next read
+    _dirty: Dict[int, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _stale: bool = field(default=True, init=False, repr=False, compare=False)
+    _output_cache: Dict[OutputFormat, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._reindex()
+    
+    def __reduce__(self):
+        # The indexes are keyed by id(record), so copies and pickles are rebuilt
+        return (_restore_builder, (type(self), self.plan_type, list(self.tasks),
+                                   list(self.milestones), dict(self.metadata)))
+    
+    def __setattr__(self, name: str, value: Any):
+        if name in ("tasks", "milestones"):
+            previous = self.__dict__.get(name)
+            if isinstance(previous, _Records):
+                previous._builder = None
+                for record in previous:
+                    record.unwatch(self)
+            value = _Records(self, value)
+            self.__dict__["_stale"] = True
+        elif name == "metadata":
+            previous = self.__dict__.get(name)
+            if isinstance(previous, _Metadata):
+                previous._builder = None
+            value = _Metadata(self, value)
+            if "_output_cache" in self.__dict__:
+                self._output_cache.clear()
+        object.__setattr__(self, name, value)
+    
+    def _reindex(self):
+        """Rebuild priority groups, milestone entries and key indexes from scratch"""
+        self._priority_groups = {p.value: {} for p in PlanningPriority}
+        self._milestone_entries = {}
+        self._task_index = {}
+        self._milestone_index = {}
+        self._task_signatures = {}
+        self._milestone_signatures = {}
+        for task in self.tasks:
+            task.watch(self)
+            self._index_task(task)
+        for milestone in self.milestones:
+            milestone.watch(self)
+            self._index_milestone(milestone)
+        self._dirty.clear()
+        self._stale = False
+        self._output_cache.clear()
+    
+    def _index_task(self, task: Task):
+        self._task_index[task_key(task)] = task
+        self._task_signatures[id(task)] = _task_signature(task)
+        self._priority_groups[task.priority.value][id(task)] = {
+            "name": task.name,
+            "complexity": task.complexity.value,
+            "dependencies": task.dependencies
+        }
+    
+    def _unindex_task(self, task: Task):
+        """Drop a task from the indexes, using the key and priority it was indexed under"""
+        signature = self._task_signatures.pop(id(task), None)
+        if signature is None:
+            return
+        key, priority = signature[0], signature[2]
+        self._priority_groups[priority.value].pop(id(task), None)
+        if self._task_index.get(key) is task:
+            del self._task_index[key]
+    
+    def _index_milestone(self, milestone: Milestone):
+        self._milestone_index[milestone.name] = milestone
+        self._milestone_signatures[id(milestone)] = _milestone_signature(milestone)
+        self._milestone_entries[id(milestone)] = {
+            "name": milestone.name,
+            "priority": milestone.priority.value,
+            "success_criteria": milestone.success_criteria,
+            "prerequisites": milestone.prerequisites
+        }
+    
+    def _unindex_milestone(self, milestone: Milestone):
+        signature = self._milestone_signatures.pop(id(milestone), None)
+        if signature is None:
+            return
+        self._milestone_entries.pop(id(milestone), None)
+        if self._milestone_index.get(signature[0]) is milestone:
+            del self._milestone_index[signature[0]]
+    
+    # Change hooks called by _Records and by Watched records
+    
+    def _record_added(self, record: Any):
+        record.watch(self)
+        if not self._stale:
+            if isinstance(record, Milestone):
+                self._index_milestone(record)
+            else:
+                self._index_task(record)
+        self._output_cache.clear()
+    
+    def _record_removed(self, record: Any):
+        record.unwatch(self)
+        self._dirty.pop(id(record), None)
+        if isinstance(record, Milestone):
+            self._unindex_milestone(record)
+        else:
+            self._unindex_task(record)
+        self._output_cache.clear()
+    
+    def _records_replaced(self, removed: List[Any], added: List[Any]):
+        for record in removed:
+            record.unwatch(self)
+        for record in added:
+            record.watch(self)
+        self._stale = True
+        self._output_cache.clear()
+    
+    def _record_changed(self, record: Any):
+        self._dirty[id(record)] = record
+        self._output_cache.clear()
+    
+    def _sync(self):
+        """Re-index the records whose fields were assigned since the last read"""
+        if self._dirty and not self._stale:
+            dirty, self._dirty = self._dirty, {}
+            for key, record in dirty.items():
+                if isinstance(record, Milestone):
+                    if self.milestones._items.get(key) is record:
+                        self._refresh_milestone(record)
+                elif self.tasks._items.get(key) is record:
+                    self._refresh_task(record)
+                if self._stale:
+                    break
+        if self._stale:
+            self._reindex()
+    
+    def _refresh_task(self, task: Task):
+        indexed = self._task_signatures.get(id(task))
+        if indexed == _task_signature(task):
+            return
+        if indexed is None or indexed[2] is not task.priority:
+            # Priority groups follow plan order, so a moved task needs a full rebuild
+            self._stale = True
+            return
+        if self._task_index.get(indexed[0]) is task:
+            del self._task_index[indexed[0]]
+        self._index_task(task)
+    
+    def _refresh_milestone(self, milestone: Milestone):
+        indexed = self._milestone_signatures.get(id(milestone))
+        if indexed == _milestone_signature(milestone):
+            return
+        if indexed is not None and self._milestone_index.get(indexed[0]) is milestone:
+            del self._milestone_index[indexed[0]]
+        self._index_milestone(milestone)
+    
     def add_task(self,
                  name: str,
                  priority: str,
                  complexity: str,
-                 dependencies: Optional[List[str]] = None) -> 'PlanBuilder':
+                 dependencies: Optional[List[str]] = None,
+                 task_id: Optional[str] = None) -> 'PlanBuilder':
         """Add a task to the plan - enforces valid values"""
         # This will raise exception if invalid
         task = Task(
             name=name,
             priority=PlanningPriority.from_string(priority),
             complexity=PlanningComplexity.from_string(complexity),
-            dependencies=dependencies or []
+            dependencies=dependencies or [],
+            id=task_id
         )
-        
+    
         # Validate task
         is_valid, errors = task.validate()
         if not is_valid:
             raise ValueError(f"Invalid task: {errors}")
-            
+    
         self.tasks.append(task)
         return self
     
+    def extend_tasks(self, tasks: Iterable[Task]) -> 'PlanBuilder':
+        """Append tasks that were already validated, e.g. by plan_import"""
+        self.tasks.extend(tasks)
+        return self
+    
     def add_milestone(self,
                      name: str,
                      priority: str,
@@ -74,14 +427,121 @@ class PlanBuilder:
             success_criteria=success_criteria,
             prerequisites=prerequisites or []
         )
-        
+    
         is_valid, errors = milestone.validate()
         if not is_valid:
             raise ValueError(f"Invalid milestone: {errors}")
-            
+    
         self.milestones.append(milestone)
         return self
     
+    def get_task(self, key: str) -> Optional[Task]:
+        """Look up a task by id, or by name for tasks without an id"""
+        self._sync()
+        return self._task_index.get(key)
+    
+    def get_milestone(self, name: str) -> Optional[Milestone]:
+        """Look up a milestone by name"""
+        self._sync()
+        return self._milestone_index.get(name)
+    
+    def update_task(self,
+                    key: str,
+                    name: Optional[str] = None,
+                    priority: Optional[str] = None,
+                    complexity: Optional[str] = None,
+                    dependencies: Optional[List[str]] = None) -> 'PlanBuilder':
+        """Change fields of an existing task in place - enforces valid values"""
+        task = self.get_task(key)
+        if task is None:
+            raise KeyError(f"Unknown task: {key}")
+    
+        new_priority = task.priority
+        if priority is not None:
+            new_priority = PlanningPriority.from_string(priority)
+            if new_priority is None:
+                raise ValueError(f"Invalid task: invalid priority '{priority}'")
+        new_complexity = task.complexity
+        if complexity is not None:
+            new_complexity = PlanningComplexity.from_string(complexity)
+            if new_complexity is None:
+                raise ValueError(f"Invalid task: invalid complexity '{complexity}'")
+        if name is not None:
+            is_valid, errors = Task(name, new_priority, new_complexity, []).validate()
+            if not is_valid:
+                raise ValueError(f"Invalid task: {errors}")
+    
+        # A task that changes priority moves to the end of its new group, and
+        # of the plan, so a later reindex puts it in the same place
+        old_key = task_key(task)
+        if new_priority is not task.priority:
+            self._unindex_task(task)
+            self.tasks._move_to_end(task)
+            task.priority = new_priority
+        if name is not None:
+            task.name = name
+        task.complexity = new_complexity
+        if dependencies is not None:
+            task.dependencies = dependencies
+        # A task without an id is keyed by name, so renaming it changes its key
+        if task_key(task) != old_key and self._task_index.get(old_key) is task:
+            del self._task_index[old_key]
+        self._index_task(task)
+        self._output_cache.clear()
+        return self
+    
+    def update_milestone(self,
+                         name: str,
+                         priority: Optional[str] = None,
+                         success_criteria: Optional[List[str]] = None,
+                         prerequisites: Optional[List[str]] = None) -> 'PlanBuilder':
+        """Change fields of an existing milestone in place"""
+        milestone = self.get_milestone(name)
+        if milestone is None:
+            raise KeyError(f"Unknown milestone: {name}")
+    
+        new_priority = milestone.priority
+        if priority is not None:
+            new_priority = PlanningPriority.from_string(priority)
+            if new_priority is None:
+                raise ValueError("Invalid milestone: invalid priority level")
+        if success_criteria is not None and not success_criteria:
+            raise ValueError("Invalid milestone: success criteria are required")
+    
+        milestone.priority = new_priority
+        if success_criteria is not None:
+            milestone.success_criteria = success_criteria
+        if prerequisites is not None:
+            milestone.prerequisites = prerequisites
+        self._index_milestone(milestone)
+        self._output_cache.clear()
+        return self
+    
+    def remove_tasks(self, keys: List[str]) -> 'PlanBuilder':
+        """
+        Remove tasks by key in time proportional to the number removed
+    
+        Repeated keys are removed once. Every key is checked before any
+        task is removed, so an unknown key leaves the plan unchanged.
+        """
+        keys = list(dict.fromkeys(keys))
+        missing = [key for key in keys if self.get_task(key) is None]
+        if missing:
+            raise KeyError(f"Unknown task: {', '.join(missing)}")
+        for task in [self.get_task(key) for key in keys]:
+            self.tasks.remove(task)
+        return self
+    
+    def remove_milestones(self, names: List[str]) -> 'PlanBuilder':
+        """Remove milestones by name - same rules as remove_tasks()"""
+        names = list(dict.fromkeys(names))
+        missing = [name for name in names if self.get_milestone(name) is None]
+        if missing:
+            raise KeyError(f"Unknown milestone: {', '.join(missing)}")
+        for milestone in [self.get_milestone(name) for name in names]:
+            self.milestones.remove(milestone)
+        return self
+    
     def set_metadata(self, key: str, value: Any) -> 'PlanBuilder':
         """Set metadata - validates against forbidden terms"""
         # Check value for forbidden terms if it's a string
@@ -90,14 +550,12 @@ class PlanBuilder:
             for term in forbidden_terms:
                 if term in value.lower():
                     raise ValueError(f"Forbidden term '{term}' in metadata value")
-        
+    
         self.metadata[key] = value
         return self
     
-    def build(self, format: OutputFormat = OutputFormat.YAML) -> str:
-        """Build the final plan in specified format"""
-        
-        # Create structured data
+    def _plan_data(self) -> Dict[str, Any]:
+        """Assemble the structured plan data shared by all formats"""
         plan_data = {
             "type": self.plan_type.value,
             "version": "1.0",
@@ -106,81 +564,100 @@ class PlanBuilder:
                 "uses_priority_system": True,
                 "validated": True
             },
-            "metadata": self.metadata
+            "metadata": dict(self.metadata)
         }
         
         # Organize tasks by priority
         if self.tasks:
-            priority_groups = {
-                "critical": [],
-                "high": [],
-                "medium": [],
-                "low": []
+            plan_data["prioritized_tasks"] = {
+                priority: list(group.values())
+                for priority, group in self._priority_groups.items()
             }
-            
-            for task in self.tasks:
-                priority_groups[task.priority.value].append({
-                    "name": task.name,
-                    "complexity": task.complexity.value,
-                    "dependencies": task.dependencies
-                })
-            
-            plan_data["prioritized_tasks"] = priority_groups
         
         # Add milestones if present
         if self.milestones:
-            plan_data["milestones"] = [
-                {
-                    "name": m.name,
-                    "priority": m.priority.value,
-                    "success_criteria": m.success_criteria,
-                    "prerequisites": m.prerequisites
-                }
-                for m in self.milestones
-            ]
+            plan_data["milestones"] = list(self._milestone_entries.values())
+        
+        return plan_data
+    
+    def build(self, format: OutputFormat = OutputFormat.YAML) -> str:
+        """Build the final plan in specified format"""
+        self._sync()
+        cached = self._output_cache.get(format)
+        if cached is not None:
+            return cached
         
-        # Format output
         if format == OutputFormat.JSON:
-            return json.dumps(plan_data, indent=2)
+            output = json.dumps(self._plan_data(), indent=2)
+        elif format == OutputFormat.YAML:
+            output = yaml.dump(self._plan_data(), default_flow_style=False, sort_keys=False)
+        elif format == OutputFormat.MARKDOWN:
+            output = "\n".join(self._markdown_lines())
+        else:
+            raise ValueError(f"Unknown format: {format}")
+        
+        self._output_cache[format] = output
+        return output
+    
+    def build_to(self, stream: TextIO, format: OutputFormat = OutputFormat.YAML) -> None:
+        """
+        Write the plan to a text stream instead of returning a string
+        
+        Output is identical to build(). Markdown is rendered line by line
+        straight from the builder, so extra memory stays constant regardless
+        of plan size. For sockets, pass socket.makefile("w").
+        """
+        self._sync()
+        cached = self._output_cache.get(format)
+        if cached is not None:
+            stream.write(cached)
+        elif format == OutputFormat.JSON:
+            json.dump(self._plan_data(), stream, indent=2)
         elif format == OutputFormat.YAML:
-            return yaml.dump(plan_data, default_flow_style=False, sort_keys=False)
+            yaml.dump(self._plan_data(), stream, default_flow_style=False, sort_keys=False)
         elif format == OutputFormat.MARKDOWN:
-            return self._to_markdown(plan_data)
+            separator = ""
+            for line in self._markdown_lines():
+                stream.write(separator)
+                stream.write(line)
+                separator = "\n"
         else:
             raise ValueError(f"Unknown format: {format}")
     
-    def _to_markdown(self, data: Dict) -> str:
-        """Convert to markdown format"""
-        lines = []
-        lines.append(f"# {data['type'].replace('_', ' ').title()}")
-        lines.append("")
+    def _markdown_lines(self) -> Iterator[str]:
+        """Yield markdown lines directly from the builder's tasks and milestones"""
+        yield f"# {self.plan_type.value.replace('_', ' ').title()}"
+        yield ""
         
-        if "prioritized_tasks" in data:
-            for priority in ["critical", "high", "medium", "low"]:
-                tasks = data["prioritized_tasks"][priority]
-                if tasks:
-                    lines.append(f"## {priority.upper()} Priority")
-                    for task in tasks:
+        if self.tasks:
+            for priority, group in self._priority_groups.items():
+                if group:
+                    yield f"## {priority.upper()} Priority"
+                    for task in group.values():
                         complexity = task['complexity'].upper()
-                        lines.append(f"- **{task['name']}** [Complexity: {complexity}]")
+                        yield f"- **{task['name']}** [Complexity: {complexity}]"
                         if task['dependencies']:
-                            lines.append(f"  - Dependencies: {', '.join(task['dependencies'])}")
-                    lines.append("")
+                            yield f"  - Dependencies: {', '.join(task['dependencies'])}"
+                    yield ""
         
-        if "milestones" in data:
-            lines.append("## Milestones")
-            for m in data["milestones"]:
-                lines.append(f"### {m['name']} (Priority: {m['priority'].upper()})")
-                lines.append("**Success Criteria:**")
-                for criterion in m['success_criteria']:
-                    lines.append(f"- {criterion}")
-                if m['prerequisites']:
-                    lines.append("**Prerequisites:**")
-                    for prereq in m['prerequisites']:
-                        lines.append(f"- {prereq}")
-                lines.append("")
-        
-        return "\n".join(lines)
+        if self.milestones:
+            yield "## Milestones"
+            for m in self.milestones:
+                yield f"### {m.name} (Priority: {m.priority.value.upper()})"
+                yield "**Success Criteria:**"
+                for criterion in m.success_criteria:
+                    yield f"- {criterion}"
+                if m.prerequisites:
+                    yield "**Prerequisites:**"
+                    for prereq in m.prerequisites:
+                        yield f"- {prereq}"
+                yield ""
+
+def _restore_builder(cls: type, plan_type: PlanType, tasks: List[Task],
+                     milestones: List[Milestone], metadata: Dict[str, Any]) -> PlanBuilder:
+    builder = cls.__new__(cls)
+    PlanBuilder.__init__(builder, plan_type, tasks, milestones, metadata)
+    return builder
 
 # Agent-specific builders with pre-configured rules
 class ProjectManagerPlan(PlanBuilder):
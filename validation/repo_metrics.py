@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""
+OpenADK Repository Metrics
+Counts files and lines per language for analyze-repo.sh in a single directory walk
+"""
+
+import os
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_WORKERS = 8
+CHUNK_SIZE = 1024 * 1024
+SNIFF_SIZE = 8192
+
+# Same exclusions as the original find pipeline; hidden entries are skipped too
+PRUNE_DIRS = {'node_modules', 'venv', 'vendor', 'target', 'dist', 'build', 'out'}
+
+LANGUAGES = {
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".py": "Python",
+    ".go": "Go",
+    ".java": "Java",
+    ".c": "C",
+    ".cpp": "C++",
+    ".rs": "Rust",
+    ".php": "PHP",
+    ".rb": "Ruby",
+    ".sh": "Shell",
+    ".md": "Markdown",
+    ".json": "JSON",
+    ".yaml": "YAML",
+    ".yml": "YAML",
+    ".xml": "XML",
+}
+
+@dataclass
+class RepoMetrics:
+    """File and line counts for one repository"""
+    file_count: int = 0
+    total_lines: int = 0
+    lines_by_language: Dict[str, int] = field(default_factory=dict)
+    files_by_language: Dict[str, int] = field(default_factory=dict)
+    binary_files_skipped: int = 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+def iter_files(repo_path: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Yield (path, language) for every regular file, pruning excluded directories
+
+    language is None for files whose lines are not counted.
+    """
+    pending = [repo_path]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in PRUNE_DIRS:
+                        pending.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, LANGUAGES.get(os.path.splitext(entry.name)[1])
+            except OSError:
+                continue
+
+def count_lines(path: str) -> Optional[int]:
+    """Newline count of a text file; None for binary or unreadable files"""
+    lines = 0
+    try:
+        with open(path, 'rb') as f:
+            chunk = f.read(SNIFF_SIZE)
+            if b"\0" in chunk:
+                return None
+            while chunk:
+                lines += chunk.count(b"\n")
+                chunk = f.read(CHUNK_SIZE)
+    except OSError:
+        return None
+    return lines
+
+def is_excluded(relpath: str) -> bool:
+    """Whether a repository-relative path lies outside what iter_files walks"""
+    parts = relpath.split(os.sep)
+    return any(part.startswith('.') for part in parts) or any(part in PRUNE_DIRS for part in parts[:-1])
+
+FileCounts = Dict[str, Tuple[Optional[str], Optional[int]]]
+
+def count_files(repo_path: str,
+                files: List[Tuple[str, Optional[str]]],
+                max_workers: int = DEFAULT_WORKERS) -> FileCounts:
+    """
+    Per-file (language, lines) keyed by path relative to repo_path
+
+    lines is None for binary files and for files of no counted language.
+    """
+    counts: FileCounts = {}
+    counted = []
+    for path, language in files:
+        counts[os.path.relpath(path, repo_path)] = (language, None)
+        if language is not None:
+            counted.append(path)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for path, lines in zip(counted, executor.map(count_lines, counted)):
+            relpath = os.path.relpath(path, repo_path)
+            counts[relpath] = (counts[relpath][0], lines)
+    return counts
+
+def summarize(counts: FileCounts) -> RepoMetrics:
+    """Aggregate per-file counts into repository metrics"""
+    metrics = RepoMetrics(file_count=len(counts))
+    for language, lines in counts.values():
+        if language is None:
+            continue
+        if lines is None:
+            metrics.binary_files_skipped += 1
+            continue
+        metrics.total_lines += lines
+        metrics.lines_by_language[language] = metrics.lines_by_language.get(language, 0) + lines
+        metrics.files_by_language[language] = metrics.files_by_language.get(language, 0) + 1
+
+    metrics.lines_by_language = dict(sorted(metrics.lines_by_language.items(),
+                                            key=lambda item: (-item[1], item[0])))
+    return metrics
+
+def collect_metrics(repo_path: str, max_workers: int = DEFAULT_WORKERS) -> RepoMetrics:
+    """Walk the repository once and count lines of known languages in parallel"""
+    return summarize(count_files(repo_path, list(iter_files(repo_path)), max_workers))
+
+def format_text(metrics: RepoMetrics) -> str:
+    """The lines analyze-repo.sh writes into the report"""
+    languages = ", ".join(f"{language}: {lines}" for language, lines in metrics.lines_by_language.items())
+    return "\n".join([
+        f"Files: {metrics.file_count}",
+        f"Lines of Code (approx): {metrics.total_lines}",
+        f"Lines by Language: {languages or 'N/A'}",
+    ])
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Count files and lines of code in a repository')
+    parser.add_argument('repo_path', nargs='?', default='.', help='Repository to measure')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Parallel file readers')
+    parser.add_argument('--format', choices=['text', 'json'], default='text', help='Output format')
+    parser.add_argument('--cache', help='Reuse results from this analysis cache file (git repositories only)')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached results and recount everything')
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.repo_path):
+        print(f"ERROR: Directory not found: {args.repo_path}")
+        return 1
+
+    if args.cache:
+        from analysis_cache import AnalysisCache
+        cache = AnalysisCache(args.cache)
+        metrics, _, _ = cache.metrics(args.repo_path, args.workers, args.refresh)
+        cache.save()
+    else:
+        metrics = collect_metrics(args.repo_path, args.workers)
+    if args.format == 'json':
+        print(json.dumps(metrics.to_dict(), indent=2))
+    else:
+        print(format_text(metrics))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,352 @@
+#!/usr/bin/env python
+"""
+OpenADK Report Archive
+SQLite index of past analysis reports with per-repository metrics
+Answers trend queries without opening the reports, and compacts old ones
+"""
+
+import os
+import sys
+import gzip
+import json
+import shutil
+import sqlite3
+import datetime
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+import yaml
+
+from fileutil import fsync_directory
+
+INDEX_NAME = "index.sqlite3"
+REPORT_GLOB = "repository_analysis_*.yaml"
+METRICS = ("file_count", "total_lines", "binary_files_skipped")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    epoch REAL,
+    yaml_path TEXT UNIQUE,
+    markdown_path TEXT,
+    duration_seconds REAL,
+    repository_count INTEGER NOT NULL,
+    compacted INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS repository_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    path TEXT,
+    file_count INTEGER,
+    total_lines INTEGER,
+    binary_files_skipped INTEGER,
+    lines_by_language TEXT,
+    technology_stack TEXT
+);
+CREATE INDEX IF NOT EXISTS repository_metrics_name ON repository_metrics(name, run_id);
+"""
+
+def _epoch(timestamp: Any, fallback_path: Optional[str] = None) -> Optional[float]:
+    """
+    UTC epoch seconds of a report timestamp, for ordering runs
+
+    ISO timestamps with different UTC offsets do not sort correctly as
+    text. Timestamps without an offset are taken as local time; unreadable
+    ones fall back to the report file's modification time.
+    """
+    if not isinstance(timestamp, datetime.datetime):
+        try:
+            timestamp = datetime.datetime.fromisoformat(str(timestamp))
+        except ValueError:
+            timestamp = None
+    if timestamp is not None:
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.astimezone()
+        return timestamp.timestamp()
+    if fallback_path and os.path.exists(fallback_path):
+        return os.path.getmtime(fallback_path)
+    return None
+
+class ReportArchive:
+    """
+    Index of analysis reports stored in <archive_dir>/index.sqlite3
+
+    Each run keeps its timestamp, report locations and the key metrics of
+    every repository, so history and trends come from the index alone.
+    Compaction gzips old reports into the archive directory; their index
+    rows stay, so trends keep covering them.
+    """
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        os.makedirs(archive_dir, exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(archive_dir, INDEX_NAME))
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(SCHEMA)
+        self._migrate()
+        self.db.execute("CREATE INDEX IF NOT EXISTS runs_epoch ON runs(epoch)")
+
+    def _migrate(self):
+        """Bring indexes created by earlier versions up to SCHEMA"""
+        columns = {row["name"]: row for row in self.db.execute("PRAGMA table_info(runs)")}
+        if "epoch" not in columns:
+            self._add_epoch()
+        if columns["yaml_path"]["notnull"]:
+            self._allow_deleted_paths()
+
+    def _allow_deleted_paths(self):
+        """
+        Drop NOT NULL from runs.yaml_path, so deleted reports can be recorded as NULL
+
+        SQLite cannot change a column constraint in place, so the table is
+        rebuilt. Foreign keys are off meanwhile, or dropping the old table
+        would delete every repository_metrics row with it.
+        """
+        runs_table = SCHEMA.split(";")[0].replace("CREATE TABLE IF NOT EXISTS runs", "CREATE TABLE runs_new")
+        columns = ", ".join(row["name"] for row in self.db.execute("PRAGMA table_info(runs)"))
+        self.db.execute("PRAGMA foreign_keys = OFF")
+        try:
+            with self.db:
+                self.db.execute(runs_table)
+                self.db.execute(f"INSERT INTO runs_new ({columns}) SELECT {columns} FROM runs")
+                self.db.execute("DROP TABLE runs")
+                self.db.execute("ALTER TABLE runs_new RENAME TO runs")
+        finally:
+            self.db.execute("PRAGMA foreign_keys = ON")
+
+    def _add_epoch(self):
+        """Add and fill the epoch column in indexes created before it existed"""
+        with self.db:
+            self.db.execute("ALTER TABLE runs ADD COLUMN epoch REAL")
+            self.db.execute("DROP INDEX IF EXISTS runs_timestamp")
+            rows = self.db.execute("SELECT id, timestamp, yaml_path FROM runs").fetchall()
+            self.db.executemany("UPDATE runs SET epoch = ? WHERE id = ?",
+                                [(_epoch(row["timestamp"], row["yaml_path"]), row["id"]) for row in rows])
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self) -> 'ReportArchive':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _archived_path(self, source: str) -> str:
+        return os.path.abspath(os.path.join(self.archive_dir, os.path.basename(source) + ".gz"))
+
+    def is_indexed(self, yaml_path: str) -> bool:
+        """Whether the report is indexed, here or as its compacted copy"""
+        row = self.db.execute("SELECT 1 FROM runs WHERE yaml_path IN (?, ?)",
+                              (os.path.abspath(yaml_path), self._archived_path(yaml_path))).fetchone()
+        return row is not None
+
+    def index_report(self, yaml_path: str, markdown_path: Optional[str] = None) -> Optional[int]:
+        """
+        Add one YAML report to the index; returns the run id
+
+        Reports that are already indexed, or incomplete (no analysis_summary
+        yet), are skipped and return None.
+        """
+        yaml_path = os.path.abspath(yaml_path)
+        if self.is_indexed(yaml_path):
+            return None
+        with open(yaml_path, 'r', encoding='utf-8') as f:
+            report = yaml.safe_load(f) or {}
+        if "analysis_summary" not in report:
+            return None
+
+        if markdown_path is None:
+            candidate = yaml_path[:-len(".yaml")] + ".md"
+            markdown_path = candidate if os.path.exists(candidate) else None
+        repositories = report.get("repositories") or []
+
+        timestamp = report.get("metadata", {}).get("timestamp", "")
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (timestamp, epoch, yaml_path, markdown_path, duration_seconds, "
+                "repository_count) VALUES (?, ?, ?, ?, ?, ?)",
+                (str(timestamp), _epoch(timestamp, yaml_path), yaml_path,
+                 os.path.abspath(markdown_path) if markdown_path else None,
+                 report["analysis_summary"].get("duration_seconds"), len(repositories)))
+            run_id = cursor.lastrowid
+            self.db.executemany(
+                "INSERT INTO repository_metrics (run_id, name, path, file_count, total_lines, "
+                "binary_files_skipped, lines_by_language, technology_stack) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, repo.get("name"), repo.get("path"),
+                  *(repo.get("metrics", {}).get(m) for m in METRICS),
+                  json.dumps(repo.get("metrics", {}).get("lines_by_language", {})),
+                  json.dumps(repo.get("technology_stack", [])))
+                 for repo in repositories])
+        return run_id
+
+    def sync(self, report_dir: str) -> int:
+        """Index every finished report in report_dir not indexed yet"""
+        indexed = 0
+        for yaml_path in sorted(Path(report_dir).glob(REPORT_GLOB)):
+            if self.index_report(str(yaml_path)) is not None:
+                indexed += 1
+        return indexed
+
+    def runs(self, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Indexed runs, newest first"""
+        query = "SELECT * FROM runs ORDER BY epoch DESC, id DESC"
+        params: tuple = ()
+        if last is not None:
+            query += " LIMIT ?"
+            params = (last,)
+        return [dict(row) for row in self.db.execute(query, params)]
+
+    def trend(self, repository: str, metric: str = "total_lines",
+              last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        One metric of one repository over the last runs, oldest first
+
+        metric is one of file_count, total_lines, binary_files_skipped, or
+        a language name to follow its line count.
+        """
+        column = metric if metric in METRICS else "lines_by_language"
+        query = (f"SELECT r.timestamp, m.{column} AS value FROM repository_metrics m "
+                 "JOIN runs r ON r.id = m.run_id WHERE m.name = ? "
+                 "ORDER BY r.epoch DESC, r.id DESC")
+        params: list = [repository]
+        if last is not None:
+            query += " LIMIT ?"
+            params.append(last)
+        rows = [dict(row) for row in self.db.execute(query, params)]
+        if column != metric:
+            for row in rows:
+                row["value"] = json.loads(row["value"] or "{}").get(metric)
+        rows.reverse()
+        return rows
+
+    def compact(self, keep: int = 20, max_age_days: Optional[int] = None) -> int:
+        """
+        Apply the retention policy; returns the number of runs compacted
+
+        The newest `keep` runs stay as they are. Older reports are gzipped
+        into the archive directory. With max_age_days, compacted files older
+        than that are deleted as well and their paths set to NULL; their
+        metrics stay in the index.
+
+        Each step is crash-safe: the gzip is fsynced under a temporary name
+        and renamed into place, the index is updated, and only then is the
+        source deleted. A run interrupted part way is finished by the next.
+        """
+        compacted = 0
+        for run in self.runs()[keep:]:
+            if run["compacted"]:
+                continue
+            moved = {}
+            for column in ("yaml_path", "markdown_path"):
+                source = run[column]
+                if not source:
+                    moved[column] = None
+                elif os.path.exists(source):
+                    moved[column] = self._gzip(source)
+                else:
+                    # Already compressed by an interrupted run, or gone
+                    target = self._archived_path(source)
+                    moved[column] = target if os.path.exists(target) else None
+            with self.db:
+                self.db.execute("UPDATE runs SET yaml_path = ?, markdown_path = ?, compacted = 1 WHERE id = ?",
+                                (moved["yaml_path"], moved["markdown_path"], run["id"]))
+            for column in ("yaml_path", "markdown_path"):
+                if run[column] and moved[column] != run[column] and os.path.exists(run[column]):
+                    os.unlink(run[column])
+            compacted += 1
+
+        if max_age_days is not None:
+            cutoff = (datetime.datetime.now(datetime.timezone.utc)
+                      - datetime.timedelta(days=max_age_days)).timestamp()
+            for run in self.runs():
+                if not run["compacted"] or run["epoch"] is None or run["epoch"] >= cutoff:
+                    continue
+                if run["yaml_path"] is None and run["markdown_path"] is None:
+                    continue
+                with self.db:
+                    self.db.execute("UPDATE runs SET yaml_path = NULL, markdown_path = NULL WHERE id = ?",
+                                    (run["id"],))
+                for column in ("yaml_path", "markdown_path"):
+                    if run[column] and os.path.exists(run[column]):
+                        os.unlink(run[column])
+        return compacted
+
+    def _gzip(self, source: str) -> str:
+        """Compress source into the archive directory atomically; returns the .gz path"""
+        target = self._archived_path(source)
+        fd, tmp_path = tempfile.mkstemp(dir=self.archive_dir, prefix=f".{os.path.basename(target)}.",
+                                        suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as raw:
+                with open(source, 'rb') as f_in, \
+                        gzip.GzipFile(os.path.basename(source), 'wb', fileobj=raw) as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+                raw.flush()
+                os.fsync(raw.fileno())
+            os.replace(tmp_path, target)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        fsync_directory(self.archive_dir)
+        return target
+
+def main():
+    import argparse
+
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    parser = argparse.ArgumentParser(description='Index, query and compact analysis reports')
+    parser.add_argument('--archive-dir', default=str(project_root / "_project" / "archive"),
+                        help='Archive directory holding the index')
+    parser.add_argument('--report-dir', default=str(project_root / "_project" / "reports"),
+                        help='Directory with the analysis reports')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('index', help='Index reports not indexed yet')
+
+    history = commands.add_parser('list', help='Show indexed runs, newest first')
+    history.add_argument('--last', type=int, default=10, help='Number of runs to show')
+
+    trend = commands.add_parser('trend', help='Show a metric of one repository over time')
+    trend.add_argument('repository', help='Repository name')
+    trend.add_argument('--metric', default='total_lines',
+                       help=f"{', '.join(METRICS)}, or a language name")
+    trend.add_argument('--last', type=int, default=10, help='Number of runs to include')
+
+    compact = commands.add_parser('compact', help='Gzip old reports into the archive')
+    compact.add_argument('--keep', type=int, default=20, help='Newest runs to leave uncompressed')
+    compact.add_argument('--max-age-days', type=int, help='Delete compacted reports older than this')
+
+    args = parser.parse_args()
+
+    with ReportArchive(args.archive_dir) as archive:
+        if args.command == 'index':
+            count = archive.sync(args.report_dir) if os.path.isdir(args.report_dir) else 0
+            print(f"Indexed {count} new reports")
+        elif args.command == 'list':
+            for run in archive.runs(args.last):
+                state = " (compacted)" if run["compacted"] else ""
+                print(f"{run['timestamp']}  {run['repository_count']} repositories  "
+                      f"{run['duration_seconds']}s  {run['yaml_path'] or '(deleted)'}{state}")
+        elif args.command == 'trend':
+            rows = archive.trend(args.repository, args.metric, args.last)
+            if not rows:
+                print(f"No indexed runs for {args.repository}")
+                return 1
+            for row in rows:
+                print(f"{row['timestamp']}  {row['value'] if row['value'] is not None else 'N/A'}")
+        elif args.command == 'compact':
+            if os.path.isdir(args.report_dir):
+                archive.sync(args.report_dir)
+            count = archive.compact(args.keep, args.max_age_days)
+            print(f"Compacted {count} runs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
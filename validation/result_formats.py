@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+OpenADK Result Formats
+Streaming JSON-lines and SARIF 2.1.0 writers for checker results
+Each result is written as soon as it is produced; nothing is buffered but the rule ids seen
+"""
+
+import os
+import sys
+import json
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Optional, TextIO
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+FORMATS = ("jsonl", "sarif")
+
+# SARIF has no "info" level
+_SARIF_LEVELS = {"error": "error", "warning": "warning", "info": "note"}
+
+@dataclass
+class Result:
+    """
+    One located checker result
+
+    Lines and columns are 1-based and end_column is exclusive, as in SARIF.
+    Without a line the result applies to the whole file.
+    """
+    rule_id: str
+    level: str  # "error", "warning", "info"
+    message: str
+    file: str
+    line: Optional[int] = None
+    column: Optional[int] = None
+    end_line: Optional[int] = None
+    end_column: Optional[int] = None
+    match: Optional[str] = None
+
+class JsonLinesWriter:
+    """One JSON object per result"""
+
+    def __init__(self, out: TextIO = sys.stdout):
+        self.out = out
+        self.count = 0
+
+    def write(self, result: Result):
+        self.out.write(json.dumps(asdict(result), ensure_ascii=False) + "\n")
+        self.out.flush()
+        self.count += 1
+
+    def close(self):
+        pass
+
+class SarifWriter:
+    """
+    A SARIF log with one run, streamed result by result
+
+    The results array is written first and the tool section last, so the
+    rules list can name every rule that produced a result. descriptions maps
+    rule ids to their short descriptions; unknown ids use the id itself.
+    """
+
+    def __init__(self, tool_name: str, out: TextIO = sys.stdout,
+                 descriptions: Optional[Dict[str, str]] = None, version: str = "1.0"):
+        self.tool_name = tool_name
+        self.out = out
+        self.descriptions = descriptions or {}
+        self.version = version
+        self.count = 0
+        self._rules: Dict[str, None] = {}
+        self.out.write(f'{{"$schema": "{SARIF_SCHEMA}", "version": "{SARIF_VERSION}", '
+                       f'"runs": [{{"results": [')
+
+    def write(self, result: Result):
+        self._rules[result.rule_id] = None
+        location = {"artifactLocation": {"uri": _uri(result.file)}}
+        if result.line is not None:
+            region = {"startLine": result.line}
+            for key, value in (("startColumn", result.column), ("endLine", result.end_line),
+                               ("endColumn", result.end_column)):
+                if value is not None:
+                    region[key] = value
+            if result.match is not None:
+                region["snippet"] = {"text": result.match}
+            location["region"] = region
+        sarif_result = {
+            "ruleId": result.rule_id,
+            "level": _SARIF_LEVELS.get(result.level, "warning"),
+            "message": {"text": result.message},
+            "locations": [{"physicalLocation": location}],
+        }
+        separator = "," if self.count else ""
+        self.out.write(f"{separator}\n    {json.dumps(sarif_result, ensure_ascii=False)}")
+        self.out.flush()
+        self.count += 1
+
+    def close(self):
+        rules = [{"id": rule_id, "shortDescription": {"text": self.descriptions.get(rule_id, rule_id)}}
+                 for rule_id in self._rules]
+        tool = {"driver": {"name": self.tool_name, "version": self.version, "rules": rules}}
+        self.out.write(f'\n  ], "tool": {json.dumps(tool, ensure_ascii=False)}}}]}}\n')
+        self.out.flush()
+
+def _uri(path: str) -> str:
+    """Path relative to the working directory when inside it, as a forward-slash URI"""
+    absolute = os.path.abspath(path)
+    relative = os.path.relpath(absolute)
+    if not relative.startswith(os.pardir):
+        return Path(relative).as_posix()
+    return Path(absolute).as_uri()
+
+def make_writer(format: str, tool_name: str, out: TextIO = sys.stdout,
+                descriptions: Optional[Dict[str, str]] = None):
+    """A JsonLinesWriter or SarifWriter for format ("jsonl" or "sarif")"""
+    if format == "jsonl":
+        return JsonLinesWriter(out)
+    if format == "sarif":
+        return SarifWriter(tool_name, out, descriptions)
+    raise ValueError(f"Unknown result format: {format}")
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+"""
+OpenADK Rule Engine
+One shared, deduplicated set of compiled text rules for every validator
+Each text is scanned once per distinct pattern, however many validators check it
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rule_guard import UnsafePatternError, analyze_pattern
+from fileutil import atomic_write
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "_project" / ".cache" / "rule_engine.json"
+SCAN_MEMO_SIZE = 32
+
+# Every rule source matches case-insensitively
+FLAGS = re.IGNORECASE
+
+@dataclass(frozen=True)
+class Rule:
+    """A text rule from one of the validators"""
+    source: str
+    name: str
+    pattern: str
+
+# (line number, start column, end column, matched text); columns are 0-based
+LineMatch = Tuple[int, int, int, str]
+
+def builtin_rules() -> List[Rule]:
+    """The text rules of AgentOutputValidator, TimeEstimateChecker and PlanningEnforcer"""
+    from agent_output_validator import FORBIDDEN_RULES, REQUIRED_RULES
+    from check_time_estimates import EXCEPTION_CONTEXTS, TIME_RULES
+    from enforce_planning import RULES, time_unit_pattern
+
+    rules = [Rule("agent_output", rule.name, rule.pattern) for rule in FORBIDDEN_RULES]
+    for output_type, required in REQUIRED_RULES.items():
+        rules.extend(Rule(f"agent_output.{output_type}", rule.name, rule.pattern) for rule in required)
+    rules.extend(Rule("time_estimates", rule_id, pattern) for rule_id, pattern in TIME_RULES)
+    rules.extend(Rule("time_estimates.exceptions", pattern, pattern) for pattern in EXCEPTION_CONTEXTS)
+    terms = RULES["forbidden_terms"]
+    rules.extend(Rule("planning.time_units", term, time_unit_pattern(term)) for term in terms["time_units"])
+    # Task names may not mention a time unit at all, with or without a number
+    rules.extend(Rule("planning.task_names", term, re.escape(term)) for term in terms["time_units"])
+    for group in ("deadline_terms", "temporal_references"):
+        rules.extend(Rule(f"planning.{group}", term, re.escape(term)) for term in terms[group])
+    return rules
+
+class Scan:
+    """
+    Match results for one text, computed lazily per distinct pattern
+
+    Every validator asking about the same pattern for the same text gets
+    the memoized result, so the text is only scanned once per pattern.
+    """
+
+    def __init__(self, engine: 'RuleEngine', text: str):
+        self.engine = engine
+        self.text = text
+        self._matches: Dict[str, List[re.Match]] = {}
+        self._lines: Dict[str, Dict[int, List[LineMatch]]] = {}
+        self._line_starts: Optional[List[int]] = None
+
+    def finditer(self, pattern: str) -> List[re.Match]:
+        matches = self._matches.get(pattern)
+        if matches is None:
+            matches = self._matches[pattern] = list(self.engine.compiled(pattern).finditer(self.text))
+        return matches
+
+    def findall(self, pattern: str) -> list:
+        """Same result as re.findall"""
+        matches = self.finditer(pattern)
+        groups = self.engine.compiled(pattern).groups
+        if groups == 0:
+            return [m.group(0) for m in matches]
+        if groups == 1:
+            return [m.group(1) or "" for m in matches]
+        return [m.groups("") for m in matches]
+
+    def search(self, pattern: str) -> bool:
+        return bool(self.finditer(pattern))
+
+    def _line_of(self, offset: int) -> int:
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer("\n", self.text)]
+        low, high = 0, len(self._line_starts)
+        while high - low > 1:
+            mid = (low + high) // 2
+            if self._line_starts[mid] <= offset:
+                low = mid
+            else:
+                high = mid
+        return low
+
+    def by_line(self, pattern: str) -> Dict[int, List[LineMatch]]:
+        """
+        Matches grouped by 1-based line number, as if each line were matched on its own
+
+        The text is scanned whole. Lines touched by a match that runs across
+        a line break are rescanned individually, so results equal line by
+        line matching.
+        """
+        lines = self._lines.get(pattern)
+        if lines is not None:
+            return lines
+        lines = {}
+        rescan = set()
+        for match in self.finditer(pattern):
+            first = self._line_of(match.start())
+            if "\n" in match.group():
+                rescan.update(range(first, self._line_of(match.end()) + 1))
+                continue
+            column = match.start() - self._line_starts[first]
+            lines.setdefault(first + 1, []).append(
+                (first + 1, column, column + len(match.group()), match.group()))
+
+        if rescan:
+            compiled = self.engine.compiled(pattern)
+            text_lines = self.text.split("\n")
+            for index in rescan:
+                found = [(index + 1, m.start(), m.end(), m.group())
+                         for m in compiled.finditer(text_lines[index])]
+                if found:
+                    lines[index + 1] = found
+                else:
+                    lines.pop(index + 1, None)
+            lines = dict(sorted(lines.items()))
+        self._lines[pattern] = lines
+        return lines
+
+class RuleEngine:
+    """
+    Deduplicated, guard-checked and compiled rules shared by the validators
+
+    Rules from every source are merged on their pattern text, checked once
+    with rule_guard, and compiled once. scan() memoizes results per text, so
+    when several validators check the same text each pattern runs over it
+    a single time. Patterns that are not registered (custom rules) are
+    compiled on first use and memoized the same way.
+
+    The merged rule table and the guard verdicts are kept in a JSON cache
+    keyed by a fingerprint of all rules. Compiled regular expressions cannot
+    be serialized, so they are still built in-process, once per pattern.
+    """
+
+    def __init__(self, rules: List[Rule], cache_path: Optional[str] = None):
+        self.rules = list(rules)
+        self.cache_path = cache_path
+        self.patterns = self._load_patterns()
+        self._compiled: Dict[str, re.Pattern] = {}
+        self._scans: "OrderedDict[str, Scan]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fingerprint(self) -> str:
+        data = json.dumps([asdict(rule) for rule in self.rules], sort_keys=True)
+        return hashlib.sha256(f"{CACHE_VERSION}:{FLAGS}:{data}".encode('utf-8')).hexdigest()
+
+    def _load_patterns(self) -> Dict[str, List[Tuple[str, str]]]:
+        """Distinct pattern -> [(source, name)], guard-checked"""
+        fingerprint = self._fingerprint()
+        if self.cache_path and os.path.exists(self.cache_path):
+            try:
+                with open(self.cache_path, 'r') as f:
+                    cache = json.load(f)
+                if cache.get("fingerprint") == fingerprint:
+                    return {pattern: [tuple(owner) for owner in owners]
+                            for pattern, owners in cache["patterns"]}
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+
+        patterns: Dict[str, List[Tuple[str, str]]] = {}
+        for rule in self.rules:
+            patterns.setdefault(rule.pattern, []).append((rule.source, rule.name))
+        rejected = []
+        for pattern, owners in patterns.items():
+            problems = analyze_pattern(pattern, FLAGS)
+            if problems:
+                names = ", ".join(f"{source}:{name}" for source, name in owners)
+                rejected.append(f"{names} ({pattern!r}): {'; '.join(problems)}")
+        if rejected:
+            raise UnsafePatternError("Unsafe rule patterns: " + " | ".join(rejected))
+
+        if self.cache_path:
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                atomic_write(self.cache_path, json.dumps(
+                    {"fingerprint": fingerprint, "patterns": list(patterns.items())}))
+            except OSError:
+                pass
+        return patterns
+
+    def compiled(self, pattern: str) -> re.Pattern:
+        regex = self._compiled.get(pattern)
+        if regex is None:
+            regex = self._compiled[pattern] = re.compile(pattern, FLAGS)
+        return regex
+
+    def patterns_for(self, source: str) -> Dict[str, str]:
+        """Rule name -> pattern for one source"""
+        return {rule.name: rule.pattern for rule in self.rules if rule.source == source}
+
+    def scan(self, text: str) -> Scan:
+        """The shared, memoized match results for text"""
+        with self._lock:
+            scan = self._scans.get(text)
+            if scan is not None:
+                self._scans.move_to_end(text)
+                return scan
+            scan = self._scans[text] = Scan(self, text)
+            if len(self._scans) > SCAN_MEMO_SIZE:
+                self._scans.popitem(last=False)
+            return scan
+
+_engine: Optional[RuleEngine] = None
+_engine_lock = threading.Lock()
+
+def get_engine() -> RuleEngine:
+    """The process-wide engine over builtin_rules()"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = RuleEngine(builtin_rules(), str(DEFAULT_CACHE_PATH))
+        return _engine
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show the merged validator rules')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the rule cache')
+    args = parser.parse_args()
+
+    engine = RuleEngine(builtin_rules(), None if args.no_cache else str(DEFAULT_CACHE_PATH))
+    shared = sum(1 for owners in engine.patterns.values() if len(owners) > 1)
+    print(f"{len(engine.rules)} rules, {len(engine.patterns)} distinct patterns ({shared} shared)")
+    for pattern, owners in engine.patterns.items():
+        print(f"{pattern}")
+        for source, name in owners:
+            print(f"   {source}: {name}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
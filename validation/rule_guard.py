@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""
+OpenADK Rule Guard
+Static checks that reject regex rule patterns prone to catastrophic backtracking,
+and a subprocess matcher that bounds how long one validation may take
+"""
+
+import re
+import sys
+import multiprocessing
+from time import perf_counter_ns
+from typing import Dict, Hashable, List, Optional, Set, Tuple, Union
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+DEFAULT_TIME_BUDGET = 1.0
+
+class UnsafePatternError(ValueError):
+    """A rule pattern failed the backtracking analysis"""
+
+class RuleTimeoutError(TimeoutError):
+    """Matching did not finish within the time budget"""
+
+class RuleWorkerError(RuntimeError):
+    """The matching worker process died before answering"""
+
+_ANY = None  # first-character set that may be any character
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+_MAXREPEAT = sre_constants.MAXREPEAT
+
+def _union(a, b):
+    if a is _ANY or b is _ANY:
+        return _ANY
+    return a | b
+
+def _overlaps(a, b) -> bool:
+    if a is _ANY:
+        return bool(b) or b is _ANY
+    if b is _ANY:
+        return bool(a)
+    return bool(a & b)
+
+def _in_set(items, ignore_case: bool):
+    chars: Set[str] = set()
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            chars.add(chr(av))
+        elif op is sre_constants.RANGE and av[1] - av[0] <= 256:
+            chars.update(chr(c) for c in range(av[0], av[1] + 1))
+        else:
+            # Categories, negation and wide ranges: assume anything
+            return _ANY
+    return {c.lower() for c in chars} if ignore_case else chars
+
+def _first(items, ignore_case: bool) -> Tuple[Optional[Set[str]], bool]:
+    """(characters a match may start with, whether it may be empty)"""
+    first: Optional[Set[str]] = set()
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            return _union(first, {chr(av).lower() if ignore_case else chr(av)}), False
+        if op is sre_constants.IN:
+            return _union(first, _in_set(av, ignore_case)), False
+        if op in (sre_constants.ANY, sre_constants.NOT_LITERAL):
+            return _ANY, False
+        if op is sre_constants.SUBPATTERN:
+            item_first, nullable = _first(av[-1], ignore_case)
+        elif op in _REPEATS or op is getattr(sre_constants, "POSSESSIVE_REPEAT", None):
+            item_first, nullable = _first(av[2], ignore_case)
+            nullable = nullable or av[0] == 0
+        elif op is sre_constants.BRANCH:
+            item_first, nullable = set(), False
+            for branch in av[1]:
+                branch_first, branch_nullable = _first(branch, ignore_case)
+                item_first = _union(item_first, branch_first)
+                nullable = nullable or branch_nullable
+        elif op in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            continue
+        else:
+            return _ANY, False
+        first = _union(first, item_first)
+        if not nullable:
+            return first, False
+    return first, True
+
+def _problems(items, ignore_case: bool, in_unbounded: bool, found: List[str]):
+    for op, av in items:
+        if op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+            found.append("backreferences cannot be matched in linear time")
+        elif op is sre_constants.SUBPATTERN:
+            _problems(av[-1], ignore_case, in_unbounded, found)
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            _problems(av[1], ignore_case, in_unbounded, found)
+        elif op is sre_constants.BRANCH:
+            if in_unbounded:
+                firsts = [_first(branch, ignore_case) for branch in av[1]]
+                if any(nullable for _, nullable in firsts):
+                    found.append("alternation with an optional branch inside an unbounded repeat")
+                elif any(_overlaps(firsts[i][0], firsts[j][0])
+                         for i in range(len(firsts)) for j in range(i + 1, len(firsts))):
+                    found.append("alternation with overlapping branches inside an unbounded repeat")
+            for branch in av[1]:
+                _problems(branch, ignore_case, in_unbounded, found)
+        elif op in _REPEATS:
+            low, high, body = av
+            if in_unbounded and low != high:
+                found.append("nested quantifier inside an unbounded repeat")
+            _problems(body, ignore_case, in_unbounded or high == _MAXREPEAT, found)
+
+def analyze_pattern(pattern: str, flags: int = 0) -> List[str]:
+    """
+    Reasons a pattern may backtrack catastrophically; empty when it looks safe
+
+    Flags nested variable quantifiers under an unbounded repeat such as
+    (a+)+, alternations under an unbounded repeat whose branches can start
+    with the same character or match nothing such as (a|ab)*, and
+    backreferences. The check is conservative: some safe patterns are
+    rejected, and should be rewritten with the alternatives made disjoint.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error as e:
+        return [f"invalid pattern: {e}"]
+    ignore_case = bool((flags | parsed.state.flags) & re.IGNORECASE)
+    found: List[str] = []
+    _problems(list(parsed), ignore_case, False, found)
+    return list(dict.fromkeys(found))
+
+def _worker(connection, patterns: List[Tuple[Hashable, str, int]]):
+    compiled = [(name, re.compile(pattern, flags)) for name, pattern, flags in patterns]
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        mode, text = request
+        results, timings = {}, {}
+        for name, regex in compiled:
+            start = perf_counter_ns()
+            results[name] = regex.findall(text) if mode == "findall" else regex.search(text) is not None
+            timings[name] = perf_counter_ns() - start
+        connection.send((results, timings))
+
+class GuardedMatcher:
+    """
+    Runs a fixed set of rule patterns in a worker process under a time budget
+
+    Python's re cannot be interrupted from another thread, so matching is
+    done in a long-lived child process. If a request does not finish within
+    `time_budget` seconds the child is killed, RuleTimeoutError is raised,
+    and the next request starts a fresh child. A child that dies mid-request
+    (killed, out of memory) raises RuleWorkerError the same way. Patterns are keyed by any
+    hashable name, and `timings` holds the nanoseconds each one took in
+    the last request.
+
+    Children are started with forkserver (or spawn), never fork: the
+    validators run alongside thread pools, and forking a threaded process
+    can copy locks held by other threads.
+    """
+
+    def __init__(self,
+                 patterns: Dict[Hashable, Union[str, "re.Pattern"]],
+                 flags: int = 0,
+                 time_budget: float = DEFAULT_TIME_BUDGET):
+        self.patterns = [
+            (name, p.pattern, p.flags) if isinstance(p, re.Pattern) else (name, p, flags)
+            for name, p in patterns.items()
+        ]
+        self.time_budget = time_budget
+        self.timings: Dict[Hashable, int] = {}
+        self._process = None
+        self._connection = None
+
+    def _start(self):
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        parent, child = context.Pipe()
+        self._process = context.Process(target=_worker, args=(child, self.patterns), daemon=True)
+        self._process.start()
+        child.close()
+        self._connection = parent
+
+    def close(self):
+        if self._process is not None:
+            self._connection.close()
+            self._process.kill()
+            self._process.join()
+            self._process = self._connection = None
+
+    def __enter__(self) -> 'GuardedMatcher':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _request(self, mode: str, text: str):
+        if self._process is None or not self._process.is_alive():
+            self.close()
+            self._start()
+        try:
+            self._connection.send((mode, text))
+            if not self._connection.poll(self.time_budget):
+                self.close()
+                raise RuleTimeoutError(f"Rule matching exceeded the {self.time_budget}s time budget")
+            results, self.timings = self._connection.recv()
+        except (EOFError, OSError) as e:
+            process = self._process
+            self.close()
+            raise RuleWorkerError(f"Rule matching worker died (exit code {process.exitcode})") from e
+        return results
+
+    def findall(self, text: str) -> Dict[Hashable, list]:
+        """re.findall for every pattern"""
+        return self._request("findall", text)
+
+    def search(self, text: str) -> Dict[Hashable, bool]:
+        """Whether each pattern matches anywhere in text"""
+        return self._request("search", text)
+
+# Example usage
+if __name__ == "__main__":
+    for candidate in sys.argv[1:] or [r'\b\d+\s*(day|days)\b', r'(a+)+$', r'(a|aa)*b', r'(\w+\s?)*$']:
+        issues = analyze_pattern(candidate)
+        print(f"{'UNSAFE' if issues else 'OK':6} {candidate}  {'; '.join(issues)}")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+OpenADK Rule Statistics
+Per-rule evaluation counts, match counts and time spent, for the validators
+Disabled by default; validators check active() once per call and skip all timing when it is None
+"""
+
+import threading
+from time import perf_counter_ns
+from typing import Dict, List, Optional, Tuple
+
+from fileutil import atomic_write
+
+METRIC_PREFIX = "openadk_rule"
+
+class RuleStats:
+    """Counters keyed by (source, rule): [evaluations, matches, nanoseconds]"""
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, str], List[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, source: str, rule: str, matched: bool, elapsed_ns: int):
+        key = (source, rule)
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None:
+                counter = self._counters[key] = [0, 0, 0]
+            counter[0] += 1
+            counter[1] += 1 if matched else 0
+            counter[2] += elapsed_ns
+
+    def timed(self, source: str, rule: str, fn, *args):
+        """Call fn(*args), recording the call; a truthy result counts as a match"""
+        start = perf_counter_ns()
+        result = fn(*args)
+        self.record(source, rule, bool(result), perf_counter_ns() - start)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+    def snapshot(self) -> List[Dict]:
+        """Per-rule counters, most expensive first"""
+        with self._lock:
+            items = [(key, list(counter)) for key, counter in self._counters.items()]
+        rows = [
+            {"source": source, "rule": rule, "evaluations": evaluations,
+             "matches": matches, "nanoseconds": nanoseconds}
+            for (source, rule), (evaluations, matches, nanoseconds) in items
+        ]
+        rows.sort(key=lambda row: (-row["nanoseconds"], row["source"], row["rule"]))
+        return rows
+
+    def format_table(self) -> str:
+        rows = self.snapshot()
+        if not rows:
+            return "No rule statistics recorded"
+        total_ns = sum(row["nanoseconds"] for row in rows) or 1
+        lines = [f"{'SOURCE':<28} {'EVALS':>9} {'MATCHES':>8} {'MS':>9} {'SHARE':>6}  RULE"]
+        for row in rows:
+            lines.append(f"{row['source']:<28} {row['evaluations']:>9} {row['matches']:>8} "
+                         f"{row['nanoseconds'] / 1e6:>9.3f} {row['nanoseconds'] / total_ns:>6.1%}  "
+                         f"{row['rule']}")
+        return "\n".join(lines)
+
+    def to_prometheus(self) -> str:
+        """Counters in the Prometheus text exposition format"""
+        rows = self.snapshot()
+        metrics = [
+            ("evaluations_total", "Number of times a rule was evaluated", "evaluations", 1),
+            ("matches_total", "Number of evaluations where a rule matched", "matches", 1),
+            ("seconds_total", "Time spent evaluating a rule", "nanoseconds", 1e-9),
+        ]
+        lines = []
+        for suffix, help_text, field, scale in metrics:
+            name = f"{METRIC_PREFIX}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for row in rows:
+                value = row[field] * scale if scale != 1 else row[field]
+                lines.append(f'{name}{{source="{_label(row["source"])}",rule="{_label(row["rule"])}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Write the counters to a textfile-collector file atomically"""
+        atomic_write(path, self.to_prometheus())
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+_stats: Optional[RuleStats] = None
+
+def enable() -> RuleStats:
+    """Start collecting rule statistics (keeps counters already collected)"""
+    global _stats
+    if _stats is None:
+        _stats = RuleStats()
+    return _stats
+
+def disable():
+    global _stats
+    _stats = None
+
+def active() -> Optional[RuleStats]:
+    """The collector while enabled, otherwise None"""
+    return _stats
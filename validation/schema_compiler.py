@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+"""
+OpenADK Schema Compiler
+Compiles validation/schemas.yaml into prebuilt check closures
+The compiled validator is cached and reused across any number of documents
+"""
+
+import os
+import re
+import datetime
+from pathlib import Path
+from dataclasses import dataclass
+from typing import Dict, List, Any, Callable, Tuple
+
+import yaml
+
+SCHEMAS_PATH = Path(__file__).parent / "schemas.yaml"
+
+@dataclass
+class Finding:
+    """One validation result"""
+    severity: str  # "error", "warning", "info"
+    rule: str
+    message: str
+    # Keys from the document root to the value the finding is about
+    path: Tuple[Any, ...] = ()
+
+Check = Callable[[Any, List[Finding]], None]
+
+_TYPES = {
+    "string": str,
+    "array": list,
+    "object": dict,
+}
+
+_DATE_FORMATS = {
+    "YYYY-MM-DD": re.compile(r'^\d{4}-\d{2}-\d{2}$'),
+}
+
+def _located(findings: List[Finding], start: int, key: Any):
+    """Prefix key to the path of every finding added since index start"""
+    for finding in findings[start:]:
+        finding.path = (key,) + finding.path
+
+def _sequence(checks: List[Check]) -> Check:
+    def check(value, findings):
+        for c in checks:
+            c(value, findings)
+    return check
+
+def _compile_field(label: str, field: str, spec: Dict[str, Any]) -> Check:
+    """Checks for one present field: type, allowed values, length, format"""
+    checks: List[Check] = []
+    rule = f"{label.replace(' ', '_')}.{field}"
+
+    expected = _TYPES.get(spec.get("type"))
+    if expected is not None:
+        type_name = spec["type"]
+        def check_type(value, findings):
+            if not isinstance(value, expected):
+                findings.append(Finding("warning", f"{rule}.type",
+                                        f"{label.capitalize()} {field} must be a {type_name}"))
+        checks.append(check_type)
+
+    allowed = spec.get("allowed_values")
+    if allowed:
+        allowed_set = frozenset(allowed)
+        def check_allowed(value, findings):
+            if not isinstance(value, str) or value not in allowed_set:
+                findings.append(Finding("error", f"{rule}.allowed_values",
+                                        f"Invalid {label} {field}: {value}"))
+        checks.append(check_allowed)
+
+    max_length = spec.get("max_length")
+    if max_length:
+        def check_max_length(value, findings):
+            if isinstance(value, str) and len(value) > max_length:
+                findings.append(Finding("warning", f"{rule}.max_length",
+                                        f"{label.capitalize()} {field} exceeds {max_length} characters"))
+        checks.append(check_max_length)
+
+    date_format = _DATE_FORMATS.get(spec.get("format"))
+    if spec.get("type") == "date" and date_format is not None:
+        format_name = spec["format"]
+        def check_date(value, findings):
+            if isinstance(value, datetime.date):
+                return
+            if not isinstance(value, str) or not date_format.match(value):
+                findings.append(Finding("warning", f"{rule}.format",
+                                        f"{label.capitalize()} {field} must use {format_name} format"))
+        checks.append(check_date)
+
+    nested_required = spec.get("required_fields")
+    if spec.get("type") == "object" and nested_required:
+        def check_nested(value, findings):
+            if not isinstance(value, dict):
+                return
+            missing = [f for f in nested_required if f not in value]
+            if missing:
+                findings.append(Finding("warning", f"{rule}.required_fields",
+                                        f"{field.capitalize()} section missing recommended fields: {', '.join(missing)}"))
+        checks.append(check_nested)
+
+    field_check = _sequence(checks)
+    def check(section, findings):
+        if field in section:
+            start = len(findings)
+            field_check(section[field], findings)
+            _located(findings, start, field)
+    return check
+
+def _compile_project_section(spec: Dict[str, Any]) -> Check:
+    specs = spec.get("field_specifications", {})
+    required = spec.get("required_fields", [])
+
+    # Object-valued fields (goals) were added after the original format, so a
+    # missing one is a warning with guidance rather than an error
+    hard_required = [f for f in required if specs.get(f, {}).get("type") != "object"]
+    soft_required = [f for f in required if specs.get(f, {}).get("type") == "object"]
+    field_checks = [_compile_field("project", f, s) for f, s in specs.items()]
+
+    def check(project, findings):
+        if not isinstance(project, dict):
+            findings.append(Finding("error", "project_section.type", "Project section must be a dictionary"))
+            return
+        missing = [f for f in hard_required if f not in project]
+        if missing:
+            findings.append(Finding("error", "project_section.required_fields",
+                                    f"Project section missing fields: {', '.join(missing)}"))
+        for field in soft_required:
+            if field not in project:
+                findings.append(Finding("warning", f"project.{field}.missing",
+                                        f"Missing '{field}' section in project (required for goal alignment)"))
+                wanted = specs[field].get("required_fields", [])
+                if wanted:
+                    findings.append(Finding("info", f"project.{field}.missing",
+                                            f"Consider adding {field} with: {', '.join(wanted)}"))
+        for field_check in field_checks:
+            field_check(project, findings)
+    return check
+
+def _compile_repository_section(spec: Dict[str, Any]) -> Check:
+    required = spec.get("per_repository_fields", {}).get("required", [])
+    specs = spec.get("field_specifications", {})
+    field_checks = {f: _compile_field("repository", f, s) for f, s in specs.items()}
+    allowed_status = frozenset(specs.get("status", {}).get("allowed_values", []))
+
+    def check(repos, findings):
+        if not isinstance(repos, dict):
+            findings.append(Finding("error", "repository_section.type",
+                                    "Repositories section must be a dictionary"))
+            return
+        for repo_name, repo_data in repos.items():
+            start = len(findings)
+            check_repository(repo_name, repo_data, findings)
+            _located(findings, start, repo_name)
+
+    def check_repository(repo_name, repo_data, findings):
+        if not isinstance(repo_data, dict):
+            findings.append(Finding("error", "repository_section.entry",
+                                    f"Repository '{repo_name}' must be a dictionary"))
+            return
+        missing = [f for f in required if f not in repo_data]
+        if missing:
+            findings.append(Finding("warning", "repository_section.required",
+                                    f"Repository '{repo_name}' missing fields: {', '.join(missing)}"))
+        if allowed_status and 'status' in repo_data and repo_data['status'] not in allowed_status:
+            findings.append(Finding("error", "repository.status.allowed_values",
+                                    f"Invalid status for {repo_name}: {repo_data['status']}",
+                                    ("status",)))
+        for field, field_check in field_checks.items():
+            if field != 'status':
+                field_check(repo_data, findings)
+    return check
+
+def _compile_required_fields(section: str, spec: Dict[str, Any]) -> Check:
+    required = spec.get("required_fields", [])
+    label = section.replace("_", " ").capitalize()
+
+    def check(value, findings):
+        if not isinstance(value, dict):
+            return
+        missing = [f for f in required if f not in value]
+        if missing:
+            findings.append(Finding("warning", f"{section}_section.required_fields",
+                                    f"{label} section missing fields: {', '.join(missing)}"))
+    return check
+
+def compile_project_context_schema(schema: Dict[str, Any]) -> Callable[[Any], List[Finding]]:
+    """Turn project_context_schema into a validator: data -> findings"""
+    required_sections = schema.get("required_sections", [])
+    section_checks: List[Tuple[str, Check]] = []
+    if "project_section" in schema:
+        section_checks.append(("project", _compile_project_section(schema["project_section"])))
+    if "repository_section" in schema:
+        section_checks.append(("repositories", _compile_repository_section(schema["repository_section"])))
+    if "quick_reference_section" in schema:
+        section_checks.append(("quick_reference",
+                               _compile_required_fields("quick_reference", schema["quick_reference_section"])))
+
+    def validate(data) -> List[Finding]:
+        findings: List[Finding] = []
+        if not isinstance(data, dict):
+            findings.append(Finding("error", "document.type", "PROJECT_CONTEXT.yaml must be a mapping"))
+            return findings
+        missing = [s for s in required_sections if s not in data]
+        if missing:
+            findings.append(Finding("error", "required_sections",
+                                    f"Missing required sections: {', '.join(missing)}"))
+        for section, check in section_checks:
+            if section in data:
+                start = len(findings)
+                check(data[section], findings)
+                _located(findings, start, section)
+        return findings
+
+    return validate
+
+def _compile_frontmatter_field(field: str, spec: Dict[str, Any]) -> Check:
+    """Checks for one agent frontmatter value (always a string)"""
+    checks: List[Check] = []
+    rule = f"agent_template.{field}"
+
+    pattern = spec.get("pattern")
+    if pattern:
+        regex = re.compile(pattern)
+        def check_pattern(value, findings):
+            if not regex.match(value):
+                findings.append(Finding("error", f"{rule}.pattern",
+                                        f"Invalid {field} '{value}'. Must match {pattern}"))
+        checks.append(check_pattern)
+
+    allowed = spec.get("allowed_values")
+    if allowed:
+        allowed_set = frozenset(allowed)
+        choices = ", ".join(allowed[:-1]) + f", or {allowed[-1]}" if len(allowed) > 1 else allowed[0]
+        def check_allowed(value, findings):
+            if value not in allowed_set:
+                findings.append(Finding("error", f"{rule}.allowed_values",
+                                        f"Invalid {field} '{value}'. Must be: {choices}"))
+        checks.append(check_allowed)
+
+    min_length = spec.get("min_length")
+    if min_length:
+        def check_min_length(value, findings):
+            if len(value) < min_length:
+                findings.append(Finding("warning", f"{rule}.min_length",
+                                        f"{field.capitalize()} is shorter than {min_length} characters"))
+        checks.append(check_min_length)
+
+    max_length = spec.get("max_length")
+    if max_length:
+        def check_max_length(value, findings):
+            if len(value) > max_length:
+                findings.append(Finding("warning", f"{rule}.max_length",
+                                        f"{field.capitalize()} exceeds {max_length} characters"))
+        checks.append(check_max_length)
+
+    for required_text in spec.get("must_include", []):
+        def check_includes(value, findings, text=required_text):
+            if text not in value:
+                findings.append(Finding("warning", f"{rule}.must_include",
+                                        f"{field.capitalize()} should contain '{text}'"))
+        checks.append(check_includes)
+
+    field_check = _sequence(checks)
+    def check(frontmatter, findings):
+        value = frontmatter.get(field)
+        if value:
+            field_check(str(value), findings)
+    return check
+
+def compile_agent_template_schema(schema: Dict[str, Any]) -> Callable[[Any], List[Finding]]:
+    """
+    Turn agent_template_schema into a validator
+
+    The validator takes {"frontmatter": dict, "content": str} and returns findings.
+    """
+    required = schema.get("required_fields", [])
+    field_checks = [_compile_frontmatter_field(f, s)
+                    for f, s in schema.get("field_specifications", {}).items()]
+    content_spec = schema.get("content_requirements", {})
+    min_content = content_spec.get("min_length", 0)
+    sections = [s.lower() for s in content_spec.get("must_include_sections", [])]
+
+    def validate(agent) -> List[Finding]:
+        findings: List[Finding] = []
+        frontmatter = agent.get("frontmatter")
+        if not frontmatter:
+            findings.append(Finding("error", "agent_template.frontmatter", "No frontmatter found"))
+            return findings
+        for field in required:
+            if field not in frontmatter:
+                findings.append(Finding("error", "agent_template.required_fields",
+                                        f"Missing '{field}' field in frontmatter"))
+        for field_check in field_checks:
+            field_check(frontmatter, findings)
+
+        content = agent.get("content", "")
+        if len(content) < min_content:
+            findings.append(Finding("warning", "agent_template.content.min_length",
+                                    f"Agent content seems too short (less than {min_content} characters)"))
+        lowered = content.lower()
+        for section in sections:
+            if section not in lowered:
+                findings.append(Finding("warning", "agent_template.content.sections",
+                                        f"Agent content should cover '{section}'"))
+        return findings
+
+    return validate
+
+_cache: Dict[Tuple[str, str], Tuple[int, Callable]] = {}
+
+def load_schema(schema_path: Path = SCHEMAS_PATH) -> Dict[str, Any]:
+    with open(schema_path, 'r') as f:
+        return yaml.safe_load(f)
+
+def get_validator(name: str = "project_context_schema",
+                  schema_path: Path = SCHEMAS_PATH) -> Callable[[Any], List[Finding]]:
+    """
+    Compiled validator for a schema in schemas.yaml
+
+    Compiled once per process and recompiled only when schemas.yaml changes.
+    """
+    key = (str(schema_path), name)
+    mtime = os.stat(schema_path).st_mtime_ns
+    cached = _cache.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    compilers = {
+        "project_context_schema": compile_project_context_schema,
+        "agent_template_schema": compile_agent_template_schema,
+    }
+    if name not in compilers:
+        raise ValueError(f"Unknown schema: {name}")
+    validator = compilers[name](load_schema(schema_path)[name])
+    _cache[key] = (mtime, validator)
+    return validator
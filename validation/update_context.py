@@ -8,34 +8,180 @@ Only updates changed elements instead of full rewrites
 import yaml
 import os
 import sys
+import copy
+import shutil
+import hashlib
+import contextlib
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, Any, Optional
+from datetime import date, datetime
+from typing import Dict, List, Any, Optional
 import json
+from dataclasses import dataclass, field
+
+from context_diff import diff, apply_patch, escape_pointer, format_op
+from fileutil import atomic_write, file_lock
+
+# Journal entries allowed before save() rewrites the full YAML
+COMPACT_EVERY = 50
+
+def content_hash(content: bytes) -> str:
+    """Fingerprint of the YAML file a journal entry was written against"""
+    return hashlib.sha256(content).hexdigest()
+
+def _encode_value(value: Any) -> Any:
+    """json.dumps default: tag YAML dates so replay restores them as dates"""
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, date):
+        return {'$date': value.isoformat()}
+    raise TypeError(f"Cannot journal a value of type {type(value).__name__}")
+
+def _decode_value(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        if '$datetime' in obj:
+            return datetime.fromisoformat(obj['$datetime'])
+        if '$date' in obj:
+            return date.fromisoformat(obj['$date'])
+    return obj
+
+@dataclass
+class JournalReplay:
+    """Result of replay_journal()"""
+    data: Any
+    applied: int = 0
+    seq: int = 0
+    notes: List[str] = field(default_factory=list)
+
+def replay_journal(data: Any, journal_path: str, base: str) -> JournalReplay:
+    """
+    Apply the journal entries written against the YAML whose content_hash is base
+    
+    Entries written against different content were already folded into the
+    YAML by a compaction that stopped before deleting the journal, so they
+    are skipped, as are repeated sequence numbers. An entry that does not
+    apply raises ValueError rather than leaving a partially replayed document.
+    """
+    replay = JournalReplay(data)
+    if not os.path.exists(journal_path):
+        return replay
+    
+    stale = 0
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            try:
+                entry = json.loads(line, object_hook=_decode_value)
+            except json.JSONDecodeError:
+                # A torn append - it was never reported as saved
+                replay.notes.append(f"Ignored incomplete journal entry on line {number} of {journal_path}")
+                continue
+            if entry.get('base', base) != base:
+                stale += 1
+                continue
+            seq = entry.get('seq', replay.seq + 1)
+            if seq <= replay.seq:
+                continue
+            try:
+                replay.data = apply_patch(replay.data, entry['ops'])
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                raise ValueError(f"Journal entry on line {number} of {journal_path} "
+                                 f"does not apply: {e!r}") from e
+            replay.applied += 1
+            replay.seq = seq
+    if stale:
+        replay.notes.append(f"Skipped {stale} journal entries already compacted into the YAML")
+    return replay
+
+def load_context(context_path: str) -> Any:
+    """PROJECT_CONTEXT.yaml with its journal replayed, for read-only callers"""
+    with open(context_path, 'rb') as f:
+        content = f.read()
+    data = yaml.safe_load(content)
+    return replay_journal(data, f"{context_path}.journal", content_hash(content)).data
 
 class ContextUpdater:
     def __init__(self, context_path: str):
         self.context_path = context_path
+        self.journal_path = f"{context_path}.journal"
+        # Held from reading the file and journal to appending or compacting
+        self.lock_path = f"{context_path}.lock"
         self.existing_data = None
         self.updated_data = None
         self.changes = []
+        self.journal_entries = 0
+        # Last journal sequence number, and the hash of the YAML it applies to
+        self.journal_seq = 0
+        self.base_hash = None
+        # Journal size as last read or written, to notice other writers
+        self.journal_size = 0
+        self._lock_held = False
+        # Set when an existing file could not be loaded; save() then refuses to write
+        self.load_error = None
+        self._owned = set()
         
     def load_existing(self) -> bool:
         """Load existing PROJECT_CONTEXT.yaml if it exists"""
         if not os.path.exists(self.context_path):
             print(f"Creating new PROJECT_CONTEXT.yaml at {self.context_path}")
             self.existing_data = self._get_default_structure()
+            self.base_hash = None
             return False
             
         try:
-            with open(self.context_path, 'r') as f:
-                self.existing_data = yaml.safe_load(f)
+            with self._locked():
+                with open(self.context_path, 'rb') as f:
+                    content = f.read()
+                data = yaml.safe_load(content)
+                self.base_hash = content_hash(content)
+                replay = replay_journal(data, self.journal_path, self.base_hash)
+                self.journal_size = self._journal_file_size()
+            for note in replay.notes:
+                print(note)
+            self.existing_data = replay.data
+            self.journal_entries, self.journal_seq = replay.applied, replay.seq
+            self.load_error = None
             return True
         except Exception as e:
+            # Never substitute the defaults here: saving them would overwrite the real file
             print(f"Error loading existing context: {e}")
-            self.existing_data = self._get_default_structure()
+            print(f"Refusing to save until {self.context_path} and its journal load cleanly")
+            self.load_error = str(e)
+            self.existing_data = {}
             return False
     
+    @contextlib.contextmanager
+    def _locked(self):
+        """file_lock() on the sidecar lock file, re-entrant within this updater"""
+        if self._lock_held:
+            yield
+            return
+        with file_lock(self.lock_path):
+            self._lock_held = True
+            try:
+                yield
+            finally:
+                self._lock_held = False
+    
+    def _journal_file_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_path)
+        except OSError:
+            return 0
+    
+    def _moved(self) -> bool:
+        """Whether another writer changed the YAML or journal since they were read"""
+        if not os.path.exists(self.context_path):
+            return self.base_hash is not None
+        with open(self.context_path, 'rb') as f:
+            current = content_hash(f.read())
+        return current != self.base_hash or self._journal_file_size() != self.journal_size
+    
+    def _catch_up(self) -> bool:
+        """Under the lock: rebase onto other writers' saves; False if that fails"""
+        if not self._moved():
+            return True
+        print(f"{self.context_path} changed since it was loaded; reapplying changes on top")
+        return self.rebase()
+    
     def _get_default_structure(self) -> Dict:
         """Get default PROJECT_CONTEXT structure"""
         return {
@@ -78,75 +224,120 @@ class ContextUpdater:
             }
         }
     
-    def update_project_info(self, updates: Dict[str, Any]):
-        """Update project information only if changed"""
-        if not self.updated_data:
-            self.updated_data = self.existing_data.copy()
-            
-        project = self.updated_data.get('project', {})
-        
+    def _merge(self, target: Dict[str, Any], updates: Dict[str, Any], path: str):
+        """Apply updates to target, logging one change per differing leaf"""
         for key, value in updates.items():
-            if key not in project or project[key] != value:
-                old_value = project.get(key, 'Not set')
-                project[key] = value
-                self.changes.append(f"Updated project.{key}: {old_value} -> {value}")
+            child = f"{path}/{escape_pointer(key)}"
+            if key in target:
+                ops = diff(target[key], value, child)
+            else:
+                ops = [{"op": "add", "path": child, "value": value}]
+            if ops:
+                target[key] = value
+                self.changes.extend(format_op(op) for op in ops)
+    
+    def _writable(self, *path: str) -> Dict[str, Any]:
+        """
+        Return the mapping at path inside updated_data, safe to edit in place
+        
+        updated_data starts as a shallow copy of existing_data. Each mapping
+        on the way to the edited node is copied the first time it is touched
+        and every untouched subtree stays shared, so existing_data is never
+        modified and memory grows only with the edited paths.
+        """
+        if not self.updated_data:
+            self.updated_data = dict(self.existing_data)
+            self._owned = {id(self.updated_data)}
         
-        self.updated_data['project'] = project
+        node = self.updated_data
+        for key in path:
+            child = node.get(key)
+            if child is None:
+                child = {}
+            if id(child) not in self._owned:
+                child = dict(child)
+                self._owned.add(id(child))
+                node[key] = child
+            node = child
+        return node
+    
+    def update_project_info(self, updates: Dict[str, Any]):
+        """Update project information only if changed"""
+        project = self._writable('project')
+        self._merge(project, updates, "/project")
     
     def update_repository(self, repo_name: str, repo_data: Dict[str, Any]):
         """Update repository information only if changed"""
-        if not self.updated_data:
-            self.updated_data = self.existing_data.copy()
-            
-        repos = self.updated_data.get('repositories', {})
+        repos = self._writable('repositories')
         
         if repo_name not in repos:
             repos[repo_name] = repo_data
             self.changes.append(f"Added new repository: {repo_name}")
         else:
-            existing_repo = repos[repo_name]
-            for key, value in repo_data.items():
-                if key not in existing_repo or existing_repo[key] != value:
-                    old_value = existing_repo.get(key, 'Not set')
-                    existing_repo[key] = value
-                    self.changes.append(f"Updated {repo_name}.{key}")
-            repos[repo_name] = existing_repo
-        
-        self.updated_data['repositories'] = repos
+            existing_repo = self._writable('repositories', repo_name)
+            self._merge(existing_repo, repo_data, f"/repositories/{escape_pointer(repo_name)}")
     
     def update_goals(self, goals: Dict[str, Any]):
         """Update project goals"""
-        if not self.updated_data:
-            self.updated_data = self.existing_data.copy()
-            
-        project = self.updated_data.get('project', {})
+        project = self._writable('project')
         
         if 'goals' not in project:
             project['goals'] = goals
             self.changes.append("Added goals section to project")
         else:
-            existing_goals = project['goals']
-            for key, value in goals.items():
-                if key not in existing_goals or existing_goals[key] != value:
-                    existing_goals[key] = value
-                    self.changes.append(f"Updated goals.{key}")
-            project['goals'] = existing_goals
-        
-        self.updated_data['project'] = project
+            existing_goals = self._writable('project', 'goals')
+            self._merge(existing_goals, goals, "/project/goals")
     
     def add_current_focus(self, repo_name: str, focus: str):
         """Add current focus to a repository"""
-        if not self.updated_data:
-            self.updated_data = self.existing_data.copy()
-            
-        repos = self.updated_data.get('repositories', {})
+        repos = self._writable('repositories')
         if repo_name in repos:
-            repos[repo_name]['current_focus'] = focus
+            repo = self._writable('repositories', repo_name)
+            repo['current_focus'] = focus
             self.changes.append(f"Updated current focus for {repo_name}")
-            self.updated_data['repositories'] = repos
     
-    def save(self, dry_run: bool = False) -> bool:
-        """Save updated context to file"""
+    def rebase(self) -> bool:
+        """
+        Reload the file and reapply the pending changes on top of it
+        
+        For callers that load, edit and save while other writers may save
+        in between: their changes are kept unless they touch the same
+        values. Returns False, leaving the pending changes as they were,
+        when the file cannot be loaded or the changes no longer apply.
+        """
+        patch = self.get_patch()
+        state = (self.existing_data, self.updated_data, self.changes, self._owned)
+        self.updated_data = None
+        if not self.load_existing() and self.load_error is not None:
+            return False
+        if not patch:
+            self.changes = state[2]
+            return True
+        try:
+            self.updated_data = apply_patch(copy.deepcopy(self.existing_data), patch)
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            print(f"Pending changes no longer apply to {self.context_path}: {e!r}")
+            self.existing_data, self.updated_data, self.changes, self._owned = state
+            return False
+        # A private deep copy: nothing in it is shared with existing_data
+        self._owned = set()
+        self.changes = state[2]
+        return True
+    
+    def save(self, dry_run: bool = False, journal: bool = False) -> bool:
+        """
+        Save updated context to file
+        
+        The YAML is always replaced atomically. With journal=True the change
+        is appended to PROJECT_CONTEXT.yaml.journal instead, and the full YAML
+        is only rewritten once COMPACT_EVERY entries have accumulated.
+        Readers that need journaled changes must go through load_existing()
+        or load_context(). Nothing is written if an existing file failed to load.
+        
+        Writers serialize on PROJECT_CONTEXT.yaml.lock. If another writer
+        saved since this updater loaded, the pending changes are rebased
+        onto the file first; False is returned if they no longer apply.
+        """
         if not self.updated_data:
             print("No updates to save")
             return True
@@ -164,46 +355,127 @@ class ContextUpdater:
                 print(f"  - {change}")
             return True
         
+        if self.load_error is not None:
+            print(f"Refusing to save: {self.context_path} could not be loaded ({self.load_error})")
+            return False
+        
         try:
-            # Create backup of existing file
-            if os.path.exists(self.context_path):
-                backup_path = f"{self.context_path}.backup"
-                with open(self.context_path, 'r') as src:
-                    with open(backup_path, 'w') as dst:
-                        dst.write(src.read())
-            
-            # Write updated context
-            with open(self.context_path, 'w') as f:
-                yaml.dump(self.updated_data, f, default_flow_style=False, 
-                         sort_keys=False, allow_unicode=True)
+            with self._locked():
+                # Another writer may have appended or compacted since the load:
+                # rebase onto that, so the entry's base and seq follow theirs
+                if not self._catch_up():
+                    print(f"Not saved: changes conflict with a concurrent update of {self.context_path}")
+                    return False
+                if (journal and self.base_hash is not None and os.path.exists(self.context_path)
+                        and self.journal_entries < COMPACT_EVERY):
+                    self._append_journal()
+                else:
+                    self.compact()
             
             print(f"Successfully updated PROJECT_CONTEXT.yaml with {len(self.changes)} changes:")
             for change in self.changes:
                 print(f"  - {change}")
+            
+            # Later saves from this updater are relative to what was just written
+            self.existing_data = self.updated_data
+            self.updated_data = None
+            self.changes = []
             return True
             
         except Exception as e:
             print(f"Error saving context: {e}")
             return False
     
-    def get_diff(self) -> Dict[str, Any]:
-        """Get differences between existing and updated data"""
+    def _append_journal(self):
+        """Append the pending patch as one JSON line"""
+        ops = [{k: v for k, v in op.items() if k != 'old'} for op in self.get_patch()]
+        entry = json.dumps({
+            'seq': self.journal_seq + 1,
+            'base': self.base_hash,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'ops': ops
+        }, default=_encode_value)
+        with open(self.journal_path, 'a+b') as f:
+            # Keep the entry on its own line after a torn append
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    entry = "\n" + entry
+            f.write((entry + "\n").encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+            self.journal_size = f.tell()
+        self.journal_entries += 1
+        self.journal_seq += 1
+    
+    def _backup(self):
+        """Keep the current file as .backup by hard link, without copying it"""
+        if not os.path.exists(self.context_path):
+            return
+        backup_path = f"{self.context_path}.backup"
+        link_path = f"{backup_path}.{os.getpid()}.tmp"
+        try:
+            os.link(self.context_path, link_path)
+            os.replace(link_path, backup_path)
+        except OSError:
+            # Filesystems without hard links
+            shutil.copy2(self.context_path, backup_path)
+    
+    def compact(self):
+        """
+        Rewrite the full YAML atomically and drop the journal
+        
+        The new YAML has a new content hash, so if the journal cannot be
+        deleted after the rewrite, its entries are skipped on the next load
+        instead of being applied twice. Changes saved by other writers since
+        the load are rebased onto first; RuntimeError if that fails.
+        """
+        if self.load_error is not None:
+            raise RuntimeError(f"{self.context_path} could not be loaded ({self.load_error})")
+        with self._locked():
+            if not self._catch_up():
+                raise RuntimeError(f"Changes conflict with a concurrent update of {self.context_path}")
+            data = self.updated_data if self.updated_data else self.existing_data
+            self._backup()
+            atomic_write(self.context_path, yaml.dump(data, default_flow_style=False,
+                                                      sort_keys=False, allow_unicode=True))
+            with open(self.context_path, 'rb') as f:
+                self.base_hash = content_hash(f.read())
+            if os.path.exists(self.journal_path):
+                os.unlink(self.journal_path)
+            self.journal_entries = 0
+            self.journal_seq = 0
+            self.journal_size = 0
+    
+    def get_patch(self) -> List[Dict[str, Any]]:
+        """Get JSON-Patch-style operations from existing to updated data"""
         if not self.updated_data:
-            return {}
-            
-        diff = {}
-        # This is a simplified diff - could be enhanced with deep comparison
-        for key in self.updated_data:
-            if key not in self.existing_data:
-                diff[key] = {'status': 'added', 'value': self.updated_data[key]}
-            elif self.existing_data[key] != self.updated_data[key]:
-                diff[key] = {
+            return []
+        return diff(self.existing_data, self.updated_data)
+    
+    def get_diff(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get differences between existing and updated data, grouped by JSON Pointer path
+        
+        List edits can touch one path several times (removing /items/0 twice
+        removes two items), so each path maps to its changes in patch order.
+        """
+        changes: Dict[str, List[Dict[str, Any]]] = {}
+        for op in self.get_patch():
+            if op['op'] == 'add':
+                change = {'status': 'added', 'value': op['value']}
+            elif op['op'] == 'remove':
+                change = {'status': 'removed', 'old': op['old']}
+            else:
+                change = {
                     'status': 'modified',
-                    'old': self.existing_data[key],
-                    'new': self.updated_data[key]
+                    'old': op['old'],
+                    'new': op['value']
                 }
+            changes.setdefault(op['path'], []).append(change)
         
-        return diff
+        return changes
 
 def main():
     """Example usage and testing"""
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""
+OpenADK Agent Template Validator
+Validates .claude/agents/*.md frontmatter against agent_template_schema in schemas.yaml
+One read per file, files checked in parallel, unchanged files served from a cache
+"""
+
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Tuple
+
+import yaml
+
+from schema_compiler import Finding, SCHEMAS_PATH, get_validator
+from validate_context import Colors
+
+DEFAULT_WORKERS = 8
+CACHE_VERSION = 1
+
+@dataclass
+class AgentResult:
+    """Validation result for one agent template"""
+    path: str
+    name: Optional[str]
+    findings: List[Finding] = field(default_factory=list)
+
+def parse_agent(text: str) -> Dict[str, Any]:
+    """
+    Split an agent template into frontmatter fields and content
+
+    Frontmatter is the block between the first two '---' lines. Descriptions
+    often contain unquoted colons, so when the block is not valid YAML it is
+    read line by line as 'key: value' pairs, with indented lines continuing
+    the previous value.
+    """
+    lines = text.splitlines()
+    try:
+        start = lines.index("---")
+        end = lines.index("---", start + 1)
+    except ValueError:
+        return {"frontmatter": {}, "content": text}
+
+    block = lines[start + 1:end]
+    content = "\n".join(lines[end + 1:])
+
+    try:
+        frontmatter = yaml.safe_load("\n".join(block))
+    except yaml.YAMLError:
+        frontmatter = None
+    if not isinstance(frontmatter, dict):
+        frontmatter = {}
+        key = None
+        for line in block:
+            if line and not line[0].isspace() and ":" in line:
+                key, value = line.split(":", 1)
+                key = key.strip()
+                frontmatter[key] = value.strip()
+            elif key is not None and line.strip():
+                frontmatter[key] = f"{frontmatter[key]} {line.strip()}".strip()
+
+    frontmatter = {str(k): "" if v is None else str(v) for k, v in frontmatter.items()}
+    return {"frontmatter": frontmatter, "content": content}
+
+class AgentTemplateValidator:
+    def __init__(self, schema_path: Path = SCHEMAS_PATH, cache_path: Optional[str] = None):
+        self.schema_path = schema_path
+        self.validate_agent = get_validator("agent_template_schema", schema_path)
+        self.cache_path = cache_path
+        self.cache = self._load_cache()
+
+    def _schema_key(self) -> str:
+        with open(self.schema_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def _load_cache(self) -> Dict[str, Any]:
+        empty = {"version": CACHE_VERSION, "schema": self._schema_key(), "files": {}}
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return empty
+        try:
+            with open(self.cache_path, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return empty
+        # Any schema change invalidates every cached result
+        if cache.get("version") != CACHE_VERSION or cache.get("schema") != empty["schema"]:
+            return empty
+        return cache
+
+    def _save_cache(self):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def check_file(self, path: str) -> Tuple[AgentResult, Dict[str, Any]]:
+        """Validate one template, reusing the cached result when the content is unchanged"""
+        stat = os.stat(path)
+        cached = self.cache["files"].get(path)
+        if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+            return self._from_cache(path, cached), cached
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cached and cached["sha256"] == digest:
+            entry = dict(cached, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            return self._from_cache(path, entry), entry
+
+        agent = parse_agent(raw.decode('utf-8', errors='replace'))
+        findings = self.validate_agent(agent)
+        name = agent["frontmatter"].get("name") or None
+        entry = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "name": name,
+            "findings": [[f.severity, f.rule, f.message] for f in findings]
+        }
+        return AgentResult(path, name, findings), entry
+
+    @staticmethod
+    def _from_cache(path: str, entry: Dict[str, Any]) -> AgentResult:
+        return AgentResult(path, entry["name"], [Finding(*f) for f in entry["findings"]])
+
+    def validate_directory(self, agents_dir: str,
+                           max_workers: int = DEFAULT_WORKERS) -> Tuple[List[AgentResult], List[Finding]]:
+        """
+        Validate every *.md template in agents_dir
+
+        Returns per-file results and directory-level findings (duplicate names),
+        both computed in the same pass.
+        """
+        paths = sorted(str(p.resolve()) for p in Path(agents_dir).glob("*.md") if p.is_file())
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            outcomes = list(executor.map(self.check_file, paths))
+
+        results = []
+        owners: Dict[str, List[str]] = {}
+        files = {}
+        for result, entry in outcomes:
+            results.append(result)
+            files[result.path] = entry
+            if result.name:
+                owners.setdefault(result.name, []).append(Path(result.path).stem)
+
+        # Drop entries for deleted templates
+        self.cache["files"] = files
+        self._save_cache()
+
+        duplicates = sorted(name for name, stems in owners.items() if len(stems) > 1)
+        findings = []
+        if duplicates:
+            findings.append(Finding("error", "agent_template.duplicate_names",
+                                    f"Duplicate agent names found: {', '.join(duplicates)}"))
+        return results, findings
+
+def main():
+    import argparse
+
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    parser = argparse.ArgumentParser(description='Validate agent template frontmatter')
+    parser.add_argument('agents_dir', nargs='?', default=str(project_root / ".claude" / "agents"),
+                        help='Directory containing agent templates')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Parallel file workers')
+    parser.add_argument('--cache', default=str(project_root / "_project" / ".cache" / "agent_templates.json"),
+                        help='Result cache location')
+    parser.add_argument('--no-cache', action='store_true', help='Validate every file from scratch')
+    parser.add_argument('--format', choices=['text', 'status'], default='text',
+                        help='text: colored report; status: SEVERITY<TAB>message lines for scripts, '
+                             'ending with an OK or FAILED line')
+
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.agents_dir):
+        if args.format == 'status':
+            print(f"ERROR\tAgents directory not found: {args.agents_dir}\nFAILED")
+        else:
+            print(f"ERROR: Agents directory not found: {args.agents_dir}")
+        return 1
+
+    validator = AgentTemplateValidator(cache_path=None if args.no_cache else args.cache)
+    results, directory_findings = validator.validate_directory(args.agents_dir, args.workers)
+
+    has_errors = False
+    for result in results:
+        agent_name = Path(result.path).stem
+        for finding in result.findings:
+            has_errors |= finding.severity == "error"
+            if args.format == 'status':
+                print(f"{finding.severity.upper()}\t{agent_name}: {finding.message}")
+            else:
+                color = Colors.RED if finding.severity == "error" else Colors.YELLOW
+                print(f"{color}{finding.severity.upper()}:{Colors.NC} {agent_name}: {finding.message}")
+        has_frontmatter = not any(f.rule == "agent_template.frontmatter" for f in result.findings)
+        if args.format == 'status' and has_frontmatter:
+            print(f"OK\t{agent_name} validated")
+
+    for finding in directory_findings:
+        has_errors = True
+        if args.format == 'status':
+            print(f"ERROR\t{finding.message}")
+        else:
+            print(f"{Colors.RED}ERROR:{Colors.NC} {finding.message}")
+    if args.format == 'status':
+        if not directory_findings:
+            print("OK\tNo duplicate agent names")
+        print("FAILED" if has_errors else "OK")
+
+    if args.format == 'text':
+        status = f"{Colors.RED}INVALID" if has_errors else f"{Colors.GREEN}VALID"
+        print(f"{status}:{Colors.NC} {len(results)} agent templates checked")
+
+    return 1 if has_errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,11 @@ import yaml
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterator, List, Any, Optional, TextIO, Tuple
+
+from result_formats import FORMATS, Result, make_writer
+from schema_compiler import get_validator
+from update_context import content_hash, replay_journal
 
 class Colors:
     RED = '\033[0;31m'
@@ -23,97 +27,72 @@ class ContextValidator:
         self.errors = []
         self.warnings = []
         self.info = []
+        self.findings = []
+        self.found = False
+        # YAML node tree of the document, to locate findings in the file
+        self.root = None
+        self.load_error: Optional[Tuple[str, Any]] = None
         
     def validate(self) -> bool:
         """Main validation method"""
-        if not os.path.exists(self.context_path):
+        self._reset()
+        self.root = None
+        self.load_error = None
+        self.found = os.path.exists(self.context_path)
+        if not self.found:
             self.warnings.append("PROJECT_CONTEXT.yaml not found (will be created on initialization)")
             return True
             
-        # Load and parse YAML
+        # Load and parse YAML, keeping the nodes for their positions
         try:
-            with open(self.context_path, 'r') as f:
-                self.data = yaml.safe_load(f)
+            with open(self.context_path, 'rb') as f:
+                content = f.read()
+            loader = yaml.SafeLoader(content.decode('utf-8'))
+            try:
+                self.root = loader.get_single_node()
+                self.data = loader.construct_document(self.root) if self.root is not None else None
+            finally:
+                loader.dispose()
         except yaml.YAMLError as e:
             self.errors.append(f"Invalid YAML syntax: {e}")
+            self.load_error = ("yaml.syntax", getattr(e, 'problem_mark', None))
             return False
         except Exception as e:
             self.errors.append(f"Error reading file: {e}")
+            self.load_error = ("file.read", None)
             return False
-            
-        # Validate structure
-        self._validate_structure()
-        self._validate_project_section()
-        self._validate_repositories()
-        self._validate_goals()
-        
-        return len(self.errors) == 0
-    
-    def _validate_structure(self):
-        """Validate top-level structure"""
-        required_sections = ['project', 'repositories', 'conventions', 
-                           'development_guidelines', 'quick_reference']
         
-        missing = [s for s in required_sections if s not in self.data]
-        if missing:
-            self.errors.append(f"Missing required sections: {', '.join(missing)}")
-    
-    def _validate_project_section(self):
-        """Validate project section"""
-        if 'project' not in self.data:
-            return
+        # Validate what ContextUpdater would load: the YAML plus its journal.
+        # Journaled values are located at the nearest key present in the file.
+        try:
+            replay = replay_journal(self.data, f"{self.context_path}.journal", content_hash(content))
+        except Exception as e:
+            self.errors.append(f"Journal does not apply: {e}")
+            self.load_error = ("context.journal", None)
+            return False
             
-        project = self.data['project']
-        required_fields = ['name', 'type', 'description', 'initialized_at']
+        # Validate against the compiled schemas.yaml rules
+        self.validate_data(replay.data)
+        self.info.extend(replay.notes)
         
-        missing = [f for f in required_fields if f not in project]
-        if missing:
-            self.errors.append(f"Project section missing fields: {', '.join(missing)}")
-        
-        # Validate type field
-        if 'type' in project:
-            valid_types = ['single-repository', 'single-repository-focus', 
-                          'multi-repository', 'monorepo']
-            if project['type'] not in valid_types:
-                self.errors.append(f"Invalid project type: {project['type']}")
+        return len(self.errors) == 0
     
-    def _validate_repositories(self):
-        """Validate repositories section"""
-        if 'repositories' not in self.data:
-            return
-            
-        repos = self.data['repositories']
-        if not isinstance(repos, dict):
-            self.errors.append("Repositories section must be a dictionary")
-            return
-            
-        for repo_name, repo_data in repos.items():
-            required = ['path', 'description', 'technology_stack', 'status', 'has_git']
-            missing = [f for f in required if f not in repo_data]
-            if missing:
-                self.warnings.append(f"Repository '{repo_name}' missing fields: {', '.join(missing)}")
-            
-            # Validate status
-            if 'status' in repo_data:
-                valid_statuses = ['active', 'inactive', 'archived', 'maintenance']
-                if repo_data['status'] not in valid_statuses:
-                    self.errors.append(f"Invalid status for {repo_name}: {repo_data['status']}")
+    def validate_data(self, data: Any) -> bool:
+        """Validate already-loaded context data with the compiled schema"""
+        self._reset()
+        self.data = data
+        self.findings = get_validator("project_context_schema")(data)
+        buckets = {'error': self.errors, 'warning': self.warnings, 'info': self.info}
+        for finding in self.findings:
+            buckets[finding.severity].append(finding.message)
+        return len(self.errors) == 0
     
-    def _validate_goals(self):
-        """Validate goals section (new requirement)"""
-        if 'project' not in self.data:
-            return
-            
-        project = self.data['project']
-        if 'goals' not in project:
-            self.warnings.append("Missing 'goals' section in project (required for goal alignment)")
-            self.info.append("Consider adding goals with: primary_objective, success_metrics, constraints")
-        else:
-            goals = project['goals']
-            required_goal_fields = ['primary_objective', 'success_metrics', 'constraints']
-            missing = [f for f in required_goal_fields if f not in goals]
-            if missing:
-                self.warnings.append(f"Goals section missing recommended fields: {', '.join(missing)}")
+    def _reset(self):
+        """Forget the results of an earlier validation"""
+        self.errors = []
+        self.warnings = []
+        self.info = []
+        self.findings = []
     
     def print_results(self):
         """Print validation results"""
@@ -135,15 +114,118 @@ class ContextValidator:
             print(f"{Colors.GREEN}VALID:{Colors.NC} PROJECT_CONTEXT.yaml is valid")
         elif not self.errors:
             print(f"{Colors.GREEN}VALID:{Colors.NC} PROJECT_CONTEXT.yaml is valid with warnings")
+    
+    def locate(self, path: Tuple[Any, ...]) -> Optional[Tuple[int, int, int, int, Optional[str]]]:
+        """
+        (line, column, end_line, end_column, snippet) of the value at path, 1-based
+
+        Scalars are located by their value. Sections, and keys missing from
+        the file, are located by the key of the deepest section present.
+        """
+        if self.root is None:
+            return None
+        node, key_node = self.root, None
+        for key in path:
+            if not isinstance(node, yaml.MappingNode):
+                break
+            for k, v in node.value:
+                if isinstance(k, yaml.ScalarNode) and k.value == str(key):
+                    node, key_node = v, k
+                    break
+            else:
+                break
+        target = node if isinstance(node, yaml.ScalarNode) or key_node is None else key_node
+        start, end = target.start_mark, target.end_mark
+        snippet = None
+        if start.line == end.line and start.buffer is not None:
+            snippet = start.buffer[start.index:end.index]
+        return start.line + 1, start.column + 1, end.line + 1, end.column + 1, snippet
+    
+    def iter_results(self) -> Iterator[Result]:
+        """Located results for the last validate() call"""
+        if not self.found:
+            yield Result("context.not_found", "warning", self.warnings[0], self.context_path)
+            return
+        if self.load_error is not None:
+            rule, mark = self.load_error
+            line = mark.line + 1 if mark is not None else None
+            column = mark.column + 1 if mark is not None else None
+            yield Result(rule, "error", self.errors[0], self.context_path, line, column)
+            return
+        for finding in self.findings:
+            location = self.locate(finding.path)
+            if location is None:
+                yield Result(finding.rule, finding.severity, finding.message, self.context_path)
+                continue
+            line, column, end_line, end_column, snippet = location
+            yield Result(finding.rule, finding.severity, finding.message, self.context_path,
+                         line, column, end_line, end_column, snippet)
+    
+    def write_results(self, format: str, out: TextIO = sys.stdout) -> int:
+        """Stream the results as JSON lines or SARIF; returns the result count"""
+        writer = make_writer(format, "OpenADK Context Validator", out)
+        for result in self.iter_results():
+            writer.write(result)
+        writer.close()
+        return writer.count
+    
+    def print_status(self):
+        """
+        Print machine-readable results for validate.sh
+        
+        One "SEVERITY<TAB>message" line per finding (ERROR, WARNING, INFO),
+        then a final OK, FAILED or SKIPPED (file not found) line.
+        """
+        for severity, messages in (('ERROR', self.errors), ('WARNING', self.warnings),
+                                   ('INFO', self.info)):
+            for message in messages:
+                print(f"{severity}\t{' '.join(str(message).split())}")
+        if self.errors:
+            print("FAILED")
+        else:
+            print("OK" if self.found else "SKIPPED")
 
 def main():
+    import argparse
+    
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
-    context_path = project_root / "_project" / "PROJECT_CONTEXT.yaml"
     
-    validator = ContextValidator(str(context_path))
-    is_valid = validator.validate()
-    validator.print_results()
+    parser = argparse.ArgumentParser(description='Validate PROJECT_CONTEXT.yaml')
+    parser.add_argument('--context', default=str(project_root / "_project" / "PROJECT_CONTEXT.yaml"),
+                        help='Path to PROJECT_CONTEXT.yaml')
+    parser.add_argument('--format', choices=['text', 'status', *FORMATS], default='text',
+                        help='text: colored report; status: SEVERITY<TAB>message lines for scripts; '
+                             'jsonl: one JSON object per finding; sarif: SARIF 2.1.0 log')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and revalidate whenever the file changes; '
+                             'with jsonl each run appends its findings')
+    
+    args = parser.parse_args()
+    if args.watch and args.format == 'sarif':
+        # One SARIF log per change would not be a valid JSON document
+        parser.error("--watch cannot be combined with --format sarif")
+    
+    def run() -> bool:
+        validator = ContextValidator(args.context)
+        is_valid = validator.validate()
+        if args.format == 'status':
+            validator.print_status()
+        elif args.format in FORMATS:
+            validator.write_results(args.format)
+        else:
+            validator.print_results()
+        return is_valid
+    
+    is_valid = run()
+    if args.watch:
+        from watch import watch_paths
+        try:
+            # Journaled saves only append to the journal
+            for _ in watch_paths([args.context, f"{args.context}.journal"]):
+                is_valid = run()
+        except KeyboardInterrupt:
+            pass
     
     return 0 if is_valid else 1
 
@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+"""
+OpenADK File Watcher
+Reports changed files under a set of paths so validators can recheck only those files
+Uses Linux inotify through ctypes, with stat polling as a fallback elsewhere
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from fnmatch import fnmatch
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+DEBOUNCE_SECONDS = 0.05
+MAX_BATCH_SECONDS = 1.0
+POLL_INTERVAL = 0.05
+SKIP_DIRS = {'node_modules', '.git', 'venv', '__pycache__'}
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF)
+_EVENT = struct.Struct("iIII")
+
+def _load_inotify():
+    """libc inotify functions, or None when unavailable (non-Linux, old libc)"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        init = libc.inotify_init1
+        add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    init.argtypes = [ctypes.c_int]
+    init.restype = ctypes.c_int
+    add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    add_watch.restype = ctypes.c_int
+    return init, add_watch
+
+class FileWatcher:
+    """
+    Watches files matching `patterns` under `paths`
+
+    Iterating over changes() blocks until something changes, waits until
+    the burst has been quiet for `debounce` seconds, then yields the set of
+    paths that were created, modified, moved or deleted. Callers should
+    check whether each path still exists.
+
+    Without inotify the tree is rescanned every `poll_interval` seconds,
+    or as often as the previous scan took when that is longer, so large
+    trees are never scanned back to back.
+    """
+
+    def __init__(self,
+                 paths: Iterable[str],
+                 patterns: Optional[List[str]] = None,
+                 debounce: float = DEBOUNCE_SECONDS,
+                 poll_interval: float = POLL_INTERVAL,
+                 use_inotify: bool = True):
+        self.dirs: List[str] = []
+        self.files: Set[str] = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                self.dirs.append(path)
+            else:
+                self.files.add(path)
+        self.patterns = patterns
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self._fd: Optional[int] = None
+        self._watches: Dict[int, str] = {}
+        inotify = _load_inotify() if use_inotify else None
+        if inotify is not None:
+            self._init_inotify(*inotify)
+        self._snapshot = {} if self._fd is not None else self._scan()
+        self._scan_seconds = 0.0
+
+    @property
+    def roots(self) -> List[str]:
+        """Watched directories: the given ones plus the parents of given files"""
+        # Files are watched through their parent so atomic replaces are seen
+        return list(dict.fromkeys(self.dirs + sorted({os.path.dirname(f) for f in self.files})))
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._fd is not None else "polling"
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> 'FileWatcher':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _watched_dir(self, path: str) -> Optional[str]:
+        """The recursively watched directory containing path, if any"""
+        for root in self.dirs:
+            if path.startswith(root + os.sep):
+                return root
+        return None
+
+    def wanted(self, path: str) -> bool:
+        """Whether a path is one of the watched files"""
+        if path in self.files:
+            return True
+        root = self._watched_dir(path)
+        if root is None:
+            return False
+        parts = os.path.relpath(path, root).split(os.sep)
+        if any(part in SKIP_DIRS for part in parts[:-1]):
+            return False
+        return self.patterns is None or any(fnmatch(parts[-1], p) for p in self.patterns)
+
+    def _walk(self) -> Iterator[Tuple[str, List[str]]]:
+        """Every directory to watch, with its file names"""
+        for root in self.roots:
+            recursive = root in self.dirs
+            for directory, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                yield directory, filenames
+                if not recursive:
+                    break
+
+    def _init_inotify(self, init, add_watch):
+        fd = init(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return
+        self._fd = fd
+        self._add_watch = add_watch
+        for directory, _ in self._walk():
+            if not self._watch_dir(directory):
+                # Typically fs.inotify.max_user_watches: fall back to polling
+                self.close()
+                self._watches.clear()
+                return
+
+    def _watch_dir(self, directory: str) -> bool:
+        wd = self._add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            # Directory vanished between listing and watching
+            return err in (errno.ENOENT, errno.ENOTDIR)
+        self._watches[wd] = directory
+        return True
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for directory, filenames in self._walk():
+            for name in filenames:
+                path = os.path.join(directory, name)
+                if self.wanted(path):
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _read_events(self, timeout: Optional[float]) -> Optional[Set[str]]:
+        """Changed paths from one batch of events; None on timeout"""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return None
+        changed: Set[str] = set()
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = _EVENT.unpack_from(buffer, offset)
+            offset += _EVENT.size
+            name = buffer[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: report everything that exists
+                changed.update(self._scan())
+                continue
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                root = self._watched_dir(path)
+                skipped = root is None or any(part in SKIP_DIRS
+                                              for part in os.path.relpath(path, root).split(os.sep))
+                if mask & (IN_CREATE | IN_MOVED_TO) and not skipped:
+                    # New subtree: watch it and report files already written into it
+                    for subdir, dirnames, filenames in os.walk(path):
+                        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+                        self._watch_dir(subdir)
+                        changed.update(p for p in (os.path.join(subdir, n) for n in filenames)
+                                       if self.wanted(p))
+                continue
+            if self.wanted(path):
+                changed.add(path)
+        return changed
+
+    def _poll(self) -> Set[str]:
+        snapshot = self._scan()
+        previous, self._snapshot = self._snapshot, snapshot
+        changed = {p for p, sig in snapshot.items() if previous.get(p) != sig}
+        changed.update(p for p in previous if p not in snapshot)
+        return changed
+
+    def changes(self) -> Iterator[Set[str]]:
+        """Yield debounced sets of changed paths, forever"""
+        while True:
+            if self._fd is None:
+                time.sleep(max(self.poll_interval, self._scan_seconds))
+                started = time.monotonic()
+                changed = self._poll()
+                self._scan_seconds = time.monotonic() - started
+            else:
+                changed = self._read_events(None) or set()
+                # Debounce: keep collecting until the burst has gone quiet,
+                # but never hold back results for more than a second
+                deadline = time.monotonic() + MAX_BATCH_SECONDS
+                while time.monotonic() < deadline:
+                    more = self._read_events(self.debounce)
+                    if more is None:
+                        break
+                    changed |= more
+            if changed:
+                yield changed
+
+def watch_paths(paths: Iterable[str],
+                patterns: Optional[List[str]] = None,
+                debounce: float = DEBOUNCE_SECONDS) -> Iterator[Set[str]]:
+    """Yield changed file sets until the caller stops iterating"""
+    with FileWatcher(paths, patterns, debounce) as watcher:
+        # On stderr, so machine-readable output on stdout stays parseable
+        print(f"Watching {', '.join(watcher.roots)} ({watcher.backend}); press Ctrl-C to stop",
+              file=sys.stderr)
+        yield from watcher.changes()
+
+# Example usage
+if __name__ == "__main__":
+    try:
+        for changed in watch_paths(sys.argv[1:] or ["."]):
+            for path in sorted(changed):
+                print(f"{'changed' if os.path.exists(path) else 'deleted'}: {path}")
+    except KeyboardInterrupt:
+        pass